@@ -7,12 +7,17 @@ import pandas as pd
 
 # Import components and utilities
 from utils.api_handler import OllamaAPI
+from utils.exporter import start_metrics_exporter
+from utils.profiling import start_run, finish_run
 from utils.styling import apply_custom_styling
 from components.sidebar import render_sidebar
 from components.model_management import render_model_management
 from components.model_interaction import render_model_interaction
 from components.server_status import render_server_status
 from components.overview import render_overview
+from components.fleet import render_fleet
+from components.benchmark import render_benchmark
+from components.debug_panel import render_debug_panel
 
 # Page configuration
 st.set_page_config(
@@ -22,6 +27,9 @@ st.set_page_config(
     initial_sidebar_state="expanded",
 )
 
+# Time this script run for the debug panel (and cProfile with OLLAMA_PROFILE_DIR)
+start_run()
+
 # Apply custom styling
 apply_custom_styling()
 
@@ -32,8 +40,6 @@ if "api_connected" not in st.session_state:
     st.session_state.api_connected = False
 if "current_page" not in st.session_state:
     st.session_state.current_page = "Overview"
-if "models_data" not in st.session_state:
-    st.session_state.models_data = []
 if "server_info" not in st.session_state:
     st.session_state.server_info = {}
 if "dark_mode" not in st.session_state:
@@ -67,9 +73,12 @@ st.markdown("""
 
 # Main App Layout
 def main():
-    # Initialize API handler
+    # Initialize API handler (cheap: the pooled HTTP session is shared per server URL)
     api = OllamaAPI(st.session_state.server_url)
     
+    # Optional Prometheus /metrics endpoint (started once per process, see OLLAMA_METRICS_PORT)
+    start_metrics_exporter()
+    
     # Render sidebar with connection settings
     render_sidebar()
     
@@ -93,6 +102,14 @@ def main():
         render_model_interaction(api)
     elif st.session_state.current_page == "Server Status":
         render_server_status(api)
+    elif st.session_state.current_page == "Fleet":
+        render_fleet()
+    elif st.session_state.current_page == "Benchmark":
+        render_benchmark(api)
+    
+    # Timings of this session's recent script runs (toggled in the sidebar)
+    if st.session_state.get("debug_panel", False):
+        render_debug_panel()
     
     # Add custom footer in a non-obtrusive position
     st.markdown("""
@@ -102,4 +119,7 @@ def main():
     """, unsafe_allow_html=True)
 
 if __name__ == "__main__":
-    main()
+    try:
+        main()
+    finally:
+        finish_run(st.session_state.current_page)
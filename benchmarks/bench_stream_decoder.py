@@ -0,0 +1,116 @@
+"""Micro-benchmark for the NDJSON stream decoder.
+
+Replays a recorded-format /api/generate stream of 100k tokens (one NDJSON
+line per token, as Ollama sends it) in socket-sized chunks and compares the
+incremental decoder with the previous iter_lines() + json.loads() approach.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_stream_decoder [--tokens 100000] [--chunk-size 65536]
+"""
+import argparse
+import json
+import time
+
+from utils.stream_decoder import FAST_JSON, NDJSONDecoder, TokenChunk
+
+
+def build_stream(tokens: int) -> bytes:
+    """Build a /api/generate NDJSON stream with the given number of tokens"""
+    words = ["The", " model", " streams", " one", " token", " per", " line", "."]
+    lines = []
+    for i in range(tokens):
+        lines.append(json.dumps({
+            "model": "llama3.1:8b",
+            "created_at": "2025-03-13T10:00:00.000000Z",
+            "response": words[i % len(words)],
+            "done": False,
+        }))
+    lines.append(json.dumps({
+        "model": "llama3.1:8b",
+        "created_at": "2025-03-13T10:00:05.000000Z",
+        "response": "",
+        "done": True,
+        "done_reason": "stop",
+        "context": list(range(2048)),
+        "total_duration": 5_000_000_000,
+        "load_duration": 10_000_000,
+        "prompt_eval_count": 26,
+        "prompt_eval_duration": 100_000_000,
+        "eval_count": tokens,
+        "eval_duration": 4_800_000_000,
+    }))
+    return ("\n".join(lines) + "\n").encode("utf-8")
+
+
+def split_chunks(data: bytes, chunk_size: int):
+    """Split the recorded stream the way the socket would deliver it"""
+    return [data[i:i + chunk_size] for i in range(0, len(data), chunk_size)]
+
+
+def run_decoder(chunks) -> int:
+    decoder = NDJSONDecoder()
+    tokens = 0
+    for chunk in chunks:
+        for event in decoder.feed(chunk):
+            if isinstance(event, TokenChunk):
+                tokens += 1
+    for event in decoder.close():
+        if isinstance(event, TokenChunk):
+            tokens += 1
+    return tokens
+
+
+def run_baseline(chunks) -> int:
+    """The previous approach: requests-style iter_lines() then json.loads per line"""
+    tokens = 0
+    pending = None
+    for chunk in chunks:
+        if pending is not None:
+            chunk = pending + chunk
+        lines = chunk.splitlines()
+        if lines and chunk and lines[-1] and lines[-1][-1] == chunk[-1]:
+            pending = lines.pop()
+        else:
+            pending = None
+        for line in lines:
+            if line:
+                data = json.loads(line.decode("utf-8"))
+                if data.get("response"):
+                    tokens += 1
+    if pending:
+        data = json.loads(pending.decode("utf-8"))
+        if data.get("response"):
+            tokens += 1
+    return tokens
+
+
+def bench(name, func, chunks, size, repeat):
+    best = float("inf")
+    tokens = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        tokens = func(chunks)
+        best = min(best, time.perf_counter() - start)
+    print(f"{name:<12} {tokens:>8} tokens  {best * 1000:8.1f} ms  "
+          f"{tokens / best:>12,.0f} tokens/s  {size / best / 1e6:7.1f} MB/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tokens", type=int, default=100_000)
+    parser.add_argument("--chunk-size", type=int, default=64 * 1024)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    data = build_stream(args.tokens)
+    chunks = split_chunks(data, args.chunk_size)
+    print(f"Stream: {len(data) / 1e6:.1f} MB in {len(chunks)} chunks, "
+          f"JSON parser: {'orjson' if FAST_JSON else 'json'}")
+
+    bench("decoder", run_decoder, chunks, len(data), args.repeat)
+    bench("baseline", run_baseline, chunks, len(data), args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,188 @@
+"""Multi-session load test of the dashboard.
+
+Simulates N operators, each a headless AppTest session on its own thread,
+navigating Overview, Model Management, Model Interaction and Server Status.
+While on a page a session reruns it every --refresh seconds, as the
+auto-refresh does. Each level of the sweep runs for --duration seconds and
+reports script-run duration, reruns/sec, process CPU and RSS, and upstream
+Ollama calls per session-minute, so the number of operators one replica
+can serve and the effect of caching changes can be compared.
+
+Run from the repository root (uses the bundled mock server by default):
+
+    python -m benchmarks.load_test [--sessions 1,5,10,20] [--duration 30] [--models 200]
+    python -m benchmarks.load_test --base-url http://localhost:11434 --sessions 1,5
+"""
+import argparse
+import csv
+import logging
+import os
+import random
+import resource
+import threading
+import time
+
+import numpy as np
+from streamlit.testing.v1 import AppTest
+
+from utils.metrics import get_request_metrics
+from benchmarks.mock_server import MockConfig, MockOllamaServer
+
+APP_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app.py")
+
+PAGES = ["Overview", "Model Management", "Model Interaction", "Server Status"]
+
+
+def current_rss() -> int:
+    """Resident set size of this process in bytes (peak RSS where /proc is unavailable)"""
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+class UpstreamCounter:
+    """Requests the dashboard sent to Ollama, from the mock server or the request metrics"""
+
+    def __init__(self, mock_server=None):
+        self.mock_server = mock_server
+
+    def total(self) -> int:
+        if self.mock_server is not None:
+            return sum(self.mock_server.state.requests.values())
+        return sum(histogram.cumulative()[0] for _, _, histogram in get_request_metrics().histograms())
+
+
+class Session(threading.Thread):
+    """One simulated operator"""
+
+    def __init__(self, url: str, dwell: float, refresh: float, stop: threading.Event, seed: int):
+        super().__init__(name=f"load-session-{seed}", daemon=True)
+        self.url = url
+        self.dwell = dwell
+        self.refresh = refresh
+        self.stop = stop
+        self.rng = random.Random(seed)
+        self.durations = []
+        self.errors = 0
+
+    def _run_page(self, at: AppTest):
+        start = time.perf_counter()
+        at.run()
+        self.durations.append(time.perf_counter() - start)
+        if at.exception:
+            self.errors += 1
+
+    def run(self):
+        at = AppTest.from_file(APP_PATH, default_timeout=120)
+        at.session_state.server_url = self.url
+        at.session_state.api_connected = True
+        # Stagger sessions so they do not rerun in lockstep
+        self.stop.wait(self.rng.uniform(0, self.refresh))
+
+        page_index = self.rng.randrange(len(PAGES))
+        while not self.stop.is_set():
+            at.session_state.current_page = PAGES[page_index % len(PAGES)]
+            page_index += 1
+            leave_at = time.monotonic() + self.dwell
+            self._run_page(at)
+            while not self.stop.wait(self.refresh) and time.monotonic() < leave_at:
+                self._run_page(at)
+
+
+def run_level(url: str, sessions: int, duration: float, dwell: float, refresh: float,
+              counter: UpstreamCounter) -> dict:
+    stop = threading.Event()
+    workers = [Session(url, dwell, refresh, stop, seed) for seed in range(sessions)]
+    rss_samples = []
+
+    calls_before = counter.total()
+    cpu_before = time.process_time()
+    started = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    while time.perf_counter() - started < duration:
+        rss_samples.append(current_rss())
+        time.sleep(1.0)
+    stop.set()
+    for worker in workers:
+        worker.join()
+    wall = time.perf_counter() - started
+    cpu = time.process_time() - cpu_before
+    calls = counter.total() - calls_before
+
+    durations = np.array([d for worker in workers for d in worker.durations]) * 1000
+    p50, p95, p99 = np.percentile(durations, [50, 95, 99]) if len(durations) else (0.0, 0.0, 0.0)
+    return {
+        "sessions": sessions,
+        "runs": len(durations),
+        "errors": sum(worker.errors for worker in workers),
+        "runs_per_second": len(durations) / wall,
+        "run_p50_ms": p50,
+        "run_p95_ms": p95,
+        "run_p99_ms": p99,
+        "cpu_percent": 100.0 * cpu / wall,
+        "rss_mb": max(rss_samples) / 1e6 if rss_samples else current_rss() / 1e6,
+        "ollama_calls_per_session_minute": calls / sessions / (wall / 60),
+    }
+
+
+def print_row(row: dict):
+    print(f"{row['sessions']:>8} {row['runs']:>6} {row['errors']:>6} {row['runs_per_second']:>9.1f} "
+          f"{row['run_p50_ms']:>9.0f} {row['run_p95_ms']:>9.0f} {row['run_p99_ms']:>9.0f} "
+          f"{row['cpu_percent']:>7.0f} {row['rss_mb']:>8.0f} {row['ollama_calls_per_session_minute']:>14.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", default="1,5,10,20", help="Comma-separated session counts to sweep")
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds per level")
+    parser.add_argument("--dwell", type=float, default=10.0, help="Seconds a session stays on a page")
+    parser.add_argument("--refresh", type=float, default=2.0, help="Seconds between auto-refresh reruns")
+    parser.add_argument("--max-p95", type=float, default=1000.0,
+                        help="Rerun p95 (ms) above which a level counts as unusable")
+    parser.add_argument("--base-url", help="Real Ollama server instead of the mock")
+    parser.add_argument("--models", type=int, default=200, help="Installed models on the mock server")
+    parser.add_argument("--csv", help="Write one row per level to this CSV file")
+    args = parser.parse_args()
+
+    logging.getLogger("streamlit").setLevel(logging.ERROR)
+
+    mock_server = None
+    url = args.base_url
+    if not url:
+        mock_server = MockOllamaServer(MockConfig(models=args.models, load_seconds=0)).start()
+        for name in mock_server.model_names[:3]:
+            mock_server.state.load(name, "1h")
+        url = mock_server.url
+        print(f"Mock server: {args.models} models, 3 loaded")
+    counter = UpstreamCounter(mock_server)
+
+    print(f"{'sessions':>8} {'runs':>6} {'errors':>6} {'reruns/s':>9} {'run p50':>9} {'run p95':>9} "
+          f"{'run p99':>9} {'cpu %':>7} {'rss MB':>8} {'calls/sess-min':>14}")
+    rows = []
+    for sessions in [int(level) for level in args.sessions.split(",") if level.strip()]:
+        row = run_level(url, sessions, args.duration, args.dwell, args.refresh, counter)
+        rows.append(row)
+        print_row(row)
+    print("(run durations in ms)")
+
+    usable = [row["sessions"] for row in rows if row["runs"] and row["run_p95_ms"] <= args.max_p95]
+    if usable:
+        print(f"Largest level with rerun p95 <= {args.max_p95:.0f} ms: {max(usable)} sessions")
+    else:
+        print(f"No level kept rerun p95 <= {args.max_p95:.0f} ms")
+
+    if args.csv:
+        with open(args.csv, "w", encoding="utf-8", newline="") as csv_file:
+            writer = csv.DictWriter(csv_file, fieldnames=list(rows[0]))
+            writer.writeheader()
+            writer.writerows(rows)
+
+    if mock_server is not None:
+        mock_server.stop()
+
+
+if __name__ == "__main__":
+    main()
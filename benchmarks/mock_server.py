@@ -0,0 +1,555 @@
+"""Stand-in Ollama server for load testing the dashboard without a GPU.
+
+Implements the endpoints the dashboard uses with a synthetic model catalog
+and knobs for per-endpoint latency, token rate, error injection and the
+number of installed models:
+
+    python -m benchmarks.mock_server --port 11435 --mock-models 2000 --tokens-per-second 40 \\
+        --latency /api/tags=0.2 --error-rate /api/chat=0.05
+
+Then point the dashboard (or python -m utils.benchmark --base-url) at
+http://localhost:11435. Benchmarks start it in-process with MockOllamaServer.
+"""
+import argparse
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+
+
+MOCK_VERSION = "0.0.0-mock"
+
+FAMILIES = ["llama", "qwen2", "mistral", "gemma2", "phi3", "deepseek2"]
+PARAMETER_SIZES = [(1.0, "1B"), (3.0, "3B"), (7.0, "7B"), (8.0, "8B"), (14.0, "14B"), (70.0, "70B")]
+QUANTIZATIONS = [("Q4_0", 0.56), ("Q4_K_M", 0.6), ("Q8_0", 1.06), ("F16", 2.0)]
+
+# Words the generated responses are made of
+WORDS = ["The", " model", " answers", " with", " mock", " tokens", " at", " a", " steady", " rate", "."]
+
+DEFAULT_KEEP_ALIVE = 300.0
+
+
+@dataclass
+class MockConfig:
+    """Behaviour of the mock server.
+
+    latency and error_rate map an endpoint ("/api/tags") or "*" (every
+    endpoint) to seconds of added latency and a failure probability.
+    """
+    models: int = 20
+    tokens_per_second: float = 50.0
+    response_tokens: int = 64
+    load_seconds: float = 0.5
+    pull_bytes_per_second: float = 200e6
+    num_parallel: int = 4
+    latency: Dict[str, float] = field(default_factory=dict)
+    error_rate: Dict[str, float] = field(default_factory=dict)
+    seed: int = 0
+
+
+def _parse_keep_alive(value) -> Optional[float]:
+    """Seconds to keep a model loaded; None means forever"""
+    if value is None:
+        return DEFAULT_KEEP_ALIVE
+    if isinstance(value, (int, float)):
+        seconds = float(value)
+    else:
+        match = re.fullmatch(r"\s*(-?[\d.]+)\s*([smh]?)\s*", str(value))
+        if not match:
+            return DEFAULT_KEEP_ALIVE
+        seconds = float(match.group(1)) * {"": 1, "s": 1, "m": 60, "h": 3600}[match.group(2)]
+    return None if seconds < 0 else seconds
+
+
+def _iso(timestamp: float) -> str:
+    return datetime.fromtimestamp(timestamp, timezone.utc).isoformat().replace("+00:00", "Z")
+
+
+def _digest(name: str) -> str:
+    return hashlib.sha256(name.encode("utf-8")).hexdigest()
+
+
+def _normalize(name: str) -> str:
+    return name if ":" in name else f"{name}:latest"
+
+
+def build_catalog(count: int, seed: int = 0) -> Dict[str, Dict]:
+    """Deterministic catalog of installed models, as /api/tags entries"""
+    rng = random.Random(seed)
+    now = time.time()
+    catalog = {}
+    for index in range(count):
+        family = FAMILIES[index % len(FAMILIES)]
+        billions, parameter_size = rng.choice(PARAMETER_SIZES)
+        quantization, bytes_per_parameter = rng.choice(QUANTIZATIONS)
+        name = f"{family}-mock-{index:04d}:{parameter_size.lower()}"
+        catalog[name] = _model_entry(name, family, parameter_size, quantization,
+                                     int(billions * 1e9 * bytes_per_parameter),
+                                     now - rng.uniform(0, 180 * 86400))
+    return catalog
+
+
+def _model_entry(name: str, family: str, parameter_size: str, quantization: str,
+                 size: int, modified: float) -> Dict:
+    return {
+        "name": name,
+        "model": name,
+        "modified_at": _iso(modified),
+        "size": size,
+        "digest": _digest(name),
+        "details": {
+            "parent_model": "",
+            "format": "gguf",
+            "family": family,
+            "families": [family],
+            "parameter_size": parameter_size,
+            "quantization_level": quantization,
+        },
+    }
+
+
+class MockOllamaState:
+    """Installed and loaded models, shared by all request threads"""
+
+    def __init__(self, config: MockConfig):
+        self.config = config
+        self.models = build_catalog(config.models, config.seed)
+        self.running: Dict[str, Optional[float]] = {}
+        self.requests: Dict[str, int] = {}
+        self._tags_body: Optional[bytes] = None
+        self._slots: Dict[str, threading.BoundedSemaphore] = {}
+        self._lock = threading.Lock()
+
+    def count(self, endpoint: str):
+        with self._lock:
+            self.requests[endpoint] = self.requests.get(endpoint, 0) + 1
+
+    def tags_body(self) -> bytes:
+        """Serialized /api/tags response, rebuilt only after the catalog changes"""
+        with self._lock:
+            if self._tags_body is None:
+                self._tags_body = json.dumps({"models": list(self.models.values())}).encode("utf-8")
+            return self._tags_body
+
+    def get(self, name: str) -> Optional[Dict]:
+        with self._lock:
+            return self.models.get(_normalize(name))
+
+    def add(self, name: str):
+        name = _normalize(name)
+        family = name.split(":")[0].split("-")[0]
+        with self._lock:
+            if name not in self.models:
+                self.models[name] = _model_entry(name, family, "7B", "Q4_K_M", int(4.1e9), time.time())
+                self._tags_body = None
+
+    def delete(self, name: str) -> bool:
+        name = _normalize(name)
+        with self._lock:
+            if self.models.pop(name, None) is None:
+                return False
+            self.running.pop(name, None)
+            self._tags_body = None
+            return True
+
+    def load(self, name: str, keep_alive) -> bool:
+        """Mark a model loaded (or unload it for keep_alive 0); True if it was not loaded before"""
+        name = _normalize(name)
+        seconds = _parse_keep_alive(keep_alive)
+        with self._lock:
+            self._expire()
+            was_loaded = name in self.running
+            if seconds == 0:
+                self.running.pop(name, None)
+            else:
+                self.running[name] = None if seconds is None else time.time() + seconds
+            return not was_loaded
+
+    def slot(self, name: str) -> threading.BoundedSemaphore:
+        """Per-model limit on parallel generations, like OLLAMA_NUM_PARALLEL"""
+        with self._lock:
+            if name not in self._slots:
+                self._slots[name] = threading.BoundedSemaphore(max(1, self.config.num_parallel))
+            return self._slots[name]
+
+    def running_models(self) -> List[Dict]:
+        with self._lock:
+            self._expire()
+            running = []
+            for name, expires_at in self.running.items():
+                model = self.models.get(name)
+                if model is None:
+                    continue
+                running.append({
+                    "name": name,
+                    "model": name,
+                    "size": model["size"],
+                    "size_vram": model["size"],
+                    "digest": model["digest"],
+                    "details": model["details"],
+                    "expires_at": _iso(expires_at) if expires_at else "2318-01-01T00:00:00Z",
+                })
+            return running
+
+    def _expire(self):
+        now = time.time()
+        for name in [name for name, expires_at in self.running.items() if expires_at and expires_at < now]:
+            del self.running[name]
+
+
+class MockOllamaHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_version = "MockOllama"
+    # Headers and body are separate writes; with Nagle on, small responses wait for a delayed ACK
+    disable_nagle_algorithm = True
+
+    @property
+    def state(self) -> MockOllamaState:
+        return self.server.state
+
+    def log_message(self, format, *args):
+        pass
+
+    # Responses
+
+    def _send_bytes(self, body: bytes, status: int = 200, content_type: str = "application/json"):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_json(self, data: Dict, status: int = 200):
+        self._send_bytes(json.dumps(data).encode("utf-8"), status)
+
+    def _start_stream(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+
+    def _stream_line(self, data: Dict):
+        line = (json.dumps(data) + "\n").encode("utf-8")
+        self.wfile.write(b"%x\r\n%s\r\n" % (len(line), line))
+        self.wfile.flush()
+
+    def _end_stream(self):
+        self.wfile.write(b"0\r\n\r\n")
+
+    def _read_body(self) -> Dict:
+        length = int(self.headers.get("Content-Length", 0) or 0)
+        if not length:
+            return {}
+        try:
+            return json.loads(self.rfile.read(length))
+        except ValueError:
+            return {}
+
+    def _prepare(self, endpoint: str) -> bool:
+        """Count the request, apply the configured latency and maybe inject an error"""
+        config = self.state.config
+        self.state.count(endpoint)
+        delay = config.latency.get(endpoint, config.latency.get("*", 0.0))
+        if delay:
+            time.sleep(delay)
+        failure_rate = config.error_rate.get(endpoint, config.error_rate.get("*", 0.0))
+        if failure_rate and random.random() < failure_rate:
+            self._send_json({"error": f"mock: injected failure on {endpoint}"}, 500)
+            return False
+        return True
+
+    # Routing
+
+    def do_HEAD(self):
+        self.send_response(200)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def do_GET(self):
+        endpoint = self.path.split("?", 1)[0]
+        if endpoint == "/":
+            self._send_bytes(b"Ollama is running", content_type="text/plain")
+        elif endpoint == "/api/version":
+            if self._prepare(endpoint):
+                self._send_json({"version": MOCK_VERSION})
+        elif endpoint == "/api/tags":
+            if self._prepare(endpoint):
+                self._send_bytes(self.state.tags_body())
+        elif endpoint == "/api/ps":
+            if self._prepare(endpoint):
+                self._send_json({"models": self.state.running_models()})
+        else:
+            self._send_json({"error": "not found"}, 404)
+
+    def do_POST(self):
+        endpoint = self.path.split("?", 1)[0]
+        handlers = {
+            "/api/show": self._show,
+            "/api/pull": self._pull,
+            "/api/generate": self._generate,
+            "/api/chat": self._generate,
+        }
+        handler = handlers.get(endpoint)
+        if handler is None:
+            self._send_json({"error": "not found"}, 404)
+            return
+        body = self._read_body()
+        if self._prepare(endpoint):
+            try:
+                handler(endpoint, body)
+            except (BrokenPipeError, ConnectionResetError):
+                # The client stopped reading a stream
+                self.close_connection = True
+
+    def do_DELETE(self):
+        endpoint = self.path.split("?", 1)[0]
+        if endpoint != "/api/delete":
+            self._send_json({"error": "not found"}, 404)
+            return
+        body = self._read_body()
+        if not self._prepare(endpoint):
+            return
+        name = body.get("model") or body.get("name", "")
+        if self.state.delete(name):
+            self._send_bytes(b"")
+        else:
+            self._send_json({"error": f"model '{name}' not found"}, 404)
+
+    # Endpoints
+
+    def _show(self, endpoint: str, body: Dict):
+        name = body.get("model") or body.get("name", "")
+        model = self.state.get(name)
+        if model is None:
+            self._send_json({"error": f"model '{name}' not found"}, 404)
+            return
+        details = model["details"]
+        self._send_json({
+            "license": "Mock License",
+            "modelfile": f"FROM {model['name']}\nPARAMETER temperature 0.7\n",
+            "parameters": "temperature 0.7\nnum_ctx 4096",
+            "template": "{{ .Prompt }}",
+            "details": details,
+            "model_info": {
+                "general.architecture": details["family"],
+                "general.parameter_count": int(float(details["parameter_size"].rstrip("B")) * 1e9),
+                f"{details['family']}.context_length": 8192,
+            },
+            "modified_at": model["modified_at"],
+        })
+
+    def _pull(self, endpoint: str, body: Dict):
+        name = _normalize(body.get("model") or body.get("name", ""))
+        stream = body.get("stream", True)
+        config = self.state.config
+        existing = self.state.get(name)
+        size = existing["size"] if existing else int(4.1e9)
+        layers = [
+            (_digest(name + "/model"), size),
+            (_digest(name + "/template"), 1_400),
+            (_digest(name + "/params"), 480),
+        ]
+
+        if not stream:
+            time.sleep(size / config.pull_bytes_per_second if config.pull_bytes_per_second else 0)
+            self.state.add(name)
+            self._send_json({"status": "success"})
+            return
+
+        self._start_stream()
+        self._stream_line({"status": "pulling manifest"})
+        step = 0.1
+        for digest, total in layers:
+            completed = 0
+            while True:
+                completed = min(total, completed + int(config.pull_bytes_per_second * step) or total)
+                self._stream_line({
+                    "status": f"pulling {digest[:12]}",
+                    "digest": f"sha256:{digest}",
+                    "total": total,
+                    "completed": completed,
+                })
+                if completed >= total:
+                    break
+                time.sleep(step)
+        for status in ("verifying sha256 digest", "writing manifest", "success"):
+            self._stream_line({"status": status})
+        self.state.add(name)
+        self._end_stream()
+
+    def _generate(self, endpoint: str, body: Dict):
+        chat = endpoint == "/api/chat"
+        name = _normalize(body.get("model", ""))
+        if self.state.get(name) is None:
+            self._send_json({"error": f"model '{name}' not found, try pulling it first"}, 404)
+            return
+
+        config = self.state.config
+        started = time.perf_counter()
+        prompt = json.dumps(body.get("messages")) if chat and body.get("messages") else body.get("prompt", "")
+
+        # An empty prompt only loads or unloads the model
+        if not prompt:
+            unloading = _parse_keep_alive(body.get("keep_alive")) == 0
+            if self.state.load(name, body.get("keep_alive")) and not unloading:
+                time.sleep(config.load_seconds)
+            result = {"model": name, "created_at": _iso(time.time()), "done": True,
+                      "done_reason": "unload" if unloading else "load"}
+            result.update({"message": {"role": "assistant", "content": ""}} if chat else {"response": ""})
+            self._send_json(result)
+            return
+
+        with self.state.slot(name):
+            load_seconds = config.load_seconds if self.state.load(name, body.get("keep_alive")) else 0.0
+            time.sleep(load_seconds)
+            prompt_started = time.perf_counter()
+            prompt_tokens = max(1, len(prompt) // 4)
+            tokens = max(1, int(body.get("options", {}).get("num_predict", 0) or config.response_tokens))
+            interval = 1.0 / config.tokens_per_second if config.tokens_per_second > 0 else 0.0
+
+            def chunk(text):
+                data = {"model": name, "created_at": _iso(time.time()), "done": False}
+                if chat:
+                    data["message"] = {"role": "assistant", "content": text}
+                else:
+                    data["response"] = text
+                return data
+
+            stream = body.get("stream", True)
+            if stream:
+                self._start_stream()
+            eval_started = time.perf_counter()
+            text = []
+            for index in range(tokens):
+                if interval:
+                    time.sleep(interval)
+                word = WORDS[index % len(WORDS)]
+                text.append(word)
+                if stream:
+                    self._stream_line(chunk(word))
+            finished = time.perf_counter()
+
+            final = chunk("" if stream else "".join(text))
+            final.update({
+                "done": True,
+                "done_reason": "stop",
+                "total_duration": int((finished - started) * 1e9),
+                "load_duration": int(load_seconds * 1e9),
+                "prompt_eval_count": prompt_tokens,
+                "prompt_eval_duration": int((eval_started - prompt_started) * 1e9),
+                "eval_count": tokens,
+                "eval_duration": int((finished - eval_started) * 1e9),
+            })
+            if not chat:
+                final["context"] = list(range(prompt_tokens + tokens))
+            if stream:
+                self._stream_line(final)
+                self._end_stream()
+            else:
+                self._send_json(final)
+
+
+class MockOllamaServer:
+    """Run the mock server on a daemon thread; port 0 picks a free port"""
+
+    def __init__(self, config: Optional[MockConfig] = None, host: str = "127.0.0.1", port: int = 0):
+        self.state = MockOllamaState(config or MockConfig())
+        self.server = ThreadingHTTPServer((host, port), MockOllamaHandler)
+        self.server.daemon_threads = True
+        self.server.state = self.state
+        self._thread = threading.Thread(target=self.server.serve_forever, name="mock-ollama", daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def model_names(self) -> List[str]:
+        return list(self.state.models)
+
+    def start(self) -> "MockOllamaServer":
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self) -> "MockOllamaServer":
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+
+def _parse_endpoint_values(values: List[str], option: str) -> Dict[str, float]:
+    parsed = {}
+    for value in values or []:
+        endpoint, _, number = value.rpartition("=")
+        if not endpoint:
+            raise argparse.ArgumentTypeError(f"{option} expects ENDPOINT=VALUE, got {value!r}")
+        parsed[endpoint] = float(number)
+    return parsed
+
+
+def add_mock_arguments(parser: argparse.ArgumentParser):
+    """Options that configure the mock server, shared with the benchmark CLI"""
+    parser.add_argument("--mock-models", type=int, default=MockConfig.models,
+                        help="Number of installed models (thousands are fine)")
+    parser.add_argument("--tokens-per-second", type=float, default=MockConfig.tokens_per_second,
+                        help="Generation speed of every stream (0 = as fast as possible)")
+    parser.add_argument("--response-tokens", type=int, default=MockConfig.response_tokens,
+                        help="Tokens per generated response")
+    parser.add_argument("--load-seconds", type=float, default=MockConfig.load_seconds,
+                        help="Delay when a model that is not loaded is used")
+    parser.add_argument("--pull-bytes-per-second", type=float, default=MockConfig.pull_bytes_per_second,
+                        help="Download speed of pulls")
+    parser.add_argument("--num-parallel", type=int, default=MockConfig.num_parallel,
+                        help="Parallel generations per model; more requests queue")
+    parser.add_argument("--latency", action="append", metavar="ENDPOINT=SECONDS",
+                        help="Added latency per endpoint, or '*' for all (repeatable)")
+    parser.add_argument("--error-rate", action="append", metavar="ENDPOINT=PROBABILITY",
+                        help="Fraction of requests answered with HTTP 500, or '*' for all (repeatable)")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the synthetic catalog")
+
+
+def mock_config_from_args(args) -> MockConfig:
+    return MockConfig(
+        models=args.mock_models,
+        tokens_per_second=args.tokens_per_second,
+        response_tokens=args.response_tokens,
+        load_seconds=args.load_seconds,
+        pull_bytes_per_second=args.pull_bytes_per_second,
+        num_parallel=args.num_parallel,
+        latency=_parse_endpoint_values(args.latency, "--latency"),
+        error_rate=_parse_endpoint_values(args.error_rate, "--error-rate"),
+        seed=args.seed,
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Mock Ollama server for load testing the dashboard")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=11435)
+    add_mock_arguments(parser)
+    args = parser.parse_args(argv)
+
+    server = MockOllamaServer(mock_config_from_args(args), args.host, args.port)
+    print(f"Mock Ollama server with {len(server.model_names)} models on {server.url}")
+    try:
+        server.server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+import streamlit as st
+import pandas as pd
+import plotly.express as px
+from dataclasses import asdict
+from utils.benchmark import (
+    BenchmarkConfig,
+    run_benchmark,
+    DEFAULT_PROMPTS,
+    DEFAULT_REQUESTS_PER_LEVEL,
+    DEFAULT_WARMUP,
+    CHAT_MODE,
+    GENERATE_MODE,
+)
+from utils.poller import get_server_poller
+from utils.profiling import profiled
+
+# Concurrency levels offered on the page
+CONCURRENCY_OPTIONS = [1, 2, 4, 8, 16, 32]
+
+
+def _format_seconds(value):
+    return "" if value is None else f"{value * 1000:.0f} ms"
+
+
+def _render_report(report):
+    """Render the summary table, throughput chart and export buttons of a benchmark report"""
+    summaries = pd.DataFrame([asdict(summary) for summary in report.summaries])
+
+    table = pd.DataFrame({
+        "Model": summaries["model"],
+        "Concurrency": summaries["concurrency"],
+        "Requests": summaries["requests"],
+        "Errors": summaries["errors"],
+        "Aggregate Tokens/s": summaries["aggregate_tokens_per_second"].round(1),
+        "Per-Stream Tokens/s": summaries["stream_tokens_per_second"].round(1),
+        "TTFT p50": summaries["ttft_p50"].map(_format_seconds),
+        "TTFT p95": summaries["ttft_p95"].map(_format_seconds),
+        "Latency p50": summaries["latency_p50"].map(_format_seconds),
+        "Latency p95": summaries["latency_p95"].map(_format_seconds),
+        "Latency p99": summaries["latency_p99"].map(_format_seconds)
+    })
+    st.dataframe(table, use_container_width=True, hide_index=True)
+
+    col1, col2 = st.columns(2)
+
+    with col1:
+        throughput_chart = px.line(
+            summaries,
+            x="concurrency",
+            y="aggregate_tokens_per_second",
+            color="model",
+            markers=True,
+            labels={"concurrency": "Concurrency", "aggregate_tokens_per_second": "Aggregate Tokens/s", "model": "Model"},
+            title="Throughput"
+        )
+        st.plotly_chart(throughput_chart, use_container_width=True)
+
+    with col2:
+        latency_chart = px.line(
+            summaries,
+            x="concurrency",
+            y="latency_p95",
+            color="model",
+            markers=True,
+            labels={"concurrency": "Concurrency", "latency_p95": "Latency p95 (s)", "model": "Model"},
+            title="Latency p95"
+        )
+        st.plotly_chart(latency_chart, use_container_width=True)
+
+    col1, col2 = st.columns(2)
+
+    with col1:
+        st.download_button("Download CSV", report.to_csv(), file_name="benchmark.csv", mime="text/csv")
+    with col2:
+        st.download_button("Download JSON", report.to_json(), file_name="benchmark.json", mime="application/json")
+
+
+@profiled()
+def render_benchmark(api):
+    """Render the model benchmark page"""
+
+    st.markdown("<div class='card-title'>Benchmark</div>", unsafe_allow_html=True)
+
+    # Check if API is connected first
+    if not st.session_state.get("api_connected", False):
+        st.warning("Not connected to Ollama server. Please configure and test your connection in the sidebar.")
+        return
+
+    st.markdown(
+        """
+        <div class="card">
+            <div class="card-title">Throughput and Latency</div>
+            <div class="card-subtitle">
+                Run a prompt set against one or more models at increasing concurrency. Warmup requests
+                load the model and are excluded from the results. The same benchmark is available from
+                the command line with <code>python -m utils.benchmark</code>.
+            </div>
+        </div>
+        """,
+        unsafe_allow_html=True
+    )
+
+    catalog = get_server_poller(api.base_url).latest().catalog
+    models = st.multiselect("Models", options=catalog.names)
+
+    col1, col2, col3 = st.columns(3)
+
+    with col1:
+        concurrency = st.multiselect("Concurrency Levels", options=CONCURRENCY_OPTIONS, default=[1, 2, 4, 8])
+    with col2:
+        requests_per_level = st.number_input("Requests per Level", min_value=1, max_value=1000,
+                                             value=DEFAULT_REQUESTS_PER_LEVEL)
+    with col3:
+        warmup = st.number_input("Warmup Requests", min_value=0, max_value=100, value=DEFAULT_WARMUP)
+
+    mode = st.radio("Endpoint", options=[CHAT_MODE, GENERATE_MODE], horizontal=True,
+                    format_func=lambda value: f"/api/{value}")
+    prompts_text = st.text_area("Prompts (one per line)", value="\n".join(DEFAULT_PROMPTS), height=120)
+
+    if st.button("Run Benchmark", type="primary"):
+        prompts = [line.strip() for line in prompts_text.splitlines() if line.strip()]
+        if not models:
+            st.error("Please select at least one model")
+        elif not concurrency:
+            st.error("Please select at least one concurrency level")
+        elif not prompts:
+            st.error("Please enter at least one prompt")
+        else:
+            config = BenchmarkConfig(
+                base_url=api.base_url,
+                models=models,
+                prompts=prompts,
+                concurrency=sorted(concurrency),
+                requests_per_level=int(requests_per_level),
+                warmup=int(warmup),
+                mode=mode,
+            )
+            progress_bar = st.progress(0.0, text="Starting benchmark...")
+
+            def show_progress(done, total, label):
+                progress_bar.progress(done / total, text=f"{label}: {done}/{total} requests")
+
+            st.session_state.benchmark_report = run_benchmark(config, show_progress)
+            progress_bar.empty()
+
+    report = st.session_state.get("benchmark_report")
+    if report is not None and report.summaries:
+        st.markdown("<div class='card-title'>Results</div>", unsafe_allow_html=True)
+        _render_report(report)
@@ -0,0 +1,80 @@
+import streamlit as st
+import pandas as pd
+import plotly.express as px
+from datetime import datetime
+from utils.profiling import get_run_history, PROFILE_DIR
+
+# Waterfall bar colors per span category
+CATEGORY_COLORS = {
+    "styling": "#8e8e93",
+    "sidebar": "#64d2ff",
+    "render": "#0a84ff",
+    "api": "#ff9f0a",
+    "app": "#bf5af2",
+}
+
+
+def _run_label(index, run):
+    started = datetime.fromtimestamp(run.started_at).strftime("%H:%M:%S")
+    return f"#{index + 1} {started} {run.page} ({run.duration * 1000:.0f} ms)"
+
+
+def _render_waterfall(run):
+    """Spans of one run as horizontal bars on a shared time axis"""
+    if not run.spans:
+        st.info("No timed sections in this run")
+        return
+
+    spans = sorted(run.spans, key=lambda span: span.start)
+    frame = pd.DataFrame({
+        "Section": [f"{'  ' * span.depth}{span.name} [{index}]" for index, span in enumerate(spans)],
+        "Category": [span.category for span in spans],
+        "Start (ms)": [span.start * 1000 for span in spans],
+        "Duration (ms)": [span.duration * 1000 for span in spans],
+    })
+
+    chart = px.bar(
+        frame,
+        x="Duration (ms)",
+        y="Section",
+        base="Start (ms)",
+        color="Category",
+        color_discrete_map=CATEGORY_COLORS,
+        orientation="h",
+        hover_data={"Start (ms)": ":.1f", "Duration (ms)": ":.1f"},
+    )
+    chart.update_yaxes(autorange="reversed", title=None)
+    chart.update_xaxes(title="ms since the run started", range=[0, run.duration * 1000])
+    chart.update_layout(height=max(250, 24 * len(spans) + 80), margin=dict(l=10, r=10, t=10, b=10))
+    st.plotly_chart(chart, use_container_width=True)
+
+
+def render_debug_panel():
+    """Render the timing waterfall of this session's recent script runs"""
+
+    runs = list(get_run_history())
+
+    with st.expander("Debug: Rerun Timings", expanded=True):
+        if not runs:
+            st.info("Timings appear after the next rerun")
+            return
+
+        summary = pd.DataFrame([{
+            "Run": index + 1,
+            "Started": datetime.fromtimestamp(run.started_at).strftime("%H:%M:%S"),
+            "Page": run.page,
+            "Total (ms)": round(run.duration * 1000, 1),
+            "Render (ms)": round(sum(span.duration for span in run.spans
+                                     if span.category == "render") * 1000, 1),
+            "API Calls": sum(1 for span in run.spans if span.category == "api"),
+            "API (ms)": round(sum(span.duration for span in run.spans if span.category == "api") * 1000, 1),
+        } for index, run in enumerate(runs)])
+        st.dataframe(summary, use_container_width=True, hide_index=True)
+
+        indexes = list(range(len(runs)))
+        selected = st.selectbox("Run", options=indexes[::-1],
+                                format_func=lambda index: _run_label(index, runs[index]))
+        _render_waterfall(runs[selected])
+
+        if PROFILE_DIR and runs[selected].profile_path:
+            st.caption(f"cProfile stats: {runs[selected].profile_path}")
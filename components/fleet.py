@@ -0,0 +1,126 @@
+import streamlit as st
+import pandas as pd
+from utils.fleet import get_fleet_registry, get_fleet_poller, aggregate_fleet
+from utils.router import get_router_state
+from utils.profiling import profiled
+
+
+def _format_gb(size_bytes):
+    """Format a byte count in GB"""
+    return f"{size_bytes / (1024 * 1024 * 1024):.2f} GB"
+
+
+@profiled()
+def render_fleet():
+    """Render the fleet view: Overview and Server Status aggregated across all hosts"""
+
+    st.markdown("<div class='card-title'>Fleet</div>", unsafe_allow_html=True)
+
+    hosts = get_fleet_registry().hosts()
+    if not hosts:
+        st.markdown(
+            """
+            <div class="card">
+                <div class="card-title">No Fleet Hosts Configured</div>
+                <div class="card-subtitle">
+                    Add Ollama servers under "Fleet Hosts" in the sidebar (one <code>label=url</code> per line),
+                    or start the dashboard with the <code>OLLAMA_FLEET</code> environment variable.
+                </div>
+            </div>
+            """,
+            unsafe_allow_html=True
+        )
+        return
+
+    # Poll every host in parallel; slow or dead hosts are reported, never waited for
+    with st.spinner(f"Polling {len(hosts)} hosts..."):
+        snapshots = get_fleet_poller().poll(hosts)
+    summary = aggregate_fleet(snapshots)
+
+    # Fleet overview metrics
+    col1, col2, col3, col4 = st.columns(4)
+
+    with col1:
+        st.metric("Hosts Online", f"{summary['online']} / {summary['hosts']}")
+    with col2:
+        st.metric("Unique Models", summary["unique_models"], help=f"{summary['installed_models']} installs across the fleet")
+    with col3:
+        st.metric("Running Models", summary["running_models"])
+    with col4:
+        st.metric("VRAM In Use", _format_gb(summary["vram_bytes"]))
+
+    # Per-host breakdown
+    st.markdown("<br/>", unsafe_allow_html=True)
+    st.markdown("<div class='card-title'>Hosts</div>", unsafe_allow_html=True)
+
+    hosts_data = []
+    for snapshot in snapshots:
+        hosts_data.append({
+            "Host": snapshot.host.label,
+            "URL": snapshot.host.base_url,
+            "Status": ("Online" if snapshot.online else "Offline") + (" (stale)" if snapshot.stale else ""),
+            "Version": snapshot.version.get("version", ""),
+            "Models": len(snapshot.models),
+            "Running": len(snapshot.running),
+            "VRAM": _format_gb(snapshot.vram_bytes),
+            "Disk": _format_gb(snapshot.disk_bytes),
+            "Latency": f"{snapshot.latency * 1000:.0f} ms" if snapshot.online else "",
+            "Errors": "; ".join(f"{name}: {error}" for name, error in snapshot.errors.items())
+        })
+    st.dataframe(pd.DataFrame(hosts_data), use_container_width=True, hide_index=True)
+
+    # Running models across the fleet
+    st.markdown("<div class='card-title'>Running Models</div>", unsafe_allow_html=True)
+
+    running_data = []
+    for snapshot in snapshots:
+        for model in snapshot.running:
+            running_data.append({
+                "Host": snapshot.host.label,
+                "Model": model.get("name", "Unknown"),
+                "VRAM": _format_gb(model.get("size_vram", 0)),
+                "Family": model.get("details", {}).get("family", "Unknown"),
+                "Expires": model.get("expires_at", "")
+            })
+
+    if running_data:
+        st.dataframe(pd.DataFrame(running_data), use_container_width=True, hide_index=True)
+    else:
+        st.info("No models are currently running on any host.")
+
+    # Model inventory: which hosts have which model
+    st.markdown("<div class='card-title'>Model Inventory</div>", unsafe_allow_html=True)
+
+    inventory = {}
+    for snapshot in snapshots:
+        for model in snapshot.models:
+            name = model.get("name", "Unknown")
+            entry = inventory.setdefault(name, {"Model": name, "Size": _format_gb(model.get("size", 0)), "Hosts": []})
+            entry["Hosts"].append(snapshot.host.label)
+
+    if inventory:
+        inventory_data = [
+            {**entry, "Host Count": len(entry["Hosts"]), "Hosts": ", ".join(entry["Hosts"])}
+            for entry in sorted(inventory.values(), key=lambda entry: entry["Model"])
+        ]
+        st.dataframe(pd.DataFrame(inventory_data), use_container_width=True, hide_index=True)
+    else:
+        st.info("No models found on any online host.")
+
+    # Load signals used by "Route Across Fleet" in Model Interaction
+    routing = get_router_state().all()
+    if routing:
+        st.markdown("<div class='card-title'>Routing</div>", unsafe_allow_html=True)
+        labels = {snapshot.host.base_url: snapshot.host.label for snapshot in snapshots}
+        routing_data = [{
+            "Backend": labels.get(stats.base_url, stats.base_url),
+            "In Flight": stats.in_flight,
+            "TTFT (EWMA)": f"{stats.ttft:.2f} s" if stats.ttft is not None else "",
+            "Requests": stats.requests,
+            "Connection Failures": stats.failures,
+            "Cooling Down": stats.cooling_down
+        } for stats in routing]
+        st.dataframe(pd.DataFrame(routing_data), use_container_width=True, hide_index=True)
+    
+    if st.button("Refresh Fleet", key="refresh_fleet"):
+        st.rerun()
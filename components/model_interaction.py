@@ -1,7 +1,74 @@
 import streamlit as st
+import pandas as pd
 import time
-import json
+from utils.stream_decoder import iter_events, decode_object, TokenChunk, FinalStats, StreamError
+from utils.stream_renderer import StreamRenderer, DEFAULT_FLUSH_INTERVAL_MS, DEFAULT_FLUSH_TOKENS
+from utils.fleet import get_fleet_registry
+from utils.router import ModelRouter, router_hosts
+from utils.metrics import get_generation_metrics
+from utils.poller import get_server_poller
+from utils.warm_pool import get_warm_pool
+from utils.profiling import profiled
 
+# Conversation modes offered in Advanced Options
+CHAT_MODE = "Chat API (/api/chat)"
+CONTEXT_MODE = "Generate with KV context reuse (/api/generate)"
+
+
+def _format_performance(sample):
+    """One-line summary of a turn's performance sample"""
+    parts = []
+    if sample.get("ttft") is not None:
+        parts.append(f"TTFT {sample['ttft']:.2f} s")
+    if sample.get("tokens_per_second"):
+        parts.append(f"{sample['tokens_per_second']:.1f} tokens/s")
+    if sample.get("prompt_tokens_per_second"):
+        parts.append(f"prompt {sample['prompt_tokens_per_second']:.0f} tokens/s")
+    parts.append(f"load {sample['load_seconds']:.2f} s")
+    parts.append(f"total {sample['total_seconds']:.2f} s")
+    return " · ".join(parts)
+
+
+def _format_stat(stat, key, fmt):
+    """Format one statistic of a field summary, or an empty cell without samples"""
+    return fmt.format(stat[key]) if stat else ""
+
+
+def _render_performance_table(generation_metrics):
+    """Per-model rolling performance over recent turns (all sessions)"""
+    summary = generation_metrics.summary()
+    if not summary:
+        st.caption("No responses recorded yet.")
+        return
+    
+    rows = []
+    for model, stats in sorted(summary.items()):
+        rows.append({
+            "Model": model,
+            "Turns": stats["generations"],
+            "TTFT Mean": _format_stat(stats["ttft"], "mean", "{:.2f} s"),
+            "TTFT p95": _format_stat(stats["ttft"], "p95", "{:.2f} s"),
+            "Tokens/s Mean": _format_stat(stats["tokens_per_second"], "mean", "{:.1f}"),
+            "Tokens/s p50": _format_stat(stats["tokens_per_second"], "p50", "{:.1f}"),
+            "Prompt Tokens/s Mean": _format_stat(stats["prompt_tokens_per_second"], "mean", "{:.0f}"),
+            "Load Mean": _format_stat(stats["load_seconds"], "mean", "{:.2f} s"),
+            "Load p95": _format_stat(stats["load_seconds"], "p95", "{:.2f} s"),
+            "Total p50": _format_stat(stats["total_seconds"], "p50", "{:.2f} s"),
+            "Total p95": _format_stat(stats["total_seconds"], "p95", "{:.2f} s")
+        })
+    st.dataframe(pd.DataFrame(rows), use_container_width=True, hide_index=True)
+    st.caption(
+        f"Statistics over each model's last {generation_metrics.window} responses. "
+        "TTFT is measured by the dashboard (request sent to first token) for streamed responses only."
+    )
+
+
+def _build_chat_messages(chat_history):
+    """Strip UI-only fields from the history before sending it to /api/chat"""
+    return [{"role": msg["role"], "content": msg["content"]} for msg in chat_history]
+
+
+@profiled()
 def render_model_interaction(api):
     """Render the model interaction interface for chat with models"""
     
@@ -30,8 +97,12 @@ def render_model_interaction(api):
     if "chat_history" not in st.session_state:
         st.session_state.chat_history = []
     
+    # KV context carried between /api/generate turns ({"model": ..., "tokens": [...]})
+    if "chat_context" not in st.session_state:
+        st.session_state.chat_context = None
+    
     # Model selection
-    model_options = ["Select..."] + [model.get("name", "") for model in st.session_state.models_data]
+    model_options = ["Select..."] + get_server_poller(api.base_url).latest().catalog.names
     selected_model = st.selectbox("Select Model", options=model_options)
     
     # Chat interface container
@@ -77,6 +148,17 @@ def render_model_interaction(api):
                     """, 
                     unsafe_allow_html=True
                 )
+                
+                # Prompt tokens the server had to evaluate for this turn
+                if message.get("prompt_eval_count") is not None:
+                    caption = f"Prompt tokens evaluated: {message['prompt_eval_count']}"
+                    if message.get("backend"):
+                        caption += f" · Served by {message['backend']}"
+                    st.caption(caption)
+                
+                # Generation performance of this turn
+                if message.get("performance"):
+                    st.caption(_format_performance(message["performance"]))
     
     # Input area
     st.markdown("<br/>", unsafe_allow_html=True)
@@ -117,6 +199,47 @@ def render_model_interaction(api):
                 value=True,
                 help="Stream the response token by token"
             )
+            
+            col1, col2 = st.columns(2)
+            
+            with col1:
+                render_interval_ms = st.number_input(
+                    "Render Interval (ms)",
+                    min_value=0,
+                    max_value=2000,
+                    value=DEFAULT_FLUSH_INTERVAL_MS,
+                    step=10,
+                    help="Minimum time between re-renders of a streaming response"
+                )
+            
+            with col2:
+                render_every_tokens = st.number_input(
+                    "Render Every N Tokens",
+                    min_value=1,
+                    max_value=1000,
+                    value=DEFAULT_FLUSH_TOKENS,
+                    help="Re-render after this many buffered tokens even if the interval has not elapsed"
+                )
+            
+            chat_mode = st.radio(
+                "Conversation Mode",
+                options=[CHAT_MODE, CONTEXT_MODE],
+                index=0,
+                help="Chat API sends the message list; KV context reuse sends only the new prompt "
+                     "plus the context tokens from the previous turn so the server skips re-processing "
+                     "the conversation prefix."
+            )
+            
+            fleet_hosts = get_fleet_registry().hosts()
+            route_across_fleet = st.checkbox(
+                "Route Across Fleet",
+                value=False,
+                disabled=not fleet_hosts,
+                help="Send each turn to the server (this one or a fleet host) that has the model "
+                     "and is expected to answer first: already loaded in VRAM, fewest requests in "
+                     "flight and lowest recent time to first token. Unreachable servers fall back "
+                     "to the next one. Configure hosts under Fleet Hosts in the sidebar."
+            )
         
         # Submit button
         col1, col2 = st.columns([6, 1])
@@ -130,6 +253,7 @@ def render_model_interaction(api):
         # Handle clear chat
         if clear_chat:
             st.session_state.chat_history = []
+            st.session_state.chat_context = None
             st.rerun()
         
         # Handle message submission
@@ -145,79 +269,126 @@ def render_model_interaction(api):
                     "content": user_prompt
                 })
                 
+                # KV context is only valid for the model that produced it
+                carried_context = None
+                if chat_mode == CONTEXT_MODE:
+                    saved_context = st.session_state.chat_context
+                    if saved_context and saved_context.get("model") == selected_model:
+                        carried_context = saved_context.get("tokens")
+                
+                # Either the sidebar server or a router over it and the fleet hosts
+                client = ModelRouter(router_hosts(api.base_url)) if route_across_fleet else api
+                
+                def send_request(stream):
+                    """Send the turn through the selected conversation mode"""
+                    if chat_mode == CHAT_MODE:
+                        return client.chat_with_model(
+                            selected_model,
+                            _build_chat_messages(st.session_state.chat_history),
+                            temperature=temperature,
+                            context_length=context_length,
+                            stream=stream
+                        )
+                    return client.generate_response(
+                        selected_model,
+                        user_prompt,
+                        temperature=temperature,
+                        context_length=context_length,
+                        chat_history=st.session_state.chat_history[:-1],  # Exclude the most recent message
+                        context=carried_context,
+                        stream=stream
+                    )
+                
                 # Create a placeholder for the assistant's response
                 with st.spinner(f"Generating response from {selected_model}..."):
+                    final_stats = None
+                    full_response = ""
+                    ttft = None
+                    request_started = time.perf_counter()
+                    
                     if stream_response:
                         # For streaming response
                         response_placeholder = st.empty()
-                        full_response = ""
                         
-                        try:
-                            # Pass the existing chat history to provide context
-                            response_stream = api.generate_response(
-                                selected_model,
-                                user_prompt,
-                                temperature=temperature,
-                                context_length=context_length,
-                                chat_history=st.session_state.chat_history[:-1],  # Exclude the most recent message
-                                stream=True
+                        def render_bubble(text):
+                            """Render the partial response in an assistant bubble"""
+                            response_placeholder.markdown(
+                                f"""
+                                <div style="display: flex; justify-content: flex-start; margin-bottom: 1rem;">
+                                    <div style="background-color: #323232; padding: 0.8rem; border-radius: 15px 15px 15px 0; max-width: 80%;">
+                                        {text}
+                                    </div>
+                                </div>
+                                """, 
+                                unsafe_allow_html=True
                             )
+                        
+                        # Batch tokens so the bubble is re-rendered at a bounded rate
+                        renderer = StreamRenderer(
+                            render_bubble,
+                            interval_ms=render_interval_ms,
+                            flush_tokens=render_every_tokens
+                        )
+                        
+                        try:
+                            response_stream = send_request(stream=True)
+                            if isinstance(response_stream, dict):
+                                raise RuntimeError(response_stream.get("error", "Unknown error"))
                             
-                            # We're using a streaming response, so we need to iterate through the chunks
-                            for chunk in response_stream.iter_lines():
-                                if chunk:
-                                    chunk_data = json.loads(chunk.decode('utf-8'))
-                                    response_text = chunk_data.get("response", "")
-                                    full_response += response_text
-                                    
-                                    # Update the placeholder with the accumulated response
-                                    response_placeholder.markdown(
-                                        f"""
-                                        <div style="display: flex; justify-content: flex-start; margin-bottom: 1rem;">
-                                            <div style="background-color: #323232; padding: 0.8rem; border-radius: 15px 15px 15px 0; max-width: 80%;">
-                                                {full_response}
-                                            </div>
-                                        </div>
-                                        """, 
-                                        unsafe_allow_html=True
-                                    )
-                                    
-                                    # Check if the response is done
-                                    if chunk_data.get("done", False):
-                                        break
-                            
-                            # Add the assistant's response to chat history
-                            st.session_state.chat_history.append({
-                                "role": "assistant",
-                                "content": full_response
-                            })
-                            
+                            # Decode the NDJSON stream into typed events
+                            for event in iter_events(response_stream):
+                                if isinstance(event, TokenChunk):
+                                    if ttft is None and event.text:
+                                        ttft = time.perf_counter() - request_started
+                                    renderer.add(event.text)
+                                elif isinstance(event, FinalStats):
+                                    final_stats = event
+                                    break
+                                elif isinstance(event, StreamError):
+                                    raise RuntimeError(event.message)
                         except Exception as e:
                             st.error(f"Error generating response: {str(e)}")
+                        finally:
+                            full_response = renderer.finish()
+                            st.session_state.last_render_stats = renderer.stats()
                     else:
                         # For non-streaming response
                         try:
-                            response = api.generate_response(
-                                selected_model,
-                                user_prompt,
-                                temperature=temperature,
-                                context_length=context_length,
-                                chat_history=st.session_state.chat_history[:-1],  # Exclude the most recent message
-                                stream=False
-                            )
+                            response = send_request(stream=False)
                             
                             if "error" not in response:
-                                response_text = response.get("response", "")
-                                
-                                # Add the assistant's response to chat history
-                                st.session_state.chat_history.append({
-                                    "role": "assistant",
-                                    "content": response_text
-                                })
+                                for event in decode_object(response):
+                                    if isinstance(event, TokenChunk):
+                                        full_response = event.text
+                                    elif isinstance(event, FinalStats):
+                                        final_stats = event
                             else:
                                 st.error(f"Error: {response.get('error')}")
                         except Exception as e:
                             st.error(f"Error generating response: {str(e)}")
+                    
+                    if final_stats is not None:
+                        performance = get_generation_metrics().record(selected_model, final_stats, ttft)
+                        
+                        # Usage history and hit rate of the server that answered
+                        served_by = client.last_route.host.base_url if route_across_fleet and client.last_route else api.base_url
+                        get_warm_pool(served_by).record_request(selected_model, performance["load_seconds"])
+                        
+                        # Add the assistant's response to chat history
+                        st.session_state.chat_history.append({
+                            "role": "assistant",
+                            "content": full_response,
+                            "prompt_eval_count": final_stats.prompt_eval_count,
+                            "performance": performance,
+                            "backend": client.last_route.host.label if route_across_fleet and client.last_route else None
+                        })
+                        
+                        # Keep the returned context for the next /api/generate turn
+                        if chat_mode == CONTEXT_MODE and final_stats.context:
+                            st.session_state.chat_context = {
+                                "model": selected_model,
+                                "tokens": final_stats.context
+                            }
                 
                 # Rerun the app to update the chat history
                 st.rerun()
@@ -236,4 +407,17 @@ def render_model_interaction(api):
                 unsafe_allow_html=True
             )
             
+            # Streaming render cadence of the last response
+            render_stats = st.session_state.get("last_render_stats")
+            if render_stats:
+                st.caption(
+                    f"Last streamed response: {render_stats['tokens']} tokens in "
+                    f"{render_stats['render_calls']} renders "
+                    f"({render_stats['tokens_per_render']:.1f} tokens/render)"
+                )
+            
             st.info("For more detailed model information, visit the Model Details tab in the Model Management section.")
+    
+    # Per-model generation performance
+    with st.expander("Model Performance"):
+        _render_performance_table(get_generation_metrics())
@@ -1,9 +1,481 @@
 import streamlit as st
 import time
 import pandas as pd
-from datetime import datetime
-import json
+import plotly.express as px
+from datetime import datetime, timezone
+from utils.pull_manager import get_pull_manager, PullManager, COMPLETED
+from utils.poller import get_server_poller, SNAPSHOT_WAIT_TIMEOUT
+from utils.profiling import profiled
+from utils.api_handler import thaw
+from utils.bulk import run_bulk, LOAD, UNLOAD, DELETE, BULK_MAX_WORKERS
+from utils.scheduler import get_vram_scheduler, LRU, PRIORITY
+from utils.warm_pool import get_warm_pool, WARM_POOL_KEEP_ALIVE, PRELOAD_MIN_DAYS, REARM, PRELOAD
 
+# Seconds between reruns of the pull jobs fragment
+PULL_JOBS_REFRESH_INTERVAL = 1
+
+# Keep-alive choices offered when loading models into VRAM
+KEEP_ALIVE_OPTIONS = {
+    "5 minutes": "5m",
+    "10 minutes": "10m",
+    "30 minutes": "30m",
+    "1 hour": "1h",
+    "4 hours": "4h",
+    "Indefinite": "1d",
+    "Custom (minutes)": "custom"
+}
+
+# Eviction policies offered by the VRAM scheduler
+EVICTION_POLICIES = {
+    "Least Recently Used": LRU,
+    "Priority": PRIORITY
+}
+
+# Bulk operation labels
+BULK_OPERATIONS = {
+    "Load into VRAM": LOAD,
+    "Unload from VRAM": UNLOAD,
+    "Delete": DELETE
+}
+
+
+def _format_bytes(size_bytes):
+    """Format a byte count in the most appropriate unit"""
+    if size_bytes > 1024 * 1024 * 1024:
+        return f"{size_bytes / (1024 * 1024 * 1024):.2f} GB"
+    elif size_bytes > 1024 * 1024:
+        return f"{size_bytes / (1024 * 1024):.2f} MB"
+    else:
+        return f"{size_bytes / 1024:.2f} KB"
+
+
+def _format_eta(seconds):
+    """Format an ETA in seconds as H:MM:SS (empty when unknown)"""
+    if seconds is None:
+        return ""
+    minutes, secs = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}:{minutes:02d}:{secs:02d}"
+
+
+@st.fragment(run_every=PULL_JOBS_REFRESH_INTERVAL)
+def _render_pull_jobs(api, pull_manager: PullManager, completed: int):
+    """Render the live table of pull jobs from every session.
+    
+    Runs as a fragment so progress updates without rerunning the page. When
+    a pull completes, the model list is refreshed and the page reruns.
+    """
+    if pull_manager.finished[COMPLETED] != completed:
+        get_server_poller(api.base_url).refresh(wait=SNAPSHOT_WAIT_TIMEOUT)
+        st.rerun()
+    
+    st.markdown("<div class='card-title'>Pull Jobs</div>", unsafe_allow_html=True)
+    
+    jobs = pull_manager.jobs()
+    if not jobs:
+        st.info("No pulls yet. Queued pulls run in the background, so you can leave this page while they download.")
+        return
+    
+    jobs_data = []
+    for job in jobs:
+        jobs_data.append({
+            "Model": job.model_name,
+            "Server": job.base_url,
+            "Status": job.status.capitalize(),
+            "Progress": job.fraction,
+            "Downloaded": f"{_format_bytes(job.completed)} / {_format_bytes(job.total)}" if job.total else "",
+            "Layers": f"{job.tracker.layers_done}/{len(job.tracker.layers)}",
+            "Speed": f"{_format_bytes(job.tracker.speed)}/s" if job.is_active and job.tracker.speed else "",
+            "ETA": _format_eta(job.tracker.eta) if job.is_active else "",
+            "Message": job.message,
+            "Elapsed": f"{job.elapsed:.0f}s",
+            "Job": job.job_id
+        })
+    
+    st.dataframe(
+        pd.DataFrame(jobs_data),
+        use_container_width=True,
+        hide_index=True,
+        column_config={
+            "Progress": st.column_config.ProgressColumn("Progress", min_value=0.0, max_value=1.0, format="percent")
+        }
+    )
+    
+    # Per-layer completion for one job
+    with st.expander("Layer Details", expanded=False):
+        jobs_by_id = {job.job_id: job for job in jobs}
+        layer_job_id = st.selectbox(
+            "Job",
+            options=list(jobs_by_id.keys()),
+            format_func=lambda job_id: f"{jobs_by_id[job_id].model_name} ({job_id})",
+            key="layer_details_job"
+        )
+        layers = jobs_by_id[layer_job_id].tracker.layer_summary() if layer_job_id in jobs_by_id else []
+        if layers:
+            st.dataframe(
+                pd.DataFrame([{
+                    "Digest": layer["digest"][:19],
+                    "Completed": _format_bytes(layer["completed"]),
+                    "Total": _format_bytes(layer["total"]),
+                    "Resumed From": _format_bytes(layer["resumed_from"]) if layer["resumed_from"] else "",
+                    "Progress": layer["fraction"]
+                } for layer in layers]),
+                use_container_width=True,
+                hide_index=True,
+                column_config={
+                    "Progress": st.column_config.ProgressColumn("Progress", min_value=0.0, max_value=1.0, format="percent")
+                }
+            )
+        else:
+            st.caption("No layer information yet.")
+    
+    col1, col2, col3 = st.columns([2, 1, 1])
+    
+    with col1:
+        active_jobs = [job for job in jobs if job.is_active]
+        cancel_job = st.selectbox(
+            "Cancel Pull",
+            options=["Select..."] + [f"{job.model_name} ({job.job_id})" for job in active_jobs],
+            key="cancel_pull_select",
+            label_visibility="collapsed"
+        )
+    
+    with col2:
+        if st.button("Cancel Pull", key="cancel_pull_button", disabled=cancel_job == "Select..."):
+            pull_manager.cancel(cancel_job.rsplit("(", 1)[1].rstrip(")"))
+            st.rerun(scope="fragment")
+    
+    with col3:
+        if st.button("Refresh Jobs", key="refresh_pull_jobs"):
+            st.rerun(scope="fragment")
+    
+    if any(not job.is_active for job in jobs):
+        if st.button("Clear Finished", key="clear_finished_pulls"):
+            pull_manager.clear_finished()
+            st.rerun(scope="fragment")
+
+
+def _render_bulk_results(state_key="bulk_results"):
+    """Show the results of the last bulk operation, which survive the rerun that follows it"""
+    report = st.session_state.get(state_key)
+    if not report:
+        return
+    
+    failed = [result for result in report["results"] if not result.ok]
+    succeeded = len(report["results"]) - len(failed)
+    summary = f"{report['label']}: {succeeded} of {len(report['results'])} succeeded in {report['seconds']:.1f}s"
+    if not failed:
+        st.success(summary)
+    elif succeeded:
+        st.warning(f"{summary}, {len(failed)} failed")
+    else:
+        st.error(f"{summary}, all failed")
+    
+    st.dataframe(
+        pd.DataFrame([{
+            "Model": result.model,
+            "Result": "✅ OK" if result.ok else "❌ Failed",
+            "Message": result.message,
+            "Time (s)": round(result.seconds, 2)
+        } for result in report["results"]]),
+        use_container_width=True,
+        hide_index=True
+    )
+    
+    if st.button("Clear Results", key=f"clear_{state_key}"):
+        del st.session_state[state_key]
+        st.rerun()
+
+
+def _render_bulk_operations(api, poller, catalog):
+    """Render the multi-model load/unload/delete controls.
+    
+    The selected models are processed by a bounded worker pool; the model
+    list is refreshed and the page reruns once when all of them finish.
+    """
+    st.markdown("<div class='card-title'>Bulk Operations</div>", unsafe_allow_html=True)
+    
+    _render_bulk_results()
+    
+    operation_label = st.radio(
+        "Bulk Operation",
+        options=list(BULK_OPERATIONS.keys()),
+        horizontal=True,
+        key="bulk_operation"
+    )
+    operation = BULK_OPERATIONS[operation_label]
+    
+    running_names = [model.get("name") for model in poller.latest().running_models if model.get("name")]
+    if operation == UNLOAD:
+        # Only resident models can be unloaded
+        options = running_names
+        if not options:
+            st.info("No models are loaded in VRAM.")
+            return
+    else:
+        options = catalog.names
+    
+    col1, col2 = st.columns([3, 1])
+    with col2:
+        select_all = st.checkbox(
+            "All running" if operation == UNLOAD else "All models",
+            key="bulk_select_all"
+        )
+    with col1:
+        selected_models = st.multiselect(
+            "Models",
+            options=options,
+            key=f"bulk_models_{operation}",
+            disabled=select_all
+        )
+    if select_all:
+        selected_models = options
+    
+    keep_alive_value = "5m"
+    confirmed = True
+    if operation == LOAD:
+        keep_alive = st.selectbox(
+            "Keep Alive Duration",
+            options=list(KEEP_ALIVE_OPTIONS.keys()),
+            index=0,
+            key="bulk_keep_alive_select"
+        )
+        keep_alive_value = KEEP_ALIVE_OPTIONS[keep_alive]
+        if keep_alive == "Custom (minutes)":
+            custom_minutes = st.number_input(
+                "Enter custom duration in minutes",
+                min_value=1,
+                value=30,
+                key="bulk_custom_minutes_input"
+            )
+            keep_alive_value = f"{custom_minutes}m"
+        st.caption("Models that do not fit in VRAM at the same time will push each other out or run partly on CPU.")
+    elif operation == DELETE:
+        st.warning("⚠️ Warning: This action cannot be undone. The selected models will be permanently deleted from your system.")
+        confirmed = st.checkbox(
+            f"I confirm that I want to delete {len(selected_models)} model(s)",
+            key="confirm_bulk_delete"
+        )
+    
+    if st.button(
+        f"{operation_label} ({len(selected_models)})",
+        key="bulk_operation_button",
+        type="primary",
+        disabled=not selected_models or not confirmed
+    ):
+        progress_bar = st.progress(0.0, text=f"{operation_label}: 0/{len(selected_models)}")
+        
+        def on_progress(result, done, total):
+            progress_bar.progress(done / total, text=f"{operation_label}: {done}/{total} ({result.model})")
+        
+        start = time.perf_counter()
+        results = run_bulk(
+            api,
+            operation,
+            selected_models,
+            keep_alive=keep_alive_value,
+            max_workers=BULK_MAX_WORKERS,
+            progress=on_progress
+        )
+        st.session_state.bulk_results = {
+            "label": operation_label,
+            "results": results,
+            "seconds": time.perf_counter() - start
+        }
+        
+        if operation != LOAD:
+            # Deleted and unloaded models drop out of the options
+            st.session_state.pop(f"bulk_models_{operation}", None)
+        
+        # One refresh of the shared snapshot for the whole batch
+        poller.refresh(wait=SNAPSHOT_WAIT_TIMEOUT)
+        st.rerun()
+
+
+def _format_gb(size_bytes):
+    return f"{size_bytes / (1024 * 1024 * 1024):.1f} GB"
+
+
+def _render_vram_scheduler(api, catalog):
+    """Render "ensure resident" requests planned against the server's VRAM budget"""
+    st.markdown("<div class='card-title'>VRAM Scheduler</div>", unsafe_allow_html=True)
+    st.caption("Makes models resident without exceeding the VRAM budget, unloading other models first when needed.")
+    
+    scheduler = get_vram_scheduler(api.base_url)
+    
+    _render_bulk_results("schedule_results")
+    
+    # The scheduler is shared by every session, so its settings are written
+    # only when this session changes them and re-read on every rerun
+    def apply_budget():
+        scheduler.budget = int(st.session_state.vram_budget_gb * 1024 * 1024 * 1024)
+    
+    st.session_state.vram_budget_gb = scheduler.budget / (1024 * 1024 * 1024)
+    st.number_input(
+        "VRAM Budget (GB)",
+        min_value=0.0,
+        step=1.0,
+        format="%.1f",
+        help="Defaults to OLLAMA_VRAM_CAPACITY_GB. Shared by every session viewing this server.",
+        key="vram_budget_gb",
+        on_change=apply_budget
+    )
+    
+    col1, col2 = st.columns([3, 1])
+    with col1:
+        selected_models = st.multiselect("Models to Keep Resident", options=catalog.names, key="schedule_models")
+    with col2:
+        keep_alive = st.selectbox(
+            "Keep Alive",
+            options=[label for label, value in KEEP_ALIVE_OPTIONS.items() if value != "custom"],
+            index=3,
+            key="schedule_keep_alive"
+        )
+    
+    policy_label = st.radio("Eviction Policy", options=list(EVICTION_POLICIES.keys()), horizontal=True,
+                            key="schedule_policy")
+    policy = EVICTION_POLICIES[policy_label]
+    if policy == PRIORITY:
+        def apply_priorities():
+            scheduler.set_priorities({name: 1 for name in st.session_state.schedule_high_priority})
+        
+        st.session_state.schedule_high_priority = [name for name in catalog.names if scheduler.priority(name) > 0]
+        st.multiselect(
+            "High Priority Models",
+            options=catalog.names,
+            help="Only evicted by requests that include a high priority model. Shared by every session viewing this server.",
+            key="schedule_high_priority",
+            on_change=apply_priorities
+        )
+    
+    if not selected_models:
+        return
+    
+    plan = scheduler.plan(selected_models, policy)
+    rows = [{"Model": name, "Action": "Keep (resident)", "VRAM": ""} for name in plan.resident]
+    rows += [{"Model": name, "Action": "Load", "VRAM": f"~{_format_gb(size)}"} for name, size in plan.required.items()]
+    rows += [{"Model": model.name, "Action": "Evict", "VRAM": _format_gb(model.size_vram)} for model in plan.evict]
+    st.dataframe(pd.DataFrame(rows), use_container_width=True, hide_index=True)
+    
+    if plan.fits:
+        st.info(f"VRAM after applying: {_format_gb(plan.projected)} of {_format_gb(plan.budget)} "
+                f"({len(plan.evict)} eviction(s), {len(plan.to_load)} load(s))")
+    else:
+        st.error(f"Cannot apply this plan: {plan.reason}")
+    
+    if st.button("Ensure Resident", key="ensure_resident_button", type="primary", disabled=not plan.fits):
+        start = time.perf_counter()
+        with st.spinner("Applying VRAM plan..."):
+            applied, results = scheduler.ensure_resident(selected_models, KEEP_ALIVE_OPTIONS[keep_alive], policy)
+        if not applied.fits:
+            # Residency changed since the preview
+            st.error(f"Cannot apply this plan: {applied.reason}")
+        else:
+            st.session_state.schedule_results = {
+                "label": "Ensure Resident",
+                "results": results,
+                "seconds": time.perf_counter() - start
+            }
+            st.rerun()
+
+
+def _render_warm_pool(api, catalog):
+    """Render the pinned models, usage predictions and hit rate of the server's warm pool"""
+    st.markdown("<div class='card-title'>Warm Pool</div>", unsafe_allow_html=True)
+    st.caption(
+        f"Keeps pinned models loaded by re-arming their keep-alive ({WARM_POOL_KEEP_ALIVE}) before it expires, "
+        f"and preloads models shortly before the hours they are usually used."
+    )
+    
+    pool = get_warm_pool(api.base_url)
+    
+    # Shared by every session: written only in callbacks, re-read on every rerun
+    def apply_pinned():
+        pool.set_pinned(st.session_state.warm_pool_pinned)
+    
+    def apply_predictive():
+        pool.set_predictive(st.session_state.warm_pool_predictive)
+    
+    st.session_state.warm_pool_pinned = [name for name in catalog.names if name in pool.pinned]
+    st.session_state.warm_pool_predictive = pool.predictive
+    
+    col1, col2 = st.columns([3, 1])
+    with col1:
+        st.multiselect(
+            "Pinned Models",
+            options=catalog.names,
+            key="warm_pool_pinned",
+            on_change=apply_pinned
+        )
+    with col2:
+        st.checkbox(
+            "Predictive Preload",
+            help=f"Preload models from the hourly usage of chats on this page (after {PRELOAD_MIN_DAYS} days of history)",
+            key="warm_pool_predictive",
+            on_change=apply_predictive
+        )
+    
+    hit_rate = pool.hit_rate()
+    counts = pool.request_counts()
+    actions = list(pool.actions)
+    metric_cols = st.columns(4)
+    metric_cols[0].metric("Hit Rate", f"{hit_rate:.0%}" if hit_rate is not None else "—",
+                          help="Chat requests that found their model already loaded")
+    metric_cols[1].metric("Requests", sum(total for total, _ in counts.values()))
+    metric_cols[2].metric("Re-arms", sum(1 for action in actions if action.action == REARM and action.ok))
+    metric_cols[3].metric("Preloads", sum(1 for action in actions if action.action == PRELOAD and action.ok))
+    
+    warm = pool.warm_models()
+    predicted = sorted(name for name, reason in warm.items() if reason == "predicted")
+    if predicted:
+        st.info(f"Predicted for this hour: {', '.join(predicted)}")
+    
+    if counts:
+        st.dataframe(
+            pd.DataFrame([{
+                "Model": name,
+                "Warm": warm.get(name, "").capitalize(),
+                "Requests": total,
+                "Hits": hits,
+                "Hit Rate": hits / total
+            } for name, (total, hits) in sorted(counts.items())]),
+            use_container_width=True,
+            hide_index=True,
+            column_config={
+                "Hit Rate": st.column_config.ProgressColumn("Hit Rate", min_value=0.0, max_value=1.0, format="percent")
+            }
+        )
+    
+    shares = pool.usage.shares(datetime.now().date())
+    if shares:
+        with st.expander("Hourly Usage"):
+            usage = pd.DataFrame(
+                [[hours.get(hour, 0.0) for hour in range(24)] for hours in shares.values()],
+                index=list(shares.keys()),
+                columns=[f"{hour:02d}:00" for hour in range(24)]
+            )
+            chart = px.imshow(usage, color_continuous_scale="Blues", zmin=0, zmax=1, aspect="auto",
+                              labels={"color": "Share of days"})
+            chart.update_layout(height=max(200, 30 * len(usage) + 100), margin=dict(l=10, r=10, t=10, b=10))
+            st.plotly_chart(chart, use_container_width=True)
+    
+    if actions:
+        with st.expander("Recent Warm Pool Actions"):
+            st.dataframe(
+                pd.DataFrame([{
+                    "Time": datetime.fromtimestamp(action.at).strftime("%H:%M:%S"),
+                    "Model": action.model,
+                    "Action": action.action.capitalize(),
+                    "Why": action.reason.capitalize(),
+                    "Result": "✅" if action.ok else "❌",
+                    "Message": action.message
+                } for action in reversed(actions)]),
+                use_container_width=True,
+                hide_index=True
+            )
+
+
+@profiled()
 def render_model_management(api):
     """Render the model management interface with pull, delete, and detail options"""
     
@@ -28,6 +500,10 @@ def render_model_management(api):
         )
         return
     
+    # Installed models, indexed once per /api/tags change by the shared poller
+    poller = get_server_poller(api.base_url)
+    catalog = poller.latest().catalog
+    
     # Create tabs for different management functions
     tab1, tab2, tab3 = st.tabs(["Pull New Model", "Manage Existing Models", "Model Details"])
     
@@ -58,7 +534,7 @@ def render_model_management(api):
             model_name = st.text_input(
                 "Model Name",
                 placeholder="e.g., llama3.1:latest",
-                help="Enter the model name and tag to pull (e.g., llama3.1:latest)"
+                help="Enter the model name and tag to pull (e.g., llama3.1:latest). Separate several models with commas to pull them all."
             )
         
         with col2:
@@ -71,165 +547,39 @@ def render_model_management(api):
             if suggested_model != "Select...":
                 model_name = suggested_model
         
-        # Pull model button
+        # Pull model button (several models can be given, separated by commas or spaces)
         if st.button("Pull Model", key="pull_model_button"):
-            if not model_name:
+            model_names = [name for name in model_name.replace(",", " ").split() if name] if model_name else []
+            if not model_names:
                 st.error("Please enter a model name")
             else:
-                # Create placeholders for progress tracking
-                progress_container = st.container()
-                detail_expander = progress_container.expander("View Download Details", expanded=False)
-                progress_msg = progress_container.empty()
-                progress_bar = progress_container.progress(0.0)
-                details_placeholder = detail_expander.empty()
-                
-                # Initialize details
-                current_file = ""
-                download_speed = "0 KB/s"
-                completed_size = 0
-                total_size = 0
-                
-                # Show initial status
-                progress_msg.info(f"Starting download of {model_name}...")
-                details_placeholder.markdown("Initializing download...")
-                
-                try:
-                    # Get streaming response
-                    response_stream = api.pull_model(model_name, stream=True)
-                    
-                    # Initialize vars for tracking progress
-                    download_start_time = time.time()
-                    last_update_time = download_start_time
-                    last_completed_size = 0
-                    
-                    # Process the stream
-                    for chunk in response_stream.iter_lines():
-                        if chunk:
-                            try:
-                                # Parse the JSON data
-                                chunk_data = json.loads(chunk.decode('utf-8'))
-                                
-                                # Extract progress information
-                                status = chunk_data.get("status", "")
-                                
-                                if "digest" in chunk_data:
-                                    current_file = chunk_data.get("digest", "")[:12]  # First 12 chars of digest
-                                
-                                # Calculate completed and total (if available)
-                                if "completed" in chunk_data and "total" in chunk_data:
-                                    completed_size = chunk_data.get("completed", 0)
-                                    total_size = chunk_data.get("total", 0)
-                                    
-                                    # Calculate progress percentage
-                                    if total_size > 0:
-                                        progress_percentage = min(completed_size / total_size, 1.0)
-                                        progress_bar.progress(progress_percentage)
-                                    
-                                    # Calculate download speed (every second)
-                                    current_time = time.time()
-                                    if current_time - last_update_time >= 1.0:
-                                        time_diff = current_time - last_update_time
-                                        size_diff = completed_size - last_completed_size
-                                        
-                                        # Calculate speed in bytes/second
-                                        speed = size_diff / time_diff
-                                        
-                                        # Format speed for display
-                                        if speed >= 1024 * 1024:
-                                            download_speed = f"{speed / (1024 * 1024):.2f} MB/s"
-                                        else:
-                                            download_speed = f"{speed / 1024:.2f} KB/s"
-                                        
-                                        # Update tracking variables
-                                        last_update_time = current_time
-                                        last_completed_size = completed_size
-                                
-                                # Update the display
-                                if completed_size > 0 and total_size > 0:
-                                    completed_mb = completed_size / (1024 * 1024)
-                                    total_mb = total_size / (1024 * 1024)
-                                    
-                                    progress_msg.info(
-                                        f"Downloading {model_name}: {completed_mb:.2f}/{total_mb:.2f} MB ({(completed_size/total_size*100):.1f}%)"
-                                    )
-                                    
-                                    details_placeholder.markdown(
-                                        f"""
-                                        **Current Status:** {status}  
-                                        **Current File:** {current_file}  
-                                        **Download Speed:** {download_speed}  
-                                        **Progress:** {completed_mb:.2f} MB of {total_mb:.2f} MB  
-                                        **Elapsed Time:** {time.time() - download_start_time:.1f} seconds
-                                        """
-                                    )
-                                elif status:
-                                    # Just show the status if no size info
-                                    progress_msg.info(f"Status: {status}")
-                                    details_placeholder.markdown(
-                                        f"""
-                                        **Current Status:** {status}  
-                                        **Current File:** {current_file}  
-                                        **Elapsed Time:** {time.time() - download_start_time:.1f} seconds
-                                        """
-                                    )
-                            except json.JSONDecodeError:
-                                # Skip invalid JSON
-                                pass
-                    
-                    # Show completion message
-                    progress_bar.progress(1.0)
-                    progress_msg.success(f"Model {model_name} pulled successfully!")
-                    details_placeholder.markdown(
-                        f"""
-                        **Status:** Download Complete  
-                        **Total Size:** {total_size / (1024 * 1024):.2f} MB  
-                        **Total Time:** {time.time() - download_start_time:.1f} seconds  
-                        **Average Speed:** {total_size / (1024 * 1024) / (time.time() - download_start_time):.2f} MB/s
-                        """
-                    )
-                    
-                    # Force refresh of models data
-                    st.session_state.models_data = api.list_models()
-                    
-                except Exception as e:
-                    progress_msg.error(f"Error pulling model: {str(e)}")
+                # Pulls run in the background and survive reruns and navigation
+                pull_manager = get_pull_manager()
+                for name in model_names:
+                    pull_manager.submit(api.base_url, name)
+                st.success(f"Queued {len(model_names)} pull(s): {', '.join(model_names)}")
         
-        # Progress indicator (note: for streaming progress, we would need WebSockets)
         st.markdown("<br/>", unsafe_allow_html=True)
-        st.info("Note: Progress reporting for model downloads is limited in this interface. Check server logs for detailed progress.")
+        pull_manager = get_pull_manager()
+        _render_pull_jobs(api, pull_manager, pull_manager.finished[COMPLETED])
     
     # Manage Existing Models tab
     with tab2:
         # Display models table
-        if not st.session_state.models_data:
+        if not len(catalog):
             st.warning("No models available. Pull some models first.")
         else:
             # Create dataframe for better display
             models_data = []
-            for model in st.session_state.models_data:
-                model_name = model.get("name", "Unknown")
-                size_bytes = model.get("size", 0)
-                
-                # Calculate size in appropriate units
-                if size_bytes > 1024 * 1024 * 1024:
-                    size_str = f"{size_bytes / (1024 * 1024 * 1024):.2f} GB"
-                elif size_bytes > 1024 * 1024:
-                    size_str = f"{size_bytes / (1024 * 1024):.2f} MB"
-                else:
-                    size_str = f"{size_bytes / 1024:.2f} KB"
-                
-                modified = model.get("modified_at", "Unknown")
+            for record in catalog:
                 # Format modification date
-                if modified != "Unknown":
-                    try:
-                        modified_date = datetime.fromisoformat(modified.replace('Z', '+00:00'))
-                        modified = modified_date.strftime("%Y-%m-%d %H:%M")
-                    except (ValueError, AttributeError):
-                        pass
+                modified = record.modified_at or "Unknown"
+                if record.modified:
+                    modified = datetime.fromtimestamp(record.modified, timezone.utc).strftime("%Y-%m-%d %H:%M")
                 
                 models_data.append({
-                    "Model": model_name,
-                    "Size": size_str,
+                    "Model": record.name,
+                    "Size": _format_bytes(record.size),
                     "Modified": modified
                 })
             
@@ -253,7 +603,7 @@ def render_model_management(api):
             # Simplified interface with single model selection
             selected_model = st.selectbox(
                 "Select Model",
-                options=["Select..."] + [model.get("name", "") for model in st.session_state.models_data],
+                options=["Select..."] + catalog.names,
                 key="operations_model_select"
             )
             
@@ -266,15 +616,7 @@ def render_model_management(api):
             
             # Conditional UI based on operation
             if operation == "Load Model into VRAM":
-                keep_alive_options = {
-                    "5 minutes": "5m",
-                    "10 minutes": "10m",
-                    "30 minutes": "30m",
-                    "1 hour": "1h",
-                    "4 hours": "4h",
-                    "Indefinite": "1d",
-                    "Custom (minutes)": "custom"
-                }
+                keep_alive_options = KEEP_ALIVE_OPTIONS
                 
                 keep_alive = st.selectbox(
                     "Keep Alive Duration",
@@ -353,7 +695,7 @@ def render_model_management(api):
                             if "error" not in result:
                                 st.success(f"Model {selected_model} deleted successfully!")
                                 # Force refresh of models data
-                                st.session_state.models_data = api.list_models()
+                                poller.refresh(wait=SNAPSHOT_WAIT_TIMEOUT)
                                 time.sleep(1)  # Brief pause to ensure UI updates
                                 st.rerun()  # Refresh the page to update model list
                             else:
@@ -361,6 +703,15 @@ def render_model_management(api):
             
             elif operation != "Select...":
                 st.info("Please select an operation from the dropdown above.")
+            
+            st.markdown("<br/>", unsafe_allow_html=True)
+            _render_bulk_operations(api, poller, catalog)
+            
+            st.markdown("<br/>", unsafe_allow_html=True)
+            _render_vram_scheduler(api, catalog)
+            
+            st.markdown("<br/>", unsafe_allow_html=True)
+            _render_warm_pool(api, catalog)
     
     # Model Details tab
     with tab3:
@@ -379,7 +730,7 @@ def render_model_management(api):
         # Model selection for details
         detail_model = st.selectbox(
             "Select Model",
-            options=["Select..."] + [model.get("name", "") for model in st.session_state.models_data],
+            options=["Select..."] + catalog.names,
             key="detail_model_select"
         )
         
@@ -402,6 +753,6 @@ def render_model_management(api):
                         )
                         
                         # Format model parameters nicely
-                        st.json(details)
+                        st.json(thaw(details))
                     else:
                         st.error(f"Error fetching model details: {details.get('error')}")
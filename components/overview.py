@@ -1,40 +1,73 @@
 import streamlit as st
 import time
+import math
 import datetime
 from dateutil import parser
 import pandas as pd
 import plotly.express as px
+from utils.poller import get_server_poller, SNAPSHOT_WAIT_TIMEOUT
+from utils.profiling import profiled
 
-def render_overview(api):
-    """Render the overview dashboard with model summary cards"""
+# Seconds between reruns of the running models fragment (expiry countdowns, new snapshots)
+RUNNING_MODELS_REFRESH_INTERVAL = 1
+
+# Model grid layout: cards per row and the page sizes offered
+GRID_COLUMNS = 3
+GRID_PAGE_SIZES = [12, 24, 48]
+
+
+def _render_vram_history(history):
+    """Render stacked VRAM over time and load/unload events from the poller's history"""
+    samples = history.frame()
+    if samples["time"].nunique() < 2:
+        st.caption("VRAM history will appear after a few polls.")
+        return
     
-    st.markdown("<div class='card-title'>Models Overview</div>", unsafe_allow_html=True)
+    samples["VRAM (GB)"] = samples["size_vram"] / (1024 * 1024 * 1024)
+    vram_chart = px.area(
+        samples,
+        x="time",
+        y="VRAM (GB)",
+        color="model",
+        labels={"time": "Time (UTC)", "model": "Model"},
+        title="VRAM by Model"
+    )
+    st.plotly_chart(vram_chart, use_container_width=True)
     
-    # Check if API is connected first
-    if not st.session_state.get("api_connected", False):
-        st.warning("Not connected to Ollama server. Please configure and test your connection in the sidebar.")
-        
-        # Display example connection instructions
-        st.markdown(
-            """
-            <div class="card">
-                <div class="card-title">Connection Instructions</div>
-                <div class="card-subtitle">
-                    1. Ensure your Ollama server is running
-                    2. Enter the correct server URL in the sidebar (default: http://localhost:11434)
-                    3. Click "Test Connection" to verify
-                </div>
-            </div>
-            """, 
-            unsafe_allow_html=True
-        )
+    events = history.events()
+    if events.empty:
+        st.caption("No models were loaded or unloaded in this period.")
         return
-        
+    
+    events["VRAM (GB)"] = events["size_vram"] / (1024 * 1024 * 1024)
+    events_chart = px.scatter(
+        events,
+        x="time",
+        y="model",
+        color="event",
+        symbol="event",
+        hover_data={"VRAM (GB)": ":.2f"},
+        color_discrete_map={"Load": "#30d158", "Unload": "#ff453a"},
+        labels={"time": "Time (UTC)", "model": "Model", "event": "Event"},
+        title="Load / Unload Events"
+    )
+    events_chart.update_traces(marker={"size": 12})
+    st.plotly_chart(events_chart, use_container_width=True)
+
+
+@st.fragment(run_every=RUNNING_MODELS_REFRESH_INTERVAL)
+def _render_running_models(api, poller, models_version):
+    """Render the running models table from the shared poller's /api/ps data.
+    
+    Runs as a fragment so countdowns and residency changes update without
+    rerunning the page; the page reruns only when the installed models change.
+    """
     # Running Models Section
     st.markdown("<div class='card-title'>Currently Running Models</div>", unsafe_allow_html=True)
     
     # Display running models
-    running_models = api.get_running_models()
+    snapshot = poller.latest()
+    running_models = snapshot.running_models
     
     if not running_models:
         st.info("No models are currently running in memory.")
@@ -116,55 +149,242 @@ def render_overview(api):
                             response = api.remove_model_from_vram(model.get('name', 'Unknown'))
                             if response and "error" not in response:
                                 st.success(f"Model {model.get('name', 'Unknown')} unloaded successfully")
+                                poller.refresh(wait=SNAPSHOT_WAIT_TIMEOUT)  # Publish the new residency
                                 time.sleep(1)  # Give a moment for the message to show
-                                st.rerun()  # Refresh the page
+                                st.rerun(scope="fragment")  # Refresh the running models
                             else:
                                 error_msg = response.get("error", "Unknown error") if response else "No response from API"
                                 st.error(f"Error: {error_msg}")
                         except Exception as e:
                             st.error(f"Error unloading model: {str(e)}")
                 
-    # Auto-refresh button and timer
-    col1, col2 = st.columns([3, 1])
+    # Show when the snapshot was last polled
+    time_since_refresh = time.time() - snapshot.polled_at
+    st.markdown(f"<div style='color: gray; font-size: 0.8em;'>Last updated: {time_since_refresh:.1f} seconds ago</div>", unsafe_allow_html=True)
+    
+    # Installed models changed (pull or delete elsewhere): rerun the whole page
+    if snapshot.models_version != models_version:
+        st.rerun()
+
+
+def _render_model_card(api, poller, record, column):
+    """Render one model card (a catalog record) with its Load and Delete buttons"""
+    model_name = record.name
+    model_modified = record.modified_at or "Unknown"
+    
+    # Format modification date
+    if record.modified:
+        model_modified = datetime.datetime.fromtimestamp(record.modified, datetime.timezone.utc).strftime("%Y-%m-%d %H:%M")
+    
+    # Calculate size in appropriate units
+    size_bytes = record.size
+    if size_bytes > 1024 * 1024 * 1024:
+        size_str = f"{size_bytes / (1024 * 1024 * 1024):.2f} GB"
+    elif size_bytes > 1024 * 1024:
+        size_str = f"{size_bytes / (1024 * 1024):.2f} MB"
+    else:
+        size_str = f"{size_bytes / 1024:.2f} KB"
+    
+    # Embedding models (e.g. 'bert' families) cannot be loaded for generation
+    is_embedding_model = record.is_embedding
+    
+    with column:
+        # Truncate model name if too long (for display purposes only)
+        display_name = model_name
+        if len(model_name) > 25:
+            display_name = model_name[:22] + "..."
+        
+        # Construct model card with fixed dimensions
+        card_content = f"""
+        <div class="card">
+            <div class="card-title" title="{model_name}">{display_name}</div>
+            <div class="card-subtitle">
+                <strong>Size:</strong> {size_str}<br/>
+                <strong>Modified:</strong> {model_modified}<br/>
+            </div>
+            <div style="display: flex; justify-content: space-between; margin-top: auto; margin-bottom: 10px;">
+                <span class="status-indicator success"></span>
+                <span class="status-text">Available</span>
+            </div>
+        </div>
+        """
+        
+        st.markdown(card_content, unsafe_allow_html=True)
+        
+        # Add button container with Load and Delete buttons side by side
+        col1, col2 = st.columns(2)
+        
+        # Add load button only for non-embedding models
+        with col1:
+            if not is_embedding_model:
+                if st.button(f"Load (60m)", key=f"load_{model_name}", use_container_width=True):
+                    with st.spinner(f"Loading {model_name} into VRAM..."):
+                        result = api.load_model_into_vram(model_name, keep_alive="60m")
+                        if "error" not in result:
+                            st.success(f"{model_name} loaded successfully for 60 minutes")
+                            poller.refresh(wait=SNAPSHOT_WAIT_TIMEOUT)  # Publish the new residency
+                            time.sleep(1)  # Brief pause
+                            st.rerun()  # Refresh the page
+                        else:
+                            st.error(f"Error: {result.get('error')}")
+            else:
+                # Placeholder button for embedding models (disabled)
+                st.button(f"Embedding Only", key=f"embedding_{model_name}", use_container_width=True, disabled=True)
+        
+        # Add delete button for all models
+        with col2:
+            # Use a unique key for the delete button
+            delete_key = f"delete_{model_name}"
+            if st.button(f"Delete", key=delete_key, use_container_width=True, type="primary"):
+                # Use a session state variable to track which model is being deleted
+                if "delete_confirmation" not in st.session_state:
+                    st.session_state.delete_confirmation = {}
+                
+                # Toggle the confirmation state for this model
+                st.session_state.delete_confirmation[model_name] = True
+                st.rerun()
+        
+        # Show confirmation outside the column nesting if needed
+        if st.session_state.get("delete_confirmation", {}).get(model_name, False):
+            st.warning(f"Are you sure you want to delete {model_name}?")
+            
+            # Create buttons for confirmation (not nested in columns)
+            col_confirm, col_cancel = st.columns(2)
+            
+            with col_confirm:
+                if st.button("Yes, Delete", key=f"confirm_delete_{model_name}", use_container_width=True):
+                    with st.spinner(f"Deleting {model_name}..."):
+                        result = api.delete_model(model_name)
+                        if "error" not in result:
+                            st.success(f"{model_name} deleted successfully")
+                            # Remove the confirmation state
+                            del st.session_state.delete_confirmation[model_name]
+                            time.sleep(1)  # Brief pause
+                            # Force refresh of models data
+                            poller.refresh(wait=SNAPSHOT_WAIT_TIMEOUT)
+                            st.rerun()  # Refresh the page
+                        else:
+                            st.error(f"Error: {result.get('error')}")
+            
+            with col_cancel:
+                if st.button("Cancel", key=f"cancel_delete_{model_name}", use_container_width=True):
+                    # Remove the confirmation state
+                    del st.session_state.delete_confirmation[model_name]
+                    st.rerun()  # Refresh the page
+
+
+def _reset_grid_page():
+    st.session_state.model_grid_page = 1
+
+
+def _render_model_grid(api, poller, catalog):
+    """Render one page of model cards matching the search and filters.
+    
+    Only the visible page's cards and buttons are built, so the number of
+    widgets depends on the page size rather than on the inventory.
+    """
+    col1, col2, col3, col4 = st.columns([3, 2, 2, 1])
+    
+    with col1:
+        search = st.text_input("Search Models", key="model_grid_search", placeholder="Name contains...",
+                               on_change=_reset_grid_page)
+    with col2:
+        selected_families = st.multiselect("Family", options=catalog.values("family"), key="model_grid_families",
+                                           on_change=_reset_grid_page)
+    with col3:
+        selected_sizes = st.multiselect("Parameter Size", options=catalog.values("parameter_size"), key="model_grid_sizes",
+                                        on_change=_reset_grid_page)
+    with col4:
+        page_size = st.selectbox("Per Page", options=GRID_PAGE_SIZES, key="model_grid_page_size",
+                                 on_change=_reset_grid_page)
     
-    # Initialize last_refresh if not already in session state
-    if "last_refresh" not in st.session_state:
-        st.session_state.last_refresh = datetime.datetime.now()
+    # Index lookups for the filters, then a name scan over the matches only
+    matching = catalog.filter(search, family=selected_families, parameter_size=selected_sizes)
+    
+    if not matching:
+        st.info("No models match the search and filters.")
+        return
+    
+    # Keep the page in range when the inventory or filters shrink
+    page_count = math.ceil(len(matching) / page_size)
+    if st.session_state.get("model_grid_page", 1) > page_count:
+        st.session_state.model_grid_page = page_count
+    
+    col1, col2 = st.columns([1, 3])
     
     with col1:
-        # Show the last refresh time
-        time_since_refresh = (datetime.datetime.now() - st.session_state.last_refresh).total_seconds()
-        st.markdown(f"<div style='color: gray; font-size: 0.8em;'>Last updated: {time_since_refresh:.1f} seconds ago</div>", unsafe_allow_html=True)
+        page = st.number_input(f"Page (of {page_count})", min_value=1, max_value=page_count, step=1,
+                               key="model_grid_page")
+    
+    first = (page - 1) * page_size
+    visible = matching[first:first + page_size]
     
     with col2:
-        if st.button("Refresh Data", key="refresh_running_models"):
-            st.session_state.last_refresh = datetime.datetime.now()
-            st.rerun()
+        st.markdown(
+            f"<div style='color: gray; font-size: 0.8em; padding-top: 2.2rem;'>"
+            f"Showing {first + 1}–{first + len(visible)} of {len(matching)} models"
+            f"{f' ({len(catalog)} installed)' if len(matching) != len(catalog) else ''}</div>",
+            unsafe_allow_html=True
+        )
     
-    # Set up auto-refresh (every 5 seconds)
-    if "last_auto_refresh" not in st.session_state:
-        st.session_state.last_auto_refresh = datetime.datetime.now()
+    # Use columns to create a grid
+    cols = st.columns(GRID_COLUMNS)
     
-    # Check if 5 seconds have passed since last auto-refresh
-    auto_refresh_interval = 5  # seconds
-    time_since_auto_refresh = (datetime.datetime.now() - st.session_state.last_auto_refresh).total_seconds()
+    for i, record in enumerate(visible):
+        _render_model_card(api, poller, record, cols[i % GRID_COLUMNS])
+
+
+@profiled()
+def render_overview(api):
+    """Render the overview dashboard with model summary cards"""
     
-    if time_since_auto_refresh >= auto_refresh_interval:
-        st.session_state.last_auto_refresh = datetime.datetime.now()
-        st.session_state.last_refresh = datetime.datetime.now()
-        st.rerun()
+    st.markdown("<div class='card-title'>Models Overview</div>", unsafe_allow_html=True)
+    
+    # Check if API is connected first
+    if not st.session_state.get("api_connected", False):
+        st.warning("Not connected to Ollama server. Please configure and test your connection in the sidebar.")
+        
+        # Display example connection instructions
+        st.markdown(
+            """
+            <div class="card">
+                <div class="card-title">Connection Instructions</div>
+                <div class="card-subtitle">
+                    1. Ensure your Ollama server is running
+                    2. Enter the correct server URL in the sidebar (default: http://localhost:11434)
+                    3. Click "Test Connection" to verify
+                </div>
+            </div>
+            """, 
+            unsafe_allow_html=True
+        )
+        return
         
-    # Refresh models data
+    # Running and installed models come from the poller shared by all sessions
+    poller = get_server_poller(api.base_url)
     with st.spinner("Loading models..."):
-        try:
-            models = api.list_models()
-            st.session_state.models_data = models
-        except Exception as e:
-            st.error(f"Error loading models: {str(e)}")
-            models = []
+        snapshot = poller.latest()
+    
+    for error in snapshot.errors.values():
+        st.error(f"Error fetching server data: {error}")
+    
+    # Running models refresh on their own; the rest of the page reruns only when installed models change
+    _render_running_models(api, poller, snapshot.models_version)
+    
+    # VRAM churn recorded by the shared poller
+    with st.expander("VRAM History"):
+        _render_vram_history(poller.history)
+    
+    # Manual refresh of the whole page
+    if st.button("Refresh Data", key="refresh_running_models"):
+        poller.refresh(wait=SNAPSHOT_WAIT_TIMEOUT)
+        st.rerun()
+    
+    # Installed models, indexed once per /api/tags change by the poller
+    catalog = snapshot.catalog
     
     # Display models summary
-    if len(models) == 0:
+    if len(catalog) == 0:
         st.markdown(
             """
             <div class="card">
@@ -182,151 +402,31 @@ def render_overview(api):
         col1, col2, col3 = st.columns(3)
         
         with col1:
-            st.metric("Total Models", len(models))
+            st.metric("Total Models", len(catalog))
         
-        # Calculate total size of all models in GB
-        total_size_bytes = sum(model.get("size", 0) for model in models)
-        total_size_gb = total_size_bytes / (1024 * 1024 * 1024)
+        # Total size of all models in GB
+        total_size_gb = catalog.total_size / (1024 * 1024 * 1024)
         
         with col2:
             st.metric("Total Size", f"{total_size_gb:.2f} GB")
         
-        # Find newest model by date
-        newest_model = None
-        newest_date = None
-        
-        for model in models:
-            model_date = model.get("modified_at", "")
-            if model_date and (newest_date is None or model_date > newest_date):
-                newest_date = model_date
-                newest_model = model.get("name", "Unknown")
+        # Newest model by modification date
+        newest = catalog.newest()
         
         with col3:
-            if newest_model:
-                st.metric("Latest Model", newest_model)
+            if newest:
+                st.metric("Latest Model", newest[0].name)
         
-        # Models grid display
+        # Models grid display: only the current page's cards are built
         st.markdown("<br/>", unsafe_allow_html=True)
         st.markdown("<div class='card-title'>Available Models</div>", unsafe_allow_html=True)
-        
-        # Use columns to create a grid
-        cols = st.columns(3)
-        
-        for i, model in enumerate(models):
-            model_name = model.get("name", "Unknown")
-            model_modified = model.get("modified_at", "Unknown")
-            
-            # Format modification date
-            if model_modified != "Unknown":
-                try:
-                    modified_date = datetime.datetime.fromisoformat(model_modified.replace('Z', '+00:00'))
-                    model_modified = modified_date.strftime("%Y-%m-%d %H:%M")
-                except (ValueError, AttributeError):
-                    pass
-            
-            # Calculate size in appropriate units
-            size_bytes = model.get("size", 0)
-            if size_bytes > 1024 * 1024 * 1024:
-                size_str = f"{size_bytes / (1024 * 1024 * 1024):.2f} GB"
-            elif size_bytes > 1024 * 1024:
-                size_str = f"{size_bytes / (1024 * 1024):.2f} MB"
-            else:
-                size_str = f"{size_bytes / 1024:.2f} KB"
-            
-            # Check if model is an embedding model (contains 'bert' in family)
-            is_embedding_model = False
-            if "details" in model and "family" in model["details"]:
-                family = model["details"]["family"].lower()
-                is_embedding_model = "bert" in family
-            
-            with cols[i % 3]:
-                # Truncate model name if too long (for display purposes only)
-                display_name = model_name
-                if len(model_name) > 25:
-                    display_name = model_name[:22] + "..."
-                
-                # Construct model card with fixed dimensions
-                card_content = f"""
-                <div class="card">
-                    <div class="card-title" title="{model_name}">{display_name}</div>
-                    <div class="card-subtitle">
-                        <strong>Size:</strong> {size_str}<br/>
-                        <strong>Modified:</strong> {model_modified}<br/>
-                    </div>
-                    <div style="display: flex; justify-content: space-between; margin-top: auto; margin-bottom: 10px;">
-                        <span class="status-indicator success"></span>
-                        <span class="status-text">Available</span>
-                    </div>
-                </div>
-                """
-                
-                st.markdown(card_content, unsafe_allow_html=True)
-                
-                # Add button container with Load and Delete buttons side by side
-                col1, col2 = st.columns(2)
-                
-                # Add load button only for non-embedding models
-                with col1:
-                    if not is_embedding_model:
-                        if st.button(f"Load (60m)", key=f"load_{model_name}", use_container_width=True):
-                            with st.spinner(f"Loading {model_name} into VRAM..."):
-                                result = api.load_model_into_vram(model_name, keep_alive="60m")
-                                if "error" not in result:
-                                    st.success(f"{model_name} loaded successfully for 60 minutes")
-                                    time.sleep(1)  # Brief pause
-                                    st.rerun()  # Refresh the page
-                                else:
-                                    st.error(f"Error: {result.get('error')}")
-                    else:
-                        # Placeholder button for embedding models (disabled)
-                        st.button(f"Embedding Only", key=f"embedding_{model_name}", use_container_width=True, disabled=True)
-                
-                # Add delete button for all models
-                with col2:
-                    # Use a unique key for the delete button
-                    delete_key = f"delete_{model_name}"
-                    if st.button(f"Delete", key=delete_key, use_container_width=True, type="primary"):
-                        # Use a session state variable to track which model is being deleted
-                        if "delete_confirmation" not in st.session_state:
-                            st.session_state.delete_confirmation = {}
-                        
-                        # Toggle the confirmation state for this model
-                        st.session_state.delete_confirmation[model_name] = True
-                        st.rerun()
-                
-                # Show confirmation outside the column nesting if needed
-                if st.session_state.get("delete_confirmation", {}).get(model_name, False):
-                    st.warning(f"Are you sure you want to delete {model_name}?")
-                    
-                    # Create buttons for confirmation (not nested in columns)
-                    col_confirm, col_cancel = st.columns(2)
-                    
-                    with col_confirm:
-                        if st.button("Yes, Delete", key=f"confirm_delete_{model_name}", use_container_width=True):
-                            with st.spinner(f"Deleting {model_name}..."):
-                                result = api.delete_model(model_name)
-                                if "error" not in result:
-                                    st.success(f"{model_name} deleted successfully")
-                                    # Remove the confirmation state
-                                    del st.session_state.delete_confirmation[model_name]
-                                    time.sleep(1)  # Brief pause
-                                    # Force refresh of models data
-                                    st.session_state.models_data = api.list_models()
-                                    st.rerun()  # Refresh the page
-                                else:
-                                    st.error(f"Error: {result.get('error')}")
-                    
-                    with col_cancel:
-                        if st.button("Cancel", key=f"cancel_delete_{model_name}", use_container_width=True):
-                            # Remove the confirmation state
-                            del st.session_state.delete_confirmation[model_name]
-                            st.rerun()  # Refresh the page
+        _render_model_grid(api, poller, catalog)
         
         # Recent activity
         st.markdown("<br/>", unsafe_allow_html=True)
         st.markdown("<div class='card-title'>Server Information</div>", unsafe_allow_html=True)
         
-        # Get server version info
+        # Server version info (cached)
         server_info = api.get_version()
         
         if "error" not in server_info:
@@ -2,7 +2,144 @@ import streamlit as st
 import pandas as pd
 import time
 from datetime import datetime
+from utils.api_handler import get_response_cache
+from utils.metrics import get_request_metrics, WINDOWS, HEALTH_ENDPOINTS, VRAM_CAPACITY_BYTES
+from utils.poller import get_server_poller, SNAPSHOT_WAIT_TIMEOUT
+from utils.profiling import profiled
 
+# Seconds between reruns of the Server Health fragment
+HEALTH_REFRESH_INTERVAL = 5
+
+# Health card colors
+HEALTHY_COLOR = "#30d158"
+WARNING_COLOR = "#ff9f0a"
+CRITICAL_COLOR = "#ff453a"
+
+
+def _format_ms(seconds):
+    """Format a latency in milliseconds, or a dash when there were no samples"""
+    return "–" if seconds is None else f"{seconds * 1000:.0f} ms"
+
+
+def _health_card(title, value, color, subtitle):
+    """Render one Server Health card"""
+    st.markdown(
+        f"""
+        <div class="card">
+            <div class="card-title">{title}</div>
+            <div style="font-size: 2rem; font-weight: 700; text-align: center;">
+                <span style="color: {color};">{value}</span>
+            </div>
+            <div class="card-subtitle" style="text-align: center;">
+                {subtitle}
+            </div>
+        </div>
+        """, 
+        unsafe_allow_html=True
+    )
+
+
+@st.fragment(run_every=HEALTH_REFRESH_INTERVAL)
+def _render_server_health(api, catalog):
+    """Render the Server Health cards and endpoint latency table.
+    
+    Runs as a fragment: it reads only the in-process request metrics and the
+    shared poller's /api/ps data, so the rest of the page stays static.
+    """
+    st.markdown("<br/>", unsafe_allow_html=True)
+    st.markdown("<div class='card-title'>Server Health</div>", unsafe_allow_html=True)
+    
+    window_label = st.radio("Window", options=list(WINDOWS), index=1, horizontal=True, key="health_window")
+    window = WINDOWS[window_label]
+    
+    # VRAM in use according to /api/ps (shared poller)
+    running_models = get_server_poller(api.base_url).latest().running_models
+    vram_used = sum(model.get("size_vram", 0) for model in running_models)
+    
+    # Measured by OllamaAPI on every request this dashboard sends (all sessions)
+    request_metrics = get_request_metrics()
+    health = request_metrics.summary(api.base_url, window, HEALTH_ENDPOINTS)
+    overall = request_metrics.summary(api.base_url, window)
+    
+    col1, col2, col3, col4 = st.columns(4)
+    
+    with col1:
+        latency = health["total"]
+        if latency["samples"] == 0:
+            _health_card("API Response Time", "–", "#8a8a8e", f"No requests in the last {window_label}")
+        else:
+            p95 = latency["p95"]
+            color = HEALTHY_COLOR if p95 < 0.2 else (WARNING_COLOR if p95 < 1 else CRITICAL_COLOR)
+            _health_card(
+                "API Response Time (p95)",
+                _format_ms(p95),
+                color,
+                f"p50 {_format_ms(latency['p50'])} · p99 {_format_ms(latency['p99'])}"
+            )
+    
+    with col2:
+        error_rate = overall["error_rate"]
+        color = HEALTHY_COLOR if error_rate < 0.01 else (WARNING_COLOR if error_rate < 0.05 else CRITICAL_COLOR)
+        _health_card(
+            "Error Rate",
+            f"{error_rate:.1%}",
+            color,
+            f"{overall['errors']} of {overall['requests']} requests in the last {window_label}"
+        )
+    
+    with col3:
+        vram_gb = vram_used / (1024 * 1024 * 1024)
+        if VRAM_CAPACITY_BYTES:
+            usage = vram_used / VRAM_CAPACITY_BYTES
+            color = HEALTHY_COLOR if usage < 0.6 else (WARNING_COLOR if usage < 0.85 else CRITICAL_COLOR)
+            _health_card(
+                "VRAM Usage",
+                f"{usage:.0%}",
+                color,
+                f"{vram_gb:.2f} of {VRAM_CAPACITY_BYTES / (1024 * 1024 * 1024):.0f} GB"
+            )
+        else:
+            _health_card(
+                "VRAM Usage",
+                f"{vram_gb:.2f} GB",
+                HEALTHY_COLOR,
+                "Set OLLAMA_VRAM_CAPACITY_GB to show a percentage"
+            )
+    
+    with col4:
+        storage_gb = catalog.total_size / (1024 * 1024 * 1024)
+        _health_card("Model Storage", f"{storage_gb:.2f} GB", HEALTHY_COLOR, f"{len(catalog)} models on disk")
+    
+    # Per-endpoint latency breakdown
+    with st.expander("Endpoint Latency"):
+        endpoint_data = []
+        for endpoint in request_metrics.endpoints(api.base_url):
+            summary = request_metrics.summary(api.base_url, window, [endpoint])
+            if summary["requests"] == 0:
+                continue
+            endpoint_data.append({
+                "Endpoint": endpoint,
+                "Requests": summary["requests"],
+                "Error Rate": f"{summary['error_rate']:.1%}",
+                "Connect p95": _format_ms(summary["connect"]["p95"]),
+                "TTFB p50": _format_ms(summary["ttfb"]["p50"]),
+                "TTFB p95": _format_ms(summary["ttfb"]["p95"]),
+                "Total p50": _format_ms(summary["total"]["p50"]),
+                "Total p95": _format_ms(summary["total"]["p95"]),
+                "Total p99": _format_ms(summary["total"]["p99"])
+            })
+        
+        if endpoint_data:
+            st.dataframe(pd.DataFrame(endpoint_data), use_container_width=True, hide_index=True)
+            st.caption(
+                "Percentiles are bucketed (within 25%). Connect time only counts new connections; "
+                "for streamed endpoints the total is the time until the response headers arrived."
+            )
+        else:
+            st.info(f"No requests in the last {window_label}.")
+
+
+@profiled()
 def render_server_status(api):
     """Render the server status dashboard with real-time server information"""
     
@@ -49,6 +186,12 @@ def render_server_status(api):
         
         return
     
+    # Server version (cached) and the installed models indexed by the shared poller
+    poller = get_server_poller(api.base_url)
+    with st.spinner("Fetching server information..."):
+        server_info = api.get_version()
+        catalog = poller.latest().catalog
+    
     # Create two columns for server info and loaded models
     col1, col2 = st.columns(2)
     
@@ -63,10 +206,6 @@ def render_server_status(api):
             unsafe_allow_html=True
         )
         
-        # Get server version info
-        with st.spinner("Fetching server information..."):
-            server_info = api.get_version()
-        
         if "error" not in server_info:
             # Display server metrics
             st.metric("Version", server_info.get('version', 'Unknown'))
@@ -92,6 +231,18 @@ def render_server_status(api):
                 """, 
                 unsafe_allow_html=True
             )
+
+            # Connection pool reuse (shared keep-alive session for this server)
+            pool_stats = api.connection_stats()
+            st.markdown(
+                f"""
+                <div class="card-subtitle">
+                    <strong>Connection Pool:</strong> {pool_stats['reused']} of {pool_stats['requests']} requests
+                    reused a connection ({pool_stats['connections']} opened)
+                </div>
+                """,
+                unsafe_allow_html=True
+            )
         else:
             st.error(f"Could not fetch server information: {server_info.get('error')}")
             
@@ -117,14 +268,9 @@ def render_server_status(api):
             unsafe_allow_html=True
         )
         
-        # Get current models
-        with st.spinner("Fetching models..."):
-            models = api.list_models()
-            st.session_state.models_data = models
-        
         # Display model stats
-        if models:
-            total_size_bytes = sum(model.get("size", 0) for model in models)
+        if len(catalog):
+            total_size_bytes = catalog.total_size
             
             # Calculate size in appropriate units
             if total_size_bytes > 1024 * 1024 * 1024:
@@ -134,82 +280,23 @@ def render_server_status(api):
             else:
                 total_size_str = f"{total_size_bytes / 1024:.2f} KB"
             
-            st.metric("Total Models", len(models))
+            st.metric("Total Models", len(catalog))
             st.metric("Total Size", total_size_str)
             
             # Latest model
-            newest_model = None
-            newest_date = None
-            
-            for model in models:
-                model_date = model.get("modified_at", "")
-                if model_date and (newest_date is None or model_date > newest_date):
-                    newest_date = model_date
-                    newest_model = model.get("name", "Unknown")
-            
-            if newest_model:
-                st.metric("Latest Model", newest_model)
+            newest = catalog.newest()
+            if newest:
+                st.metric("Latest Model", newest[0].name)
         else:
             st.warning("No models found on server")
     
     # Refresh button for real-time updates
     if st.button("Refresh Status", key="refresh_status"):
+        poller.refresh(wait=SNAPSHOT_WAIT_TIMEOUT)
         st.rerun()
     
-    # Server Health Monitoring
-    st.markdown("<br/>", unsafe_allow_html=True)
-    st.markdown("<div class='card-title'>Server Health</div>", unsafe_allow_html=True)
-    
-    # Create health monitoring metrics (sample data, in a real app this would be from actual monitoring)
-    col1, col2, col3 = st.columns(3)
-    
-    with col1:
-        st.markdown(
-            """
-            <div class="card">
-                <div class="card-title">API Response Time</div>
-                <div style="font-size: 2rem; font-weight: 700; text-align: center;">
-                    <span style="color: #30d158;">42 ms</span>
-                </div>
-                <div class="card-subtitle" style="text-align: center;">
-                    Healthy
-                </div>
-            </div>
-            """, 
-            unsafe_allow_html=True
-        )
-    
-    with col2:
-        st.markdown(
-            """
-            <div class="card">
-                <div class="card-title">VRAM Usage</div>
-                <div style="font-size: 2rem; font-weight: 700; text-align: center;">
-                    <span style="color: #ff9f0a;">67%</span>
-                </div>
-                <div class="card-subtitle" style="text-align: center;">
-                    Moderate
-                </div>
-            </div>
-            """, 
-            unsafe_allow_html=True
-        )
-    
-    with col3:
-        st.markdown(
-            """
-            <div class="card">
-                <div class="card-title">Disk Space</div>
-                <div style="font-size: 2rem; font-weight: 700; text-align: center;">
-                    <span style="color: #30d158;">32%</span>
-                </div>
-                <div class="card-subtitle" style="text-align: center;">
-                    Available
-                </div>
-            </div>
-            """, 
-            unsafe_allow_html=True
-        )
+    # Health cards refresh on their own without rerunning the page
+    _render_server_health(api, catalog)
     
     # Server actions
     st.markdown("<br/>", unsafe_allow_html=True)
@@ -233,8 +320,23 @@ def render_server_status(api):
         
         # Actions (Note: These would need actual implementations depending on server setup)
         st.button("Test API Connection", key="test_api_btn")
-        st.button("Clear Cache", key="clear_cache_btn", disabled=True)
+        if st.button("Clear Cache", key="clear_cache_btn"):
+            get_response_cache().clear()
+            st.success("Response cache cleared")
         st.button("Check for Updates", key="check_updates_btn", disabled=True)
+        
+        # Shared response cache statistics (all sessions)
+        cache_stats = get_response_cache().stats()
+        st.markdown(
+            f"""
+            <div class="card-subtitle">
+                <strong>Response Cache:</strong> {cache_stats['hit_rate']:.0%} hit rate
+                ({cache_stats['hits']} hits, {cache_stats['misses']} misses,
+                {cache_stats['entries']} entries)
+            </div>
+            """,
+            unsafe_allow_html=True
+        )
     
     with col2:
         st.markdown(
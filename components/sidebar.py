@@ -1,5 +1,8 @@
 import streamlit as st
+from utils.fleet import get_fleet_registry, parse_hosts, format_hosts
+from utils.profiling import profiled
 
+@profiled("sidebar")
 def render_sidebar():
     """Render the sidebar with navigation and configuration options"""
     
@@ -50,6 +53,20 @@ def render_sidebar():
                 unsafe_allow_html=True
             )
         
+        # Fleet hosts (shared by every session of this dashboard)
+        with st.expander("Fleet Hosts"):
+            registry = get_fleet_registry()
+            fleet_text = st.text_area(
+                "Hosts",
+                value=format_hosts(registry.hosts()),
+                placeholder="gpu-1=http://10.0.0.11:11434\ngpu-2=http://10.0.0.12:11434",
+                help="One Ollama server per line as label=url. Used by the Fleet page.",
+                key="fleet_hosts_text"
+            )
+            if st.button("Save Hosts", key="save_fleet_hosts", use_container_width=True):
+                registry.set_hosts(parse_hosts(fleet_text))
+                st.success(f"Saved {len(registry.hosts())} host(s)")
+        
         st.markdown("<hr/>", unsafe_allow_html=True)
         
         # Navigation menu
@@ -60,7 +77,9 @@ def render_sidebar():
             "Overview": "🏠",
             "Model Management": "📦",
             "Model Interaction": "💬",
-            "Server Status": "📊"
+            "Server Status": "📊",
+            "Fleet": "🛰️",
+            "Benchmark": "⏱️"
         }
         
         # Create clickable navigation items
@@ -83,6 +102,10 @@ def render_sidebar():
             st.session_state.dark_mode = dark_mode
             st.rerun()
         
+        # Per-run timing waterfall below the page
+        st.checkbox("Debug Panel", key="debug_panel",
+                    help="Show where recent reruns spent their time (render functions, API calls, styling)")
+        
         # Footer
         st.markdown("<hr/>", unsafe_allow_html=True)
         st.markdown(
@@ -0,0 +1,58 @@
+"""Shared fixtures for the performance regression suite.
+
+Every test runs against an in-process mock Ollama server, so the suite
+needs no GPU and no running Ollama.
+"""
+import logging
+import os
+
+import pytest
+
+from benchmarks.mock_server import MockConfig, MockOllamaServer
+from utils.api_handler import OllamaAPI, get_response_cache
+
+# Installed models on the mock server, large enough to show per-model costs
+MOCK_MODELS = 2000
+
+# Multiplies every absolute time budget, for slow CI machines
+BUDGET_SCALE = float(os.environ.get("OLLAMA_BENCH_BUDGET_SCALE", "1"))
+
+
+@pytest.fixture(scope="session", autouse=True)
+def quiet_streamlit():
+    # OllamaAPI reports errors through Streamlit, which only logs outside a running app
+    logging.getLogger("streamlit").setLevel(logging.ERROR)
+
+
+@pytest.fixture(scope="session")
+def mock_server():
+    config = MockConfig(models=MOCK_MODELS, tokens_per_second=0, response_tokens=256, load_seconds=0, num_parallel=8)
+    with MockOllamaServer(config) as server:
+        # A few resident models, as on a busy server
+        for name in server.model_names[:3]:
+            server.state.load(name, "1h")
+        yield server
+
+
+@pytest.fixture
+def api(mock_server):
+    get_response_cache().clear()
+    return OllamaAPI(mock_server.url, pool_size=8)
+
+
+@pytest.fixture
+def clear_cache():
+    return get_response_cache().clear
+
+
+def assert_within_budget(benchmark, milliseconds: float):
+    """Fail when the mean time is over an absolute budget (scaled by OLLAMA_BENCH_BUDGET_SCALE).
+
+    Budgets only catch gross regressions; compare against a saved baseline
+    with --benchmark-compare-fail for the fine-grained ones.
+    """
+    if benchmark.disabled:
+        return
+    mean = benchmark.stats.stats.mean * 1000
+    budget = milliseconds * BUDGET_SCALE
+    assert mean <= budget, f"mean {mean:.1f} ms is over the {budget:.0f} ms budget"
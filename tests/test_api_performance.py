@@ -0,0 +1,52 @@
+"""Timings of the OllamaAPI calls the pages make, cold and cached."""
+from concurrent.futures import ThreadPoolExecutor
+
+from conftest import MOCK_MODELS, assert_within_budget
+from utils.stream_decoder import iter_events, FinalStats
+
+
+def _stream_chat(api, model):
+    response = api.chat_with_model(model, [{"role": "user", "content": "Hello"}], stream=True)
+    return list(iter_events(response))
+
+
+def test_list_models_cold(benchmark, api, clear_cache):
+    result = benchmark.pedantic(api.list_models, setup=clear_cache, rounds=20)
+    assert len(result) == MOCK_MODELS
+    assert_within_budget(benchmark, 250)
+
+
+def test_list_models_cached(benchmark, api):
+    api.list_models()
+    result = benchmark(api.list_models)
+    assert len(result) == MOCK_MODELS
+    assert_within_budget(benchmark, 1)
+
+
+def test_running_models_cold(benchmark, api, clear_cache):
+    result = benchmark.pedantic(api.get_running_models, setup=clear_cache, rounds=20)
+    assert len(result) == 3
+    assert_within_budget(benchmark, 50)
+
+
+def test_model_details_cold(benchmark, api, clear_cache, mock_server):
+    model = mock_server.model_names[0]
+    result = benchmark.pedantic(lambda: api.get_model_details(model), setup=clear_cache, rounds=20)
+    assert "error" not in result
+    assert_within_budget(benchmark, 50)
+
+
+def test_chat_stream(benchmark, api, mock_server):
+    events = benchmark.pedantic(_stream_chat, args=(api, mock_server.model_names[0]), rounds=20)
+    assert isinstance(events[-1], FinalStats)
+    assert_within_budget(benchmark, 100)
+
+
+def test_concurrent_chat_streams(benchmark, api, mock_server):
+    model = mock_server.model_names[0]
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        def concurrent_chats():
+            return list(executor.map(lambda _: _stream_chat(api, model), range(8)))
+        results = benchmark.pedantic(concurrent_chats, rounds=10)
+    assert all(isinstance(events[-1], FinalStats) for events in results)
+    assert_within_budget(benchmark, 400)
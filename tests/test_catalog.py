@@ -0,0 +1,92 @@
+"""ModelCatalog records, indexes and ordered queries."""
+from datetime import datetime, timezone
+
+from utils.catalog import ModelCatalog, ModelRecord
+
+
+def _timestamp(*args) -> float:
+    return datetime(*args, tzinfo=timezone.utc).timestamp()
+
+
+def test_modified_at_with_nanoseconds_and_offset():
+    record = ModelRecord.from_tags({"name": "a", "modified_at": "2024-06-04T14:38:31.837533273-07:00"})
+    assert abs(record.modified - (_timestamp(2024, 6, 4, 21, 38, 31) + 0.837533)) < 1e-3
+
+
+def test_modified_at_with_short_fraction_and_utc():
+    record = ModelRecord.from_tags({"name": "a", "modified_at": "2024-06-04T21:38:31.83753Z"})
+    assert abs(record.modified - (_timestamp(2024, 6, 4, 21, 38, 31) + 0.83753)) < 1e-3
+
+
+def test_unparsable_modified_at_is_zero():
+    assert ModelRecord.from_tags({"name": "a", "modified_at": "yesterday"}).modified == 0.0
+    assert ModelRecord.from_tags({"name": "a"}).modified == 0.0
+
+
+def _model(name, modified_at="", size=0, family="llama", parameter_size="8B", quantization="Q4_0", digest=""):
+    return {
+        "name": name,
+        "modified_at": modified_at,
+        "size": size,
+        "digest": digest or f"sha256:{name}",
+        "details": {"family": family, "parameter_size": parameter_size, "quantization_level": quantization},
+    }
+
+
+CATALOG = ModelCatalog([
+    _model("llama3:8b", "2024-03-01T00:00:00.123456789Z", 4_700_000_000, digest="sha256:llama"),
+    _model("llama3:latest", "2024-03-02T00:00:00.123456789Z", 4_700_000_000, digest="sha256:llama"),
+    _model("qwen2:0.5b", "2024-06-04T14:38:31.837533273-07:00", 350_000_000, "qwen2", "500M", "Q8_0"),
+    _model("mistral:7b", "2024-01-15T10:00:00+01:00", 4_100_000_000, "mistral", "7B"),
+    _model("nomic-embed-text", "", 270_000_000, "nomic-bert", "137M", "F16"),
+])
+
+
+def test_newest_skips_undated_models():
+    assert [record.name for record in CATALOG.newest(10)] == [
+        "qwen2:0.5b", "llama3:latest", "llama3:8b", "mistral:7b",
+    ]
+    assert [record.name for record in CATALOG.newest()] == ["qwen2:0.5b"]
+    assert CATALOG.newest(0) == []
+
+
+def test_newest_of_undated_or_empty_catalog():
+    assert ModelCatalog([_model("a"), _model("b", "not a date")]).newest() == []
+    assert ModelCatalog().newest() == []
+
+
+def test_largest():
+    assert {record.name for record in CATALOG.largest(2)} == {"llama3:8b", "llama3:latest"}
+    assert [record.name for record in CATALOG.largest(5)][2:] == ["mistral:7b", "qwen2:0.5b", "nomic-embed-text"]
+    assert CATALOG.largest(0) == []
+
+
+def test_modified_between():
+    start, end = _timestamp(2024, 1, 1), _timestamp(2024, 4, 1)
+    assert {record.name for record in CATALOG.modified_between(start, end)} == {
+        "llama3:8b", "llama3:latest", "mistral:7b",
+    }
+    assert CATALOG.modified_between(_timestamp(2025, 1, 1), _timestamp(2026, 1, 1)) == []
+
+
+def test_size_between_is_inclusive():
+    assert [record.name for record in CATALOG.size_between(270_000_000, 350_000_000)] == [
+        "nomic-embed-text", "qwen2:0.5b",
+    ]
+
+
+def test_indexes_and_filter():
+    assert CATALOG.values("parameter_size") == ["137M", "500M", "7B", "8B"]
+    assert [record.name for record in CATALOG.by_digest("sha256:llama")] == ["llama3:8b", "llama3:latest"]
+    assert set(CATALOG.group_by("family")) == {"llama", "qwen2", "mistral", "nomic-bert"}
+    assert [record.name for record in CATALOG.filter("LLAMA", quantization_level=["Q4_0"])] == [
+        "llama3:8b", "llama3:latest",
+    ]
+    assert [record.name for record in CATALOG.filter(family=["mistral", "qwen2"])] == ["qwen2:0.5b", "mistral:7b"]
+    assert CATALOG.filter(family=[]) == list(CATALOG)
+
+
+def test_embedding_models_and_lookup():
+    assert CATALOG.get("nomic-embed-text").is_embedding
+    assert not CATALOG.get("llama3:8b").is_embedding
+    assert "mistral:7b" in CATALOG and CATALOG.get("missing") is None
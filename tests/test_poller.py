@@ -0,0 +1,46 @@
+"""ServerPoller freshness, against a small mock server of its own."""
+import time
+
+import pytest
+
+from benchmarks.mock_server import MockConfig, MockOllamaServer
+from utils.api_handler import get_response_cache
+from utils.poller import ServerPoller, POLLER_IDLE_TIMEOUT
+
+
+@pytest.fixture
+def small_server():
+    with MockOllamaServer(MockConfig(models=3, load_seconds=0)) as server:
+        yield server
+
+
+def _wait_until_idle(poller):
+    poller._last_read = time.monotonic() - POLLER_IDLE_TIMEOUT - 1
+    # Let the loop finish its current interval and see that nobody is reading
+    time.sleep(3 * poller.interval)
+
+
+def test_refresh_polls_while_idle(small_server):
+    poller = ServerPoller(small_server.url, interval=0.05)
+    assert poller.refresh(wait=2).running_models == ()
+    _wait_until_idle(poller)
+    polls = poller._polls
+
+    small_server.state.load(small_server.model_names[0], "1h")
+    get_response_cache().clear()
+    start = time.monotonic()
+    snapshot = poller.refresh(wait=2)
+
+    assert time.monotonic() - start < 1
+    assert poller._polls > polls
+    assert [model["name"] for model in snapshot.running_models] == [small_server.model_names[0]]
+
+
+def test_refresh_does_not_keep_poller_active(small_server):
+    poller = ServerPoller(small_server.url, interval=0.05)
+    _wait_until_idle(poller)
+    poller.refresh(wait=2)
+    polls = poller._polls
+
+    time.sleep(5 * poller.interval)
+    assert poller._polls == polls
@@ -0,0 +1,33 @@
+"""Timings of full page reruns (the render_* functions) with Streamlit's AppTest."""
+import os
+
+import pytest
+from streamlit.testing.v1 import AppTest
+
+from conftest import assert_within_budget
+
+APP_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app.py")
+
+# Rerun budget per page in ms, against MOCK_MODELS installed models
+PAGE_BUDGETS = {
+    "Overview": 1500,
+    "Model Management": 1500,
+    "Model Interaction": 1000,
+    "Server Status": 1000,
+    "Fleet": 1000,
+    "Benchmark": 1000,
+}
+
+
+@pytest.mark.parametrize("page", list(PAGE_BUDGETS))
+def test_page_rerun(benchmark, mock_server, page):
+    at = AppTest.from_file(APP_PATH, default_timeout=60)
+    at.session_state.server_url = mock_server.url
+    at.session_state.api_connected = True
+    at.session_state.current_page = page
+    at.run()
+    assert not at.exception, at.exception[0].value
+
+    benchmark.pedantic(at.run, rounds=5, warmup_rounds=1)
+    assert not at.exception, at.exception[0].value
+    assert_within_budget(benchmark, PAGE_BUDGETS[page])
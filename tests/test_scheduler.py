@@ -0,0 +1,118 @@
+"""VRAMScheduler.plan eviction decisions on hand-built snapshots."""
+import pytest
+
+import utils.scheduler as scheduler
+from utils.catalog import ModelCatalog
+from utils.poller import ServerSnapshot
+from utils.scheduler import LRU, PRIORITY, VRAM_OVERHEAD_FACTOR, VRAMScheduler
+from utils.vram_history import VRAMHistory
+
+GB = 1024 ** 3
+
+
+class _StubPoller:
+    def __init__(self):
+        self.history = VRAMHistory()
+
+
+class _StubMetrics:
+    def __init__(self, last_used):
+        self._last_used = last_used
+
+    def last_used(self):
+        return dict(self._last_used)
+
+
+def _snapshot(installed, resident, errors=None):
+    """installed maps name to size on disk, resident maps name to size in VRAM (both GB)"""
+    models = tuple({"name": name, "size": int(size * GB)} for name, size in installed.items())
+    running = tuple(
+        {"name": name, "size_vram": int(size * GB), "expires_at": "2318-01-01T00:00:00Z"}
+        for name, size in resident.items()
+    )
+    return ServerSnapshot(version=1, running_models=running, models=models, errors=errors or {},
+                          catalog=ModelCatalog(models))
+
+
+@pytest.fixture
+def last_used(monkeypatch):
+    used = {}
+    monkeypatch.setattr(scheduler, "get_generation_metrics", lambda: _StubMetrics(used))
+    return used
+
+
+@pytest.fixture
+def vram(last_used):
+    return VRAMScheduler(_StubPoller(), budget=int(24 * GB))
+
+
+INSTALLED = {"big": 10, "old": 8, "recent": 8, "new": 5}
+
+
+def test_fits_without_eviction(vram):
+    plan = vram.plan(["new"], snapshot=_snapshot(INSTALLED, {"old": 8}))
+    assert plan.fits and plan.evict == []
+    assert plan.required == {"new": int(5 * GB * VRAM_OVERHEAD_FACTOR)}
+    assert plan.projected == 8 * GB + plan.needed
+
+
+def test_already_resident_needs_nothing(vram):
+    plan = vram.plan(["old"], snapshot=_snapshot(INSTALLED, {"old": 8, "recent": 8}))
+    assert plan.fits and plan.resident == ["old"] and plan.to_load == []
+
+
+def test_lru_evicts_least_recently_used_first(vram, last_used):
+    last_used.update({"old": 100.0, "recent": 200.0})
+    plan = vram.plan(["big"], LRU, snapshot=_snapshot(INSTALLED, {"old": 8, "recent": 8, "new": 5}))
+    # "new" was never used from the dashboard, so it goes before both
+    assert plan.fits
+    assert [model.name for model in plan.evict] == ["new", "old"]
+
+
+def test_requested_models_are_never_evicted(vram, last_used):
+    last_used.update({"old": 100.0, "recent": 200.0})
+    plan = vram.plan(["big", "old"], LRU, snapshot=_snapshot(INSTALLED, {"old": 8, "recent": 8, "new": 5}))
+    assert plan.fits
+    assert "old" not in [model.name for model in plan.evict]
+
+
+def test_priority_evicts_lowest_priority_first(vram, last_used):
+    last_used.update({"old": 100.0, "recent": 200.0})
+    vram.set_priorities({"old": 2, "recent": 1, "big": 2})
+    plan = vram.plan(["big"], PRIORITY, snapshot=_snapshot(INSTALLED, {"old": 8, "recent": 8, "new": 5}))
+    assert plan.fits
+    assert [model.name for model in plan.evict] == ["new", "recent"]
+
+
+def test_priority_never_evicts_models_ranked_above_the_request(vram):
+    vram.set_priorities({"old": 5, "recent": 5})
+    plan = vram.plan(["big"], PRIORITY, snapshot=_snapshot(INSTALLED, {"old": 8, "recent": 8}))
+    assert not plan.fits
+    assert "may not be evicted hold 16.0 GB" in plan.reason
+
+
+def test_not_enough_vram_even_after_evicting_everything(vram):
+    plan = vram.plan(["big", "old", "recent"], snapshot=_snapshot(INSTALLED, {"new": 5}))
+    assert not plan.fits
+    assert "over the 24.0 GB budget" in plan.reason
+
+
+def test_estimate_prefers_the_size_seen_loaded(vram):
+    # Partly offloaded to the CPU: the whole size is what it needs to fit in VRAM
+    vram.poller.history.record(0.0, [{"name": "big", "size": int(11 * GB), "size_vram": int(9 * GB)}])
+    plan = vram.plan(["big"], snapshot=_snapshot(INSTALLED, {}))
+    assert plan.required == {"big": int(11 * GB)}
+
+
+def test_plans_that_cannot_be_made(vram):
+    assert "not installed" in vram.plan(["missing"], snapshot=_snapshot(INSTALLED, {})).reason
+    unknown = vram.plan(["new"], snapshot=_snapshot(INSTALLED, {}, errors={"running_models": "timed out"}))
+    assert not unknown.fits and "Residency unknown" in unknown.reason
+
+    vram.budget = 0
+    assert not vram.plan(["new"], snapshot=_snapshot(INSTALLED, {})).fits
+
+
+def test_unknown_policy_is_rejected(vram):
+    with pytest.raises(ValueError):
+        vram.plan(["new"], "fifo", snapshot=_snapshot(INSTALLED, {}))
@@ -0,0 +1,82 @@
+"""NDJSONDecoder and decode_object on hand-built streams."""
+import json
+
+from utils.stream_decoder import (
+    FinalStats, NDJSONDecoder, PullProgress, StreamError, TokenChunk, decode_object,
+)
+
+
+def _ndjson(*objects) -> bytes:
+    return b"".join(json.dumps(obj, ensure_ascii=False).encode("utf-8") + b"\n" for obj in objects)
+
+
+def _feed_in_pieces(data: bytes, size: int):
+    decoder = NDJSONDecoder()
+    events = []
+    for start in range(0, len(data), size):
+        events += decoder.feed(data[start:start + size])
+    return events + decoder.close()
+
+
+CHAT = _ndjson(
+    {"model": "m", "message": {"role": "assistant", "content": "Grüße "}, "done": False},
+    {"model": "m", "message": {"role": "assistant", "content": "🦙 日本"}, "done": False},
+    {"model": "m", "message": {"role": "assistant", "content": ""}, "done": True,
+     "done_reason": "stop", "eval_count": 20, "eval_duration": 2_000_000_000},
+)
+
+
+def test_whole_stream_in_one_chunk():
+    events = _feed_in_pieces(CHAT, len(CHAT))
+    assert [event.text for event in events if isinstance(event, TokenChunk)] == ["Grüße ", "🦙 日本"]
+    assert isinstance(events[-1], FinalStats)
+    assert events[-1].done_reason == "stop"
+    assert events[-1].tokens_per_second == 10.0
+
+
+def test_lines_split_at_every_byte_boundary():
+    # One-byte chunks split every line and every multi-byte UTF-8 character
+    expected = _feed_in_pieces(CHAT, len(CHAT))
+    for size in (1, 2, 3, 5, 7):
+        assert _feed_in_pieces(CHAT, size) == expected
+
+
+def test_chunk_ending_inside_multibyte_character():
+    line = _ndjson({"response": "🦙", "done": False})
+    split = line.index("🦙".encode("utf-8")) + 2
+    decoder = NDJSONDecoder()
+    assert decoder.feed(line[:split]) == []
+    assert decoder.feed(line[split:]) == [TokenChunk("🦙")]
+
+
+def test_trailing_partial_line_is_decoded_on_close():
+    data = _ndjson({"status": "pulling manifest"}) + b'{"status": "success"}'
+    decoder = NDJSONDecoder()
+    assert decoder.feed(data) == [PullProgress("pulling manifest")]
+    assert decoder.close() == [PullProgress("success")]
+    assert decoder.close() == []
+
+
+def test_truncated_trailing_line_is_reported():
+    decoder = NDJSONDecoder()
+    decoder.feed(b'{"status": "pull')
+    events = decoder.close()
+    assert len(events) == 1 and isinstance(events[0], StreamError)
+
+
+def test_blank_lines_are_skipped():
+    assert _feed_in_pieces(b"\n\r\n" + _ndjson({"response": "a"}) + b"  \n", 4) == [TokenChunk("a")]
+
+
+def test_invalid_line_does_not_stop_the_stream():
+    events = _feed_in_pieces(b"not json\n" + _ndjson({"response": "a"}), 3)
+    assert isinstance(events[0], StreamError)
+    assert events[1:] == [TokenChunk("a")]
+
+
+def test_pull_progress_and_error_objects():
+    assert decode_object({"status": "pulling abc", "digest": "sha256:abc", "total": 10, "completed": 4}) == [
+        PullProgress("pulling abc", "sha256:abc", 10, 4)
+    ]
+    assert decode_object({"error": "model not found"}) == [StreamError("model not found")]
+    assert isinstance(decode_object([1, 2])[0], StreamError)
@@ -0,0 +1,181 @@
+"""UsageHistory predictions and WarmPool re-arm/preload decisions, with a stub poller."""
+import threading
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+import utils.scheduler as scheduler
+import utils.warm_pool as warm_pool
+from utils.catalog import ModelCatalog
+from utils.poller import ServerSnapshot
+from utils.scheduler import VRAMScheduler
+from utils.vram_history import VRAMHistory
+from utils.warm_pool import (
+    PRELOAD, PRELOAD_LEAD_MINUTES, PRELOAD_MIN_DAYS, REARM, REARM_BEFORE_SECONDS, USAGE_HISTORY_DAYS,
+    WARM_POOL_KEEP_ALIVE, UsageHistory, WarmPool,
+)
+
+GB = 1024 ** 3
+
+# A Monday, 09:00 local time
+MORNING = datetime(2024, 6, 10, 9, 0)
+
+
+def _at(day: int, hour: int, minute: int = 0) -> float:
+    """Local timestamp day days after MORNING's date, at hour:minute"""
+    return (MORNING.replace(hour=hour, minute=minute) + timedelta(days=day)).timestamp()
+
+
+class _StubAPI:
+    base_url = "http://stub"
+
+    def __init__(self):
+        self.loads = []
+
+    def load_model_into_vram(self, model_name, keep_alive="5m", invalidate_cache=True, report_errors=True):
+        self.loads.append((model_name, keep_alive))
+        return {"status": "success"}
+
+
+class _StubPoller:
+    def __init__(self):
+        self.api = _StubAPI()
+        self.history = VRAMHistory()
+        self.snapshot = ServerSnapshot()
+
+    def refresh(self, wait=0.0):
+        return self.snapshot
+
+
+class _StubMetrics:
+    def last_used(self):
+        return {}
+
+
+def _snapshot(installed, resident, errors=None):
+    """installed maps name to GB on disk, resident maps name to (GB in VRAM, expires_at timestamp)"""
+    models = tuple({"name": name, "size": int(size * GB)} for name, size in installed.items())
+    running = tuple(
+        {
+            "name": name,
+            "size_vram": int(size * GB),
+            "expires_at": datetime.fromtimestamp(expires, timezone.utc).isoformat(),
+        }
+        for name, (size, expires) in resident.items()
+    )
+    return ServerSnapshot(version=1, running_models=running, models=models, errors=errors or {},
+                          catalog=ModelCatalog(models))
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    monkeypatch.setattr(warm_pool, "USAGE_HISTORY_FILE", "")
+    monkeypatch.setattr(scheduler, "get_generation_metrics", lambda: _StubMetrics())
+    poller = _StubPoller()
+    pool = WarmPool(poller, VRAMScheduler(poller, budget=0), interval=3600)
+    # Keep set_pinned() from waking the daemon thread, so only the test runs passes
+    pool._wake = threading.Event()
+    return pool
+
+
+INSTALLED = {"chat": 8, "code": 8, "embed": 1}
+
+
+def test_no_prediction_before_enough_days():
+    usage = UsageHistory()
+    for day in range(PRELOAD_MIN_DAYS - 1):
+        usage.record("chat", _at(day, 9, 15))
+    assert usage.predicted(_at(PRELOAD_MIN_DAYS - 2, 9, 30)) == []
+
+
+def test_predicts_models_used_in_most_days_at_that_hour():
+    usage = UsageHistory()
+    for day in range(4):
+        usage.record("chat", _at(day, 9, 15))
+    usage.record("code", _at(0, 9, 20))
+    usage.record("code", _at(3, 14, 0))
+
+    assert usage.observed_days(MORNING.date() + timedelta(days=3)) == 4
+    assert usage.predicted(_at(3, 9, 45)) == ["chat"]
+    assert usage.predicted(_at(3, 10, 0)) == []
+    assert usage.shares(MORNING.date() + timedelta(days=3))["code"] == {9: 0.25, 14: 0.25}
+
+
+def test_old_days_are_pruned():
+    usage = UsageHistory()
+    usage.record("chat", _at(0, 9))
+    usage.record("code", _at(USAGE_HISTORY_DAYS, 9))
+    assert set(usage.to_dict()["models"]) == {"code"}
+
+
+def test_usage_round_trips_through_dict():
+    usage = UsageHistory()
+    today = datetime.now().replace(minute=0, second=0, microsecond=0)
+    for day in range(3):
+        usage.record("chat", (today - timedelta(days=day)).timestamp())
+    restored = UsageHistory()
+    restored.load_dict(usage.to_dict())
+    assert restored.to_dict() == usage.to_dict()
+
+
+def test_preloads_pinned_model_that_is_not_loaded(pool):
+    pool.set_pinned(["chat"])
+    pool.poller.snapshot = _snapshot(INSTALLED, {})
+    pool.run_once(_at(0, 9))
+    assert pool.poller.api.loads == [("chat", WARM_POOL_KEEP_ALIVE)]
+    assert [(action.action, action.reason, action.ok) for action in pool.actions] == [(PRELOAD, "pinned", True)]
+
+
+def test_rearms_only_models_about_to_expire(pool):
+    now = _at(0, 9)
+    pool.set_pinned(["chat", "code"])
+    pool.poller.snapshot = _snapshot(INSTALLED, {
+        "chat": (8, now + REARM_BEFORE_SECONDS / 2),
+        "code": (8, now + 3600),
+    })
+    pool.run_once(now)
+    assert pool.poller.api.loads == [("chat", WARM_POOL_KEEP_ALIVE)]
+    assert [action.action for action in pool.actions] == [REARM]
+
+
+def test_skips_missing_models_and_unknown_residency(pool):
+    pool.set_pinned(["missing", "chat"])
+    pool.poller.snapshot = _snapshot(INSTALLED, {}, errors={"running_models": "timed out"})
+    pool.run_once(_at(0, 9))
+    pool.poller.snapshot = _snapshot({"embed": 1}, {})
+    pool.run_once(_at(0, 9))
+    assert pool.poller.api.loads == []
+
+
+def test_predicted_models_are_warm_ahead_of_their_hour(pool):
+    for day in range(3):
+        pool.usage.record("code", _at(day, 10, 5))
+    before = _at(3, 10) - (PRELOAD_LEAD_MINUTES - 1) * 60
+    assert pool.warm_models(before) == {"code": "predicted"}
+    assert pool.warm_models(_at(3, 10) - (PRELOAD_LEAD_MINUTES + 1) * 60) == {}
+
+    pool.set_pinned(["code"])
+    assert pool.warm_models(before) == {"code": "pinned"}
+    pool.set_pinned([])
+    pool.set_predictive(False)
+    assert pool.warm_models(before) == {}
+
+
+def test_preload_skipped_when_it_would_evict_a_warm_model(pool):
+    now = _at(0, 9)
+    pool.scheduler.budget = int(12 * GB)
+    pool.set_pinned(["chat", "code"])
+    pool.poller.snapshot = _snapshot(INSTALLED, {"chat": (8, now + 3600)})
+    pool.run_once(now)
+    assert pool.poller.api.loads == []
+    [action] = pool.actions
+    assert action.model == "code" and not action.ok and "would evict chat" in action.message
+
+
+def test_hit_rate(pool):
+    assert pool.hit_rate() is None
+    pool.record_request("chat", 0.2, _at(0, 9))
+    pool.record_request("chat", 4.0, _at(0, 9))
+    pool.record_request("code", 0.1, _at(0, 9))
+    assert pool.hit_rate() == pytest.approx(2 / 3)
+    assert pool.request_counts() == {"chat": (2, 1), "code": (1, 1)}
@@ -1,15 +1,318 @@
+import os
+import time
+import threading
 import requests
 import json
 import streamlit as st
+from collections import OrderedDict
+from types import MappingProxyType
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.util.retry import Retry
 from typing import Dict, List, Any, Optional, Tuple, Union
+from utils.metrics import get_request_metrics
+from utils.profiling import timed
+
+
+# Number of keep-alive connections kept open per Ollama host
+DEFAULT_POOL_SIZE = int(os.environ.get("OLLAMA_POOL_SIZE", "10"))
+
+# Retry policy for idempotent GET requests (connection errors and 502/503/504)
+RETRY_TOTAL = 3
+RETRY_BACKOFF_FACTOR = 0.3
+RETRY_BACKOFF_JITTER = 0.3
+
+# Per-endpoint (connect, read) timeouts in seconds. A read timeout of None
+# means wait indefinitely, which is what the long-running endpoints need.
+CONNECT_TIMEOUT = 3.05
+ENDPOINT_TIMEOUTS = {
+    "/api/version": (CONNECT_TIMEOUT, 5),
+    "/api/tags": (CONNECT_TIMEOUT, 5),
+    "/api/ps": (CONNECT_TIMEOUT, 5),
+    "/api/show": (CONNECT_TIMEOUT, 10),
+    "/api/delete": (CONNECT_TIMEOUT, 10),
+    "/api/pull": (CONNECT_TIMEOUT, None),
+    "/api/generate": (CONNECT_TIMEOUT, None),
+    "/api/chat": (CONNECT_TIMEOUT, None),
+}
+DEFAULT_TIMEOUT = (CONNECT_TIMEOUT, 30)
+
+# Sentinel so callers can explicitly pass timeout=None (no timeout)
+_USE_ENDPOINT_TIMEOUT = object()
+
+# Time-to-live in seconds for cached read endpoints
+CACHE_TTLS = {
+    "/api/version": 60,
+    "/api/tags": 10,
+    "/api/ps": 2,
+    "/api/show": 300,
+}
+CACHE_MAX_ENTRIES = 512
+
+# Sentinel returned by ResponseCache.get on a miss
+_CACHE_MISS = object()
+
+
+# Seconds spent opening new connections during the current request (per thread)
+_connect_timing = threading.local()
+
+
+class TimedHTTPConnection(HTTPConnection):
+    """HTTP connection that records how long connecting took"""
+    
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            super().connect()
+        finally:
+            _connect_timing.seconds = (getattr(_connect_timing, "seconds", None) or 0.0) + time.perf_counter() - start
+
+
+class TimedHTTPSConnection(HTTPSConnection):
+    """HTTPS connection that records how long connecting (including TLS) took"""
+    
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            super().connect()
+        finally:
+            _connect_timing.seconds = (getattr(_connect_timing, "seconds", None) or 0.0) + time.perf_counter() - start
+
+
+class TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = TimedHTTPConnection
+
+
+class TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = TimedHTTPSConnection
+
+
+class TimedHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter whose pooled connections report their connect time"""
+    
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": TimedHTTPConnectionPool,
+            "https": TimedHTTPSConnectionPool,
+        }
+
+
+@st.cache_resource(show_spinner=False)
+def get_session(base_url: str, pool_size: int = DEFAULT_POOL_SIZE) -> requests.Session:
+    """Get the process-wide pooled HTTP session for an Ollama host.
+    
+    Cached with st.cache_resource so every Streamlit session and rerun talking
+    to the same base URL reuses the same keep-alive connections.
+    """
+    retry = Retry(
+        total=RETRY_TOTAL,
+        backoff_factor=RETRY_BACKOFF_FACTOR,
+        backoff_jitter=RETRY_BACKOFF_JITTER,
+        status_forcelist=(502, 503, 504),
+        allowed_methods=frozenset({"GET"}),
+        raise_on_status=False,
+    )
+    adapter = TimedHTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=retry)
+    
+    session = requests.Session()
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def freeze(value: Any) -> Any:
+    """Read-only copy of decoded JSON: dicts become mapping proxies and lists tuples"""
+    if isinstance(value, dict):
+        return MappingProxyType({key: freeze(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(freeze(item) for item in value)
+    return value
+
+
+def thaw(value: Any) -> Any:
+    """Plain, mutable copy of a frozen value (for callers that edit or serialize it)"""
+    if isinstance(value, (dict, MappingProxyType)):
+        return {key: thaw(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [thaw(item) for item in value]
+    return value
+
+
+class ResponseCache:
+    """Thread-safe TTL cache with LRU eviction for read endpoint responses.
+    
+    Keys are (base_url, endpoint, arg) tuples. Values are shared between
+    sessions, so they are stored frozen (see freeze()): a caller that tries
+    to edit a cached /api/tags or /api/show result gets a TypeError instead
+    of corrupting it for every other session. Use thaw() for a mutable copy.
+    """
+    
+    def __init__(self, max_entries: int = CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+    
+    def get(self, key: Tuple) -> Any:
+        """Return the cached value for key, or _CACHE_MISS if absent or expired"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return _CACHE_MISS
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+    
+    def set(self, key: Tuple, value: Any, ttl: float) -> Any:
+        """Store a frozen copy of value for ttl seconds and return it, evicting least recently used entries"""
+        value = freeze(value)
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return value
+    
+    def invalidate(self, key: Tuple):
+        """Drop a single key"""
+        with self._lock:
+            if self._entries.pop(key, None) is not None:
+                self.invalidations += 1
+    
+    def clear(self):
+        """Drop all entries (counters are kept)"""
+        with self._lock:
+            self.invalidations += len(self._entries)
+            self._entries.clear()
+    
+    def stats(self) -> Dict[str, Any]:
+        """Get hit/miss counters and current size"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "entries": len(self._entries),
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+
+@st.cache_resource(show_spinner=False)
+def get_response_cache() -> ResponseCache:
+    """Get the process-wide response cache shared by all sessions"""
+    return ResponseCache()
+
+
+def _normalize_model_name(model_name: str) -> str:
+    """Ollama treats "llama3" and "llama3:latest" as the same model"""
+    return model_name if ":" in model_name else f"{model_name}:latest"
 
 
 class OllamaAPI:
     """Handler for Ollama REST API interactions"""
     
-    def __init__(self, base_url: str):
+    def __init__(self, base_url: str, pool_size: int = DEFAULT_POOL_SIZE):
         """Initialize the API handler with the base URL"""
-        self.base_url = base_url
+        self.base_url = base_url.rstrip("/")
+        self.session = get_session(self.base_url, pool_size)
+    
+    def _request(self, method: str, endpoint: str, timeout: Any = _USE_ENDPOINT_TIMEOUT,
+                 **kwargs) -> requests.Response:
+        """Send a request through the pooled session, using the endpoint's default timeout.
+        
+        Connect time (new connections only), time to first byte and total
+        time are recorded per endpoint. For streamed responses the total is
+        the time until the headers arrived.
+        """
+        if timeout is _USE_ENDPOINT_TIMEOUT:
+            timeout = ENDPOINT_TIMEOUTS.get(endpoint, DEFAULT_TIMEOUT)
+        
+        _connect_timing.seconds = None
+        start = time.perf_counter()
+        try:
+            with timed(f"{method} {endpoint}", "api"):
+                response = self.session.request(method, f"{self.base_url}{endpoint}", timeout=timeout, **kwargs)
+        except requests.exceptions.RequestException:
+            get_request_metrics().record(self.base_url, endpoint, _connect_timing.seconds, None,
+                                         time.perf_counter() - start, error=True)
+            raise
+        get_request_metrics().record(self.base_url, endpoint, _connect_timing.seconds,
+                                     response.elapsed.total_seconds(), time.perf_counter() - start,
+                                     error=response.status_code >= 500)
+        return response
+    
+    def _cache_get(self, endpoint: str, arg: Optional[str] = None) -> Any:
+        """Look up a cached read response for this server"""
+        return get_response_cache().get((self.base_url, endpoint, arg))
+    
+    def _cache_set(self, endpoint: str, value: Any, arg: Optional[str] = None) -> Any:
+        """Cache a read response for this server and return its frozen copy"""
+        return get_response_cache().set((self.base_url, endpoint, arg), value, CACHE_TTLS[endpoint])
+    
+    def _cache_invalidate(self, endpoint: str, arg: Optional[str] = None):
+        """Drop a cached read response for this server"""
+        get_response_cache().invalidate((self.base_url, endpoint, arg))
+    
+    def invalidate_model_cache(self, model_name: Union[str, List[str]], installed: bool = True,
+                               running: bool = False):
+        """Drop the cached entries affected by a change to one model (or a list of models).
+        
+        installed: the model was added or removed (/api/tags and its /api/show)
+        running: the model's VRAM residency changed (/api/ps)
+        """
+        model_names = [model_name] if isinstance(model_name, str) else model_name
+        if installed:
+            self._cache_invalidate("/api/tags")
+            for name in model_names:
+                self._cache_invalidate("/api/show", _normalize_model_name(name))
+        if running:
+            self._cache_invalidate("/api/ps")
+    
+    def fetch_cached(self, endpoint: str, field: Optional[str] = None,
+                     timeout: Any = _USE_ENDPOINT_TIMEOUT) -> Any:
+        """GET a cached read endpoint and return its frozen JSON (or one field of it), raising on errors.
+    
+        Unlike the UI-facing methods this does not report errors with st.error,
+        which makes it safe to call from background threads.
+        """
+        cached = self._cache_get(endpoint)
+        if cached is not _CACHE_MISS:
+            return cached
+        response = self._request("GET", endpoint, timeout=timeout)
+        response.raise_for_status()
+        data = response.json()
+        if field is not None:
+            data = data.get(field, [])
+        return self._cache_set(endpoint, data)
+    
+    def connection_stats(self) -> Dict[str, int]:
+        """Get request and connection counters for this host's connection pool"""
+        adapter = self.session.get_adapter(self.base_url)
+        pools = adapter.poolmanager.pools
+        
+        requests_sent = 0
+        connections_opened = 0
+        for key in pools.keys():
+            pool = pools[key]
+            requests_sent += pool.num_requests
+            connections_opened += pool.num_connections
+        
+        return {
+            "requests": requests_sent,
+            "connections": connections_opened,
+            "reused": max(requests_sent - connections_opened, 0),
+        }
         
     def test_connection(self) -> Tuple[bool, Dict]:
         """Test connection to the Ollama server by fetching version info"""
@@ -24,9 +327,7 @@ class OllamaAPI:
     def get_version(self) -> Dict:
         """Get Ollama server version information"""
         try:
-            response = requests.get(f"{self.base_url}/api/version", timeout=5)
-            response.raise_for_status()
-            return response.json()
+            return self.fetch_cached("/api/version")
         except requests.exceptions.RequestException as e:
             st.error(f"Error fetching version: {str(e)}")
             return {"error": str(e)}
@@ -34,60 +335,85 @@ class OllamaAPI:
     def list_models(self) -> List[Dict]:
         """List all available models on the Ollama server"""
         try:
-            response = requests.get(f"{self.base_url}/api/tags", timeout=5)
-            response.raise_for_status()
-            return response.json().get("models", [])
+            return self.fetch_cached("/api/tags", "models")
         except requests.exceptions.RequestException as e:
             st.error(f"Error listing models: {str(e)}")
             return []
     
     def get_model_details(self, model_name: str) -> Dict:
         """Get detailed information about a specific model"""
+        cache_arg = _normalize_model_name(model_name)
+        cached = self._cache_get("/api/show", cache_arg)
+        if cached is not _CACHE_MISS:
+            return cached
         try:
             payload = {"name": model_name}
-            response = requests.post(f"{self.base_url}/api/show", json=payload, timeout=10)
+            response = self._request("POST", "/api/show", json=payload)
             response.raise_for_status()
-            return response.json()
+            return self._cache_set("/api/show", response.json(), cache_arg)
         except requests.exceptions.RequestException as e:
             st.error(f"Error fetching model details: {str(e)}")
             return {"error": str(e)}
     
-    def pull_model(self, model_name: str, stream: bool = True) -> Union[Dict, requests.Response]:
-        """Pull a model from the Ollama library"""
+    def pull_model(self, model_name: str, stream: bool = True,
+                   report_errors: bool = True) -> Union[Dict, requests.Response]:
+        """Pull a model from the Ollama library
+        
+        When streaming, the caller should call invalidate_model_cache(model_name)
+        once the stream has been consumed. With report_errors=False, failures
+        are only returned (no st.error), for callers on background threads.
+        """
         try:
             payload = {"name": model_name}
             
             if stream:
                 # Return the raw response object for streaming progress
-                return requests.post(f"{self.base_url}/api/pull", 
-                                    json=payload, 
-                                    stream=True,
-                                    timeout=None)
+                return self._request("POST", "/api/pull", 
+                                     json=payload, 
+                                     stream=True)
             else:
                 # For non-streaming, just return the final result
-                response = requests.post(f"{self.base_url}/api/pull", json=payload, timeout=None)
+                response = self._request("POST", "/api/pull", json=payload)
+                self.invalidate_model_cache(model_name)
                 response.raise_for_status()
                 return response.json()
         except requests.exceptions.RequestException as e:
-            st.error(f"Error pulling model: {str(e)}")
+            if report_errors:
+                st.error(f"Error pulling model: {str(e)}")
             return {"error": str(e)}
     
-    def delete_model(self, model_name: str) -> Dict:
-        """Delete a model from local storage"""
+    def delete_model(self, model_name: str, invalidate_cache: bool = True, report_errors: bool = True) -> Dict:
+        """Delete a model from local storage
+        
+        With report_errors=False, failures are only returned (no st.error),
+        for callers on background threads.
+        """
         try:
             payload = {"name": model_name}
-            response = requests.delete(f"{self.base_url}/api/delete", json=payload, timeout=10)
+            response = self._request("DELETE", "/api/delete", json=payload)
             response.raise_for_status()
+            if invalidate_cache:
+                self.invalidate_model_cache(model_name, running=True)
             return {"status": "success", "message": f"Model {model_name} deleted successfully"}
         except requests.exceptions.RequestException as e:
-            st.error(f"Error deleting model: {str(e)}")
+            if report_errors:
+                st.error(f"Error deleting model: {str(e)}")
             return {"error": str(e)}
     
-    def load_model_into_vram(self, model_name: str, keep_alive: str = "5m") -> Dict:
-        """Load a model into VRAM with customizable keep-alive timer"""
+    def load_model_into_vram(self, model_name: str, keep_alive: str = "5m", invalidate_cache: bool = True,
+                             report_errors: bool = True) -> Dict:
+        """Load a model into VRAM with customizable keep-alive timer
+        
+        With report_errors=False, failures are only returned (no st.error),
+        for callers on background threads.
+        """
         try:
             payload = {"model": model_name, "prompt": "", "keep_alive": keep_alive}
-            response = requests.post(f"{self.base_url}/api/generate", json=payload, timeout=30)
+            response = self._request("POST", "/api/generate", json=payload, timeout=30)
+            
+            # Residency may have changed even if the server reported an error
+            if invalidate_cache:
+                self.invalidate_model_cache(model_name, installed=False, running=True)
             
             # First check if there was an HTTP error
             if response.status_code != 200:
@@ -114,19 +440,20 @@ class OllamaAPI:
                 except:
                     pass
             
-            st.error(f"Error loading model: {error_msg}")
+            if report_errors:
+                st.error(f"Error loading model: {error_msg}")
             return {"error": error_msg}
     
-    def remove_model_from_vram(self, model_name: str) -> Dict:
+    def remove_model_from_vram(self, model_name: str, invalidate_cache: bool = True,
+                               report_errors: bool = True) -> Dict:
         """Force remove a model from VRAM by setting keep-alive to 0"""
-        return self.load_model_into_vram(model_name, keep_alive="0")
+        return self.load_model_into_vram(model_name, keep_alive="0", invalidate_cache=invalidate_cache,
+                                         report_errors=report_errors)
     
     def get_running_models(self) -> List[Dict]:
         """Get list of currently running models and their resource usage"""
         try:
-            response = requests.get(f"{self.base_url}/api/ps", timeout=5)
-            response.raise_for_status()
-            return response.json().get("models", [])
+            return self.fetch_cached("/api/ps", "models")
         except requests.exceptions.RequestException as e:
             st.error(f"Error fetching running models: {str(e)}")
             return []
@@ -134,53 +461,69 @@ class OllamaAPI:
     def generate_response(self, model_name: str, prompt: str, 
                          temperature: float = 0.7, stream: bool = False,
                          context_length: int = 4096,
-                         chat_history: List[Dict] = None) -> Union[Dict, requests.Response]:
-        """Generate a response from the specified model"""
+                         chat_history: List[Dict] = None,
+                         context: Optional[List[int]] = None,
+                         raise_connection_errors: bool = False) -> Union[Dict, requests.Response]:
+        """Generate a response from the specified model
+        
+        If context (the token array returned by a previous /api/generate call)
+        is given, only the new prompt is sent and chat_history is ignored: the
+        server continues from the cached context instead of re-evaluating the
+        whole conversation.
+        
+        With raise_connection_errors, failures to reach the server are raised
+        instead of reported, so a caller can fall back to another server.
+        """
         try:
             # Construct options with context length
             options = {
-                "num_ctx": context_length
+                "num_ctx": context_length,
+                "temperature": temperature
             }
             
             # Base payload
             payload = {
                 "model": model_name,
-                "temperature": temperature,
                 "stream": stream,
                 "options": options
             }
             
-            # Format prompt with chat history if provided
-            if chat_history and len(chat_history) > 0:
+            if context:
+                # Continue from the previous turn's KV context
+                payload["context"] = context
+                payload["prompt"] = prompt
+            elif chat_history and len(chat_history) > 0:
                 # Format chat history in a conversational format
-                formatted_history = ""
+                parts = []
                 for msg in chat_history:
                     role = msg.get("role", "").lower().strip()
                     content = msg.get("content", "").strip()
                     
                     if role == "user":
-                        formatted_history += f"\n\nHuman: {content}"
+                        parts.append(f"\n\nHuman: {content}")
                     elif role == "assistant":
-                        formatted_history += f"\n\nAssistant: {content}"
+                        parts.append(f"\n\nAssistant: {content}")
                 
                 # Add the current prompt
-                formatted_history += f"\n\nHuman: {prompt}\n\nAssistant:"
-                payload["prompt"] = formatted_history
+                parts.append(f"\n\nHuman: {prompt}\n\nAssistant:")
+                payload["prompt"] = "".join(parts)
             else:
                 # Just use the prompt as is
                 payload["prompt"] = prompt
             
             if stream:
                 # Return the raw response object for streaming
-                return requests.post(f"{self.base_url}/api/generate", 
-                                    json=payload, 
-                                    stream=True,
-                                    timeout=None)
+                response = self._request("POST", "/api/generate", 
+                                         json=payload, 
+                                         stream=True)
+                # The request may have loaded the model, and always moves its expiry
+                self.invalidate_model_cache(model_name, installed=False, running=True)
+                return response
             else:
                 # Process and return the complete response
-                response = requests.post(f"{self.base_url}/api/generate", 
-                                        json=payload, 
-                                        timeout=None)
+                response = self._request("POST", "/api/generate", 
+                                         json=payload)
+                self.invalidate_model_cache(model_name, installed=False, running=True)
                 
                 # Check if there was an HTTP error
                 if response.status_code != 200:
@@ -197,6 +540,9 @@ class OllamaAPI:
                 return response.json()
                 
         except requests.exceptions.RequestException as e:
+            if raise_connection_errors and isinstance(e, requests.exceptions.ConnectionError):
+                raise
+            
             # Extract the actual error message from the exception if possible
             error_msg = str(e)
             if hasattr(e, 'response') and hasattr(e.response, 'json'):
@@ -211,27 +557,38 @@ class OllamaAPI:
             return {"error": error_msg}
     
     def chat_with_model(self, model_name: str, messages: List[Dict], 
-                       temperature: float = 0.7, stream: bool = False) -> Union[Dict, requests.Response]:
-        """Chat with a model using the chat API endpoint"""
+                       temperature: float = 0.7, stream: bool = False,
+                       context_length: int = 4096,
+                       raise_connection_errors: bool = False) -> Union[Dict, requests.Response]:
+        """Chat with a model using the chat API endpoint
+        
+        With raise_connection_errors, failures to reach the server are raised
+        instead of reported, so a caller can fall back to another server.
+        """
         try:
             payload = {
                 "model": model_name,
                 "messages": messages,
-                "temperature": temperature,
-                "stream": stream
+                "stream": stream,
+                "options": {
+                    "num_ctx": context_length,
+                    "temperature": temperature
+                }
             }
             
             if stream:
                 # Return the raw response object for streaming
-                return requests.post(f"{self.base_url}/api/chat", 
-                                    json=payload, 
-                                    stream=True,
-                                    timeout=None)
+                response = self._request("POST", "/api/chat", 
+                                         json=payload, 
+                                         stream=True)
+                # The request may have loaded the model, and always moves its expiry
+                self.invalidate_model_cache(model_name, installed=False, running=True)
+                return response
             else:
                 # Process and return the complete response
-                response = requests.post(f"{self.base_url}/api/chat", 
-                                        json=payload, 
-                                        timeout=None)
+                response = self._request("POST", "/api/chat", 
+                                         json=payload)
+                self.invalidate_model_cache(model_name, installed=False, running=True)
                 
                 # Check if there was an HTTP error
                 if response.status_code != 200:
@@ -248,6 +605,9 @@ class OllamaAPI:
                 return response.json()
                 
         except requests.exceptions.RequestException as e:
+            if raise_connection_errors and isinstance(e, requests.exceptions.ConnectionError):
+                raise
+            
             # Extract the actual error message from the exception if possible
             error_msg = str(e)
             if hasattr(e, 'response') and hasattr(e.response, 'json'):
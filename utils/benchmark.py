@@ -0,0 +1,327 @@
+"""Model benchmark: throughput, TTFT and latency at increasing concurrency.
+
+Used by the Benchmark page and runnable from the command line:
+
+    python -m utils.benchmark --base-url http://localhost:11434 --models llama3.1:8b \\
+        --concurrency 1,2,4,8 --requests 16 --warmup 2 --csv results.csv --json results.json
+
+With --mock it runs against an in-process mock server instead (see
+benchmarks.mock_server for its options), which benchmarks the dashboard's
+client path without a GPU.
+"""
+import argparse
+import csv
+import io
+import json
+import logging
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import asdict, dataclass, field
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+from utils.api_handler import OllamaAPI
+from utils.stream_decoder import iter_events, FinalStats, StreamError, TokenChunk
+
+
+# Prompts used when no prompt set is supplied
+DEFAULT_PROMPTS = [
+    "Explain what a hash map is in two sentences.",
+    "Write a haiku about GPUs.",
+    "List three uses of the Python zip() function.",
+    "Summarize the plot of Romeo and Juliet in one paragraph.",
+]
+
+DEFAULT_CONCURRENCY = (1, 2, 4, 8)
+DEFAULT_REQUESTS_PER_LEVEL = 8
+DEFAULT_WARMUP = 1
+
+GENERATE_MODE = "generate"
+CHAT_MODE = "chat"
+
+
+@dataclass
+class BenchmarkConfig:
+    """What to run: models x concurrency levels, each with warmup and measured requests"""
+    base_url: str
+    models: List[str]
+    prompts: List[str] = field(default_factory=lambda: list(DEFAULT_PROMPTS))
+    concurrency: List[int] = field(default_factory=lambda: list(DEFAULT_CONCURRENCY))
+    requests_per_level: int = DEFAULT_REQUESTS_PER_LEVEL
+    warmup: int = DEFAULT_WARMUP
+    mode: str = CHAT_MODE
+    temperature: float = 0.7
+    context_length: int = 4096
+
+
+@dataclass
+class RequestResult:
+    """One benchmark request"""
+    model: str
+    concurrency: int
+    prompt_index: int
+    warmup: bool = False
+    ttft: Optional[float] = None
+    latency: Optional[float] = None
+    eval_count: int = 0
+    server_tokens_per_second: float = 0.0
+    error: str = ""
+
+
+@dataclass
+class LevelSummary:
+    """Aggregated results of one model at one concurrency level (warmup excluded)"""
+    model: str
+    concurrency: int
+    requests: int
+    errors: int
+    wall_seconds: float
+    aggregate_tokens_per_second: float
+    stream_tokens_per_second: float
+    ttft_p50: Optional[float]
+    ttft_p95: Optional[float]
+    ttft_p99: Optional[float]
+    latency_p50: Optional[float]
+    latency_p95: Optional[float]
+    latency_p99: Optional[float]
+
+
+@dataclass
+class BenchmarkReport:
+    config: BenchmarkConfig
+    results: List[RequestResult] = field(default_factory=list)
+    summaries: List[LevelSummary] = field(default_factory=list)
+
+    def to_csv(self) -> str:
+        """Level summaries as CSV"""
+        output = io.StringIO()
+        fields = list(LevelSummary.__dataclass_fields__)
+        writer = csv.DictWriter(output, fieldnames=fields)
+        writer.writeheader()
+        for summary in self.summaries:
+            writer.writerow(asdict(summary))
+        return output.getvalue()
+
+    def to_json(self) -> str:
+        """Configuration, level summaries and every request as JSON"""
+        return json.dumps({
+            "config": asdict(self.config),
+            "summaries": [asdict(summary) for summary in self.summaries],
+            "results": [asdict(result) for result in self.results],
+        }, indent=2)
+
+
+def run_request(api: OllamaAPI, config: BenchmarkConfig, model: str, prompt_index: int,
+                concurrency: int, warmup: bool = False) -> RequestResult:
+    """Send one streamed request and time it"""
+    result = RequestResult(model, concurrency, prompt_index, warmup)
+    prompt = config.prompts[prompt_index % len(config.prompts)]
+    started = time.perf_counter()
+    try:
+        if config.mode == GENERATE_MODE:
+            response = api.generate_response(model, prompt, temperature=config.temperature,
+                                             context_length=config.context_length, stream=True)
+        else:
+            response = api.chat_with_model(model, [{"role": "user", "content": prompt}],
+                                           temperature=config.temperature,
+                                           context_length=config.context_length, stream=True)
+        if isinstance(response, dict):
+            result.error = response.get("error", "Unknown error")
+            return result
+
+        for event in iter_events(response):
+            if isinstance(event, TokenChunk):
+                if result.ttft is None and event.text:
+                    result.ttft = time.perf_counter() - started
+            elif isinstance(event, FinalStats):
+                result.eval_count = event.eval_count
+                result.server_tokens_per_second = event.tokens_per_second
+            elif isinstance(event, StreamError):
+                result.error = event.message
+                return result
+        result.latency = time.perf_counter() - started
+    except Exception as e:
+        result.error = str(e)
+    return result
+
+
+def _percentiles(values: List[float]):
+    if not values:
+        return None, None, None
+    return tuple(float(value) for value in np.percentile(values, [50, 95, 99]))
+
+
+def summarize_level(model: str, concurrency: int, results: List[RequestResult], wall_seconds: float) -> LevelSummary:
+    """Aggregate the measured (non-warmup) requests of one level"""
+    measured = [result for result in results if not result.warmup]
+    succeeded = [result for result in measured if not result.error and result.latency is not None]
+    tokens = sum(result.eval_count for result in succeeded)
+
+    # Per-stream speed as the client saw it: tokens after the first one over the streaming time
+    stream_speeds = [
+        result.eval_count / (result.latency - result.ttft)
+        for result in succeeded
+        if result.ttft is not None and result.latency > result.ttft and result.eval_count
+    ]
+    ttft = _percentiles([result.ttft for result in succeeded if result.ttft is not None])
+    latency = _percentiles([result.latency for result in succeeded])
+
+    return LevelSummary(
+        model=model,
+        concurrency=concurrency,
+        requests=len(measured),
+        errors=len(measured) - len(succeeded),
+        wall_seconds=wall_seconds,
+        aggregate_tokens_per_second=tokens / wall_seconds if wall_seconds > 0 else 0.0,
+        stream_tokens_per_second=float(np.mean(stream_speeds)) if stream_speeds else 0.0,
+        ttft_p50=ttft[0], ttft_p95=ttft[1], ttft_p99=ttft[2],
+        latency_p50=latency[0], latency_p95=latency[1], latency_p99=latency[2],
+    )
+
+
+def run_benchmark(config: BenchmarkConfig,
+                  progress: Optional[Callable[[int, int, str], None]] = None) -> BenchmarkReport:
+    """Run every model at every concurrency level.
+
+    progress(done, total, label) is called from the calling thread after
+    each request, so it may update Streamlit elements.
+    """
+    api = OllamaAPI(config.base_url, pool_size=max(config.concurrency + [1]))
+    report = BenchmarkReport(config)
+    total = len(config.models) * len(config.concurrency) * (config.warmup + config.requests_per_level)
+    done = 0
+
+    for model in config.models:
+        for concurrency in config.concurrency:
+            label = f"{model} @ concurrency {concurrency}"
+            level_results = []
+
+            # Warmup runs load the model and are excluded from the summary
+            for index in range(config.warmup):
+                level_results.append(run_request(api, config, model, index, concurrency, warmup=True))
+                done += 1
+                if progress:
+                    progress(done, total, f"{label} (warmup)")
+
+            started = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="ollama-bench") as executor:
+                futures = [
+                    executor.submit(run_request, api, config, model, index, concurrency)
+                    for index in range(config.requests_per_level)
+                ]
+                for future in as_completed(futures):
+                    level_results.append(future.result())
+                    done += 1
+                    if progress:
+                        progress(done, total, label)
+            wall_seconds = time.perf_counter() - started
+
+            report.results.extend(level_results)
+            report.summaries.append(summarize_level(model, concurrency, level_results, wall_seconds))
+    return report
+
+
+def format_summary_table(summaries: List[LevelSummary]) -> str:
+    """Plain-text table of level summaries for the CLI"""
+    def ms(value):
+        return "-" if value is None else f"{value * 1000:.0f}"
+
+    header = f"{'model':<24} {'conc':>4} {'req':>4} {'err':>4} {'agg tok/s':>10} {'stream tok/s':>12} " \
+             f"{'ttft p50':>9} {'ttft p95':>9} {'lat p50':>9} {'lat p95':>9} {'lat p99':>9}"
+    lines = [header, "-" * len(header)]
+    for summary in summaries:
+        lines.append(
+            f"{summary.model:<24} {summary.concurrency:>4} {summary.requests:>4} {summary.errors:>4} "
+            f"{summary.aggregate_tokens_per_second:>10.1f} {summary.stream_tokens_per_second:>12.1f} "
+            f"{ms(summary.ttft_p50):>9} {ms(summary.ttft_p95):>9} "
+            f"{ms(summary.latency_p50):>9} {ms(summary.latency_p95):>9} {ms(summary.latency_p99):>9}"
+        )
+    lines.append("(latencies in ms)")
+    return "\n".join(lines)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark Ollama models at increasing concurrency")
+    parser.add_argument("--base-url", default="http://localhost:11434", help="Ollama server URL")
+    parser.add_argument("--models", help="Comma-separated model names (default with --mock: the first mock model)")
+    parser.add_argument("--concurrency", default=",".join(map(str, DEFAULT_CONCURRENCY)),
+                        help="Comma-separated concurrency levels (default: 1,2,4,8)")
+    parser.add_argument("--requests", type=int, default=DEFAULT_REQUESTS_PER_LEVEL,
+                        help="Measured requests per model and level")
+    parser.add_argument("--warmup", type=int, default=DEFAULT_WARMUP,
+                        help="Warmup requests per model and level (excluded from results)")
+    parser.add_argument("--mode", choices=(CHAT_MODE, GENERATE_MODE), default=CHAT_MODE,
+                        help="Use /api/chat or /api/generate")
+    parser.add_argument("--prompts-file", help="Text file with one prompt per line")
+    parser.add_argument("--csv", help="Write level summaries to this CSV file")
+    parser.add_argument("--json", help="Write summaries and every request to this JSON file")
+    parser.add_argument("--mock", action="store_true", help="Benchmark an in-process mock server")
+    # Test tooling, only imported by the command line (the Benchmark page never needs it)
+    from benchmarks.mock_server import add_mock_arguments
+    add_mock_arguments(parser.add_argument_group("mock server (with --mock)"))
+    args = parser.parse_args(argv)
+    if not args.models and not args.mock:
+        parser.error("--models is required unless --mock is given")
+    return args
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+
+    # OllamaAPI reports errors through Streamlit, which only logs outside a running app
+    logging.getLogger("streamlit").setLevel(logging.ERROR)
+
+    prompts = list(DEFAULT_PROMPTS)
+    if args.prompts_file:
+        with open(args.prompts_file, encoding="utf-8") as prompts_file:
+            prompts = [line.strip() for line in prompts_file if line.strip()]
+
+    base_url = args.base_url
+    models = [model.strip() for model in (args.models or "").split(",") if model.strip()]
+    mock_server = None
+    if args.mock:
+        from benchmarks.mock_server import MockOllamaServer, mock_config_from_args
+        mock_server = MockOllamaServer(mock_config_from_args(args)).start()
+        base_url = mock_server.url
+        models = models or mock_server.model_names[:1]
+
+    try:
+        return _run(args, base_url, models, prompts)
+    finally:
+        if mock_server is not None:
+            mock_server.stop()
+
+
+def _run(args, base_url: str, models: List[str], prompts: List[str]) -> int:
+    config = BenchmarkConfig(
+        base_url=base_url,
+        models=models,
+        prompts=prompts,
+        concurrency=[int(level) for level in args.concurrency.split(",") if level.strip()],
+        requests_per_level=args.requests,
+        warmup=args.warmup,
+        mode=args.mode,
+    )
+
+    def progress(done, total, label):
+        print(f"\r[{done}/{total}] {label:<60}", end="", file=sys.stderr, flush=True)
+
+    report = run_benchmark(config, progress)
+    print(file=sys.stderr)
+    print(format_summary_table(report.summaries))
+
+    if args.csv:
+        with open(args.csv, "w", encoding="utf-8", newline="") as csv_file:
+            csv_file.write(report.to_csv())
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as json_file:
+            json_file.write(report.to_json())
+
+    failed = sum(summary.errors for summary in report.summaries)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,79 @@
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from typing import Callable, List, Optional
+
+from utils.api_handler import OllamaAPI
+
+
+# Model operations a bulk run may have in flight at the same time
+BULK_MAX_WORKERS = int(os.environ.get("OLLAMA_BULK_WORKERS", "4"))
+
+# Bulk operations
+LOAD = "load"
+UNLOAD = "unload"
+DELETE = "delete"
+OPERATIONS = (LOAD, UNLOAD, DELETE)
+
+
+@dataclass
+class BulkResult:
+    """Outcome of one model in a bulk operation"""
+    model: str
+    ok: bool
+    message: str
+    seconds: float
+
+
+def _run_one(api: OllamaAPI, operation: str, model_name: str, keep_alive: str) -> BulkResult:
+    start = time.perf_counter()
+    try:
+        if operation == LOAD:
+            result = api.load_model_into_vram(model_name, keep_alive=keep_alive, invalidate_cache=False,
+                                              report_errors=False)
+        elif operation == UNLOAD:
+            result = api.remove_model_from_vram(model_name, invalidate_cache=False, report_errors=False)
+        else:
+            result = api.delete_model(model_name, invalidate_cache=False, report_errors=False)
+    except Exception as e:
+        result = {"error": str(e)}
+    seconds = time.perf_counter() - start
+
+    if "error" in result:
+        return BulkResult(model_name, False, str(result["error"]), seconds)
+    done = {LOAD: f"Loaded (keep-alive {keep_alive})", UNLOAD: "Unloaded", DELETE: "Deleted"}[operation]
+    return BulkResult(model_name, True, done, seconds)
+
+
+def run_bulk(api: OllamaAPI, operation: str, model_names: List[str], keep_alive: str = "5m",
+             max_workers: int = BULK_MAX_WORKERS,
+             progress: Optional[Callable[[BulkResult, int, int], None]] = None) -> List[BulkResult]:
+    """Apply one operation to several models through a bounded worker pool.
+
+    Every model gets a result, so one failure does not stop the rest.
+    Failures are reported there rather than with st.error, which has no
+    page to draw on from the worker threads. The per-model cache
+    invalidation is skipped and the affected entries are dropped once at
+    the end. progress(result, done, total) is called on the
+    calling thread as each model finishes, so it may update the page.
+    Results are returned in the order the models were given.
+    """
+    if operation not in OPERATIONS:
+        raise ValueError(f"Unknown bulk operation: {operation}")
+    model_names = list(dict.fromkeys(model_names))
+    if not model_names:
+        return []
+
+    results = {}
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(model_names))),
+                            thread_name_prefix="bulk-operation") as executor:
+        futures = [executor.submit(_run_one, api, operation, name, keep_alive) for name in model_names]
+        for future in as_completed(futures):
+            result = future.result()
+            results[result.model] = result
+            if progress is not None:
+                progress(result, len(results), len(model_names))
+
+    api.invalidate_model_cache(model_names, installed=operation == DELETE, running=True)
+    return [results[name] for name in model_names]
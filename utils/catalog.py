@@ -0,0 +1,178 @@
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from dateutil.parser import isoparse
+
+
+# Families whose models only produce embeddings (no Load button)
+EMBEDDING_FAMILY_MARKERS = ("bert",)
+
+# Fields that can be grouped and filtered through an index
+INDEXED_FIELDS = ("family", "parameter_size", "quantization_level", "digest")
+
+UNKNOWN = "Unknown"
+
+_PARAMETER_MULTIPLIERS = {"K": 1e3, "M": 1e6, "B": 1e9, "T": 1e12}
+
+
+def parse_parameter_size(parameter_size: str) -> float:
+    """Parameter count of sizes like "270M", "7B" or "8.0B" (infinity when unknown, so it sorts last)"""
+    try:
+        return float(parameter_size[:-1]) * _PARAMETER_MULTIPLIERS[parameter_size[-1].upper()]
+    except (ValueError, KeyError, IndexError, TypeError):
+        return float("inf")
+
+
+def _parse_modified(modified_at: str) -> float:
+    # Ollama sends RFC 3339 with nanoseconds, which fromisoformat rejects before Python 3.11
+    try:
+        return isoparse(modified_at).timestamp()
+    except (ValueError, OverflowError, TypeError):
+        return 0.0
+
+
+@dataclass(frozen=True, slots=True)
+class ModelRecord:
+    """One installed model from /api/tags, with the fields pages filter and sort on"""
+    name: str
+    size: int
+    digest: str
+    modified_at: str
+    modified: float
+    family: str
+    format: str
+    parameter_size: str
+    parameter_count: float
+    quantization_level: str
+    is_embedding: bool
+
+    @classmethod
+    def from_tags(cls, model: Dict) -> "ModelRecord":
+        details = model.get("details") or {}
+        family = details.get("family") or UNKNOWN
+        parameter_size = details.get("parameter_size") or UNKNOWN
+        modified_at = model.get("modified_at") or ""
+        return cls(
+            name=model.get("name", UNKNOWN),
+            size=model.get("size", 0) or 0,
+            digest=model.get("digest", ""),
+            modified_at=modified_at,
+            modified=_parse_modified(modified_at),
+            family=family,
+            format=details.get("format") or UNKNOWN,
+            parameter_size=parameter_size,
+            parameter_count=parse_parameter_size(parameter_size),
+            quantization_level=details.get("quantization_level") or UNKNOWN,
+            is_embedding=any(marker in family.lower() for marker in EMBEDDING_FAMILY_MARKERS),
+        )
+
+
+class ModelCatalog:
+    """Read-only index over one /api/tags snapshot.
+
+    Built once per snapshot by the server poller, so pages share it instead
+    of re-scanning the raw model list. Records keep the server's order.
+    Indexes by family, parameter size, quantization and digest make grouping
+    and filtering proportional to the matches, and the modified time and
+    size orders answer newest/largest and range queries with bisect.
+    """
+
+    def __init__(self, models: Iterable[Dict] = ()):
+        self.records: Tuple[ModelRecord, ...] = tuple(ModelRecord.from_tags(model) for model in models)
+        self.total_size = sum(record.size for record in self.records)
+        self._by_name = {record.name: position for position, record in enumerate(self.records)}
+
+        indexes = {field: defaultdict(list) for field in INDEXED_FIELDS}
+        for position, record in enumerate(self.records):
+            for field, index in indexes.items():
+                index[getattr(record, field)].append(position)
+        self._indexes = {
+            field: {key: tuple(positions) for key, positions in index.items()}
+            for field, index in indexes.items()
+        }
+
+        self._by_modified = sorted(range(len(self.records)), key=lambda position: self.records[position].modified)
+        self._modified_keys = [self.records[position].modified for position in self._by_modified]
+        self._by_size = sorted(range(len(self.records)), key=lambda position: self.records[position].size)
+        self._size_keys = [self.records[position].size for position in self._by_size]
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def __iter__(self) -> Iterator[ModelRecord]:
+        return iter(self.records)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._by_name
+
+    def get(self, name: str) -> Optional[ModelRecord]:
+        position = self._by_name.get(name)
+        return None if position is None else self.records[position]
+
+    @property
+    def names(self) -> List[str]:
+        return [record.name for record in self.records]
+
+    def values(self, field: str) -> List[str]:
+        """Distinct values of an indexed field (parameter sizes in size order)"""
+        keys = self._indexes[field].keys()
+        if field == "parameter_size":
+            return sorted(keys, key=parse_parameter_size)
+        return sorted(keys)
+
+    def group_by(self, field: str) -> Dict[str, Tuple[ModelRecord, ...]]:
+        """Records per value of an indexed field"""
+        return {
+            key: tuple(self.records[position] for position in positions)
+            for key, positions in self._indexes[field].items()
+        }
+
+    def by_digest(self, digest: str) -> Tuple[ModelRecord, ...]:
+        """Every tag that points at the same blob"""
+        return tuple(self.records[position] for position in self._indexes["digest"].get(digest, ()))
+
+    def newest(self, count: int = 1) -> List[ModelRecord]:
+        """Most recently modified models, newest first (models without a parsed timestamp never count)"""
+        if count <= 0:
+            return []
+        dated = self._by_modified[bisect_right(self._modified_keys, 0):]
+        return [self.records[position] for position in reversed(dated[-count:])]
+
+    def largest(self, count: int = 1) -> List[ModelRecord]:
+        """Largest models on disk, largest first"""
+        return [self.records[position] for position in reversed(self._by_size[-count:])] if count else []
+
+    def modified_between(self, start: float, end: float) -> List[ModelRecord]:
+        """Models modified in [start, end] (Unix timestamps), oldest first"""
+        low = bisect_left(self._modified_keys, start)
+        high = bisect_right(self._modified_keys, end)
+        return [self.records[position] for position in self._by_modified[low:high]]
+
+    def size_between(self, low: int, high: int) -> List[ModelRecord]:
+        """Models with low <= size <= high bytes, smallest first"""
+        first = bisect_left(self._size_keys, low)
+        last = bisect_right(self._size_keys, high)
+        return [self.records[position] for position in self._by_size[first:last]]
+
+    def filter(self, query: str = "", **selections: Sequence[str]) -> List[ModelRecord]:
+        """Records whose name contains query and whose indexed fields match the selections.
+
+        For example filter("llama", family=["llama"], parameter_size=["8B"]).
+        Empty selections match everything; results keep the catalog order.
+        """
+        positions = None
+        for field, selected in selections.items():
+            if not selected:
+                continue
+            index = self._indexes[field]
+            matches = {position for value in selected for position in index.get(value, ())}
+            positions = matches if positions is None else positions & matches
+
+        candidates = range(len(self.records)) if positions is None else sorted(positions)
+        query = query.strip().lower()
+        return [
+            self.records[position] for position in candidates
+            if not query or query in self.records[position].name.lower()
+        ]
@@ -0,0 +1,235 @@
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+
+import streamlit as st
+
+from utils.metrics import (
+    LATENCY_BUCKETS,
+    PHASES,
+    GenerationMetrics,
+    RequestMetrics,
+    get_generation_metrics,
+    get_request_metrics,
+)
+from utils.poller import all_pollers
+from utils.pull_manager import PullManager, get_pull_manager, RUNNING
+
+
+# Port of the Prometheus /metrics endpoint; unset or 0 disables the exporter
+METRICS_PORT = int(os.environ.get("OLLAMA_METRICS_PORT", "0") or 0)
+METRICS_HOST = os.environ.get("OLLAMA_METRICS_HOST", "0.0.0.0")
+
+# Every 5th latency bucket bound (~3x apart) is exported as a histogram "le"
+EXPORTED_BUCKET_STEP = 5
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def _format_value(value: float) -> str:
+    """Integers exactly (byte counts), other values at full precision"""
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class MetricsWriter:
+    """Builds the Prometheus text exposition format"""
+
+    def __init__(self):
+        self.lines: List[str] = []
+
+    def family(self, name: str, kind: str, description: str):
+        self.lines.append(f"# HELP {name} {description}")
+        self.lines.append(f"# TYPE {name} {kind}")
+
+    def sample(self, name: str, value: float, labels: Optional[Dict[str, str]] = None):
+        if labels:
+            label_text = ",".join(f'{key}="{_escape(val)}"' for key, val in labels.items())
+            self.lines.append(f"{name}{{{label_text}}} {_format_value(value)}")
+        else:
+            self.lines.append(f"{name} {_format_value(value)}")
+
+    def text(self) -> str:
+        return "\n".join(self.lines) + "\n"
+
+
+def _write_server_metrics(writer: MetricsWriter):
+    """Installed and resident models from the latest poller snapshots.
+
+    Scrapes read snapshots without touching the pollers, so they never keep
+    a poller (and its calls to Ollama) alive once no page is open on its
+    server; ollama_snapshot_age_seconds then grows until a page is opened.
+    """
+    snapshots = [(poller.api.base_url, poller.snapshot()) for poller in all_pollers()]
+    snapshots = [(server, snapshot) for server, snapshot in snapshots if snapshot.version > 0]
+    now = time.time()
+
+    writer.family("ollama_models_installed", "gauge", "Models installed on the server (/api/tags)")
+    for server, snapshot in snapshots:
+        writer.sample("ollama_models_installed", len(snapshot.models), {"server": server})
+
+    writer.family("ollama_model_size_bytes", "gauge", "Size on disk of each installed model")
+    for server, snapshot in snapshots:
+        for model in snapshot.models:
+            writer.sample("ollama_model_size_bytes", model.get("size", 0),
+                          {"server": server, "model": model.get("name", "")})
+
+    writer.family("ollama_models_resident", "gauge", "Models loaded in memory (/api/ps)")
+    for server, snapshot in snapshots:
+        writer.sample("ollama_models_resident", len(snapshot.running_models), {"server": server})
+
+    writer.family("ollama_model_vram_bytes", "gauge", "VRAM used by each loaded model")
+    for server, snapshot in snapshots:
+        for model in snapshot.running_models:
+            writer.sample("ollama_model_vram_bytes", model.get("size_vram", 0),
+                          {"server": server, "model": model.get("name", "")})
+
+    writer.family("ollama_vram_used_bytes", "gauge", "VRAM used by all loaded models")
+    for server, snapshot in snapshots:
+        writer.sample("ollama_vram_used_bytes",
+                      sum(model.get("size_vram", 0) for model in snapshot.running_models), {"server": server})
+
+    writer.family("ollama_snapshot_age_seconds", "gauge", "Seconds since the server was last polled")
+    for server, snapshot in snapshots:
+        writer.sample("ollama_snapshot_age_seconds", now - snapshot.polled_at, {"server": server})
+
+
+def _write_request_metrics(writer: MetricsWriter, request_metrics: RequestMetrics):
+    """Cumulative request counts and latency histograms per endpoint"""
+    histograms = [(server, endpoint, histogram.cumulative())
+                  for server, endpoint, histogram in request_metrics.histograms()]
+
+    writer.family("ollama_dashboard_requests_total", "counter", "Requests sent to Ollama by the dashboard")
+    for server, endpoint, (requests_total, _, _) in histograms:
+        writer.sample("ollama_dashboard_requests_total", requests_total, {"server": server, "endpoint": endpoint})
+
+    writer.family("ollama_dashboard_request_errors_total", "counter",
+                  "Requests that failed to connect, timed out or returned 5xx")
+    for server, endpoint, (_, errors_total, _) in histograms:
+        writer.sample("ollama_dashboard_request_errors_total", errors_total, {"server": server, "endpoint": endpoint})
+
+    name = "ollama_dashboard_request_duration_seconds"
+    writer.family(name, "histogram",
+                  "Request latency by phase: connect (new connections), ttfb and total")
+    bounds = range(0, len(LATENCY_BUCKETS), EXPORTED_BUCKET_STEP)
+    for server, endpoint, (_, _, phases) in histograms:
+        for phase in PHASES:
+            counts, seconds = phases[phase]
+            labels = {"server": server, "endpoint": endpoint, "phase": phase}
+            cumulative = 0
+            previous = 0
+            for index in bounds:
+                cumulative += sum(counts[previous:index + 1])
+                previous = index + 1
+                writer.sample(f"{name}_bucket", cumulative, {**labels, "le": f"{LATENCY_BUCKETS[index]:.6g}"})
+            total = sum(counts)
+            writer.sample(f"{name}_bucket", total, {**labels, "le": "+Inf"})
+            writer.sample(f"{name}_sum", seconds, labels)
+            writer.sample(f"{name}_count", total, labels)
+
+
+def _write_pull_metrics(writer: MetricsWriter, pull_manager: PullManager):
+    """Pull throughput from the background pull manager"""
+    writer.family("ollama_pull_bytes_total", "counter", "Bytes downloaded by pulls started from the dashboard")
+    writer.sample("ollama_pull_bytes_total", pull_manager.bytes_transferred)
+
+    writer.family("ollama_pulls_finished_total", "counter", "Pulls finished, by outcome")
+    for status, count in pull_manager.finished.items():
+        writer.sample("ollama_pulls_finished_total", count, {"status": status})
+
+    writer.family("ollama_pulls_active", "gauge", "Pulls queued or downloading")
+    writer.sample("ollama_pulls_active", pull_manager.active_count())
+
+    writer.family("ollama_pull_speed_bytes_per_second", "gauge", "Smoothed download speed of running pulls")
+    for job in pull_manager.jobs():
+        if job.status == RUNNING:
+            writer.sample("ollama_pull_speed_bytes_per_second", job.tracker.speed,
+                          {"server": job.base_url, "model": job.model_name})
+
+
+def _write_generation_metrics(writer: MetricsWriter, generation_metrics: GenerationMetrics):
+    """Token counts and durations reported in the final chunk of each generation"""
+    totals = generation_metrics.totals()
+    counters = (
+        ("ollama_generations_total", "generations", "Generations completed from the dashboard"),
+        ("ollama_generation_prompt_tokens_total", "prompt_tokens", "Prompt tokens evaluated"),
+        ("ollama_generation_prompt_seconds_total", "prompt_seconds", "Time spent evaluating prompts"),
+        ("ollama_generation_eval_tokens_total", "eval_tokens", "Tokens generated"),
+        ("ollama_generation_eval_seconds_total", "eval_seconds", "Time spent generating tokens"),
+        ("ollama_generation_load_seconds_total", "load_seconds", "Time spent loading models for generations"),
+    )
+    for name, key, description in counters:
+        writer.family(name, "counter", description)
+        for model, model_totals in totals.items():
+            writer.sample(name, model_totals[key], {"model": model})
+
+    writer.family("ollama_generation_tokens_per_second", "gauge", "Generation speed of the last response")
+    for model, model_totals in totals.items():
+        writer.sample("ollama_generation_tokens_per_second", model_totals["last_tokens_per_second"], {"model": model})
+
+
+class MetricsExporter:
+    """Serve /metrics from a daemon thread.
+
+    A scrape only formats counters that the dashboard already keeps, so it
+    never calls Ollama.
+    """
+
+    def __init__(self, port: int, host: str = METRICS_HOST):
+        self.request_metrics = get_request_metrics()
+        self.generation_metrics = get_generation_metrics()
+        self.pull_manager = get_pull_manager()
+
+        exporter = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?", 1)[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = exporter.render().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer((host, port), Handler)
+        self.server.daemon_threads = True
+        self._thread = threading.Thread(target=self.server.serve_forever, name="ollama-metrics", daemon=True)
+        self._thread.start()
+
+    @property
+    def port(self) -> int:
+        return self.server.server_address[1]
+
+    def render(self) -> str:
+        """Current metrics in the Prometheus text format"""
+        writer = MetricsWriter()
+        _write_server_metrics(writer)
+        _write_request_metrics(writer, self.request_metrics)
+        _write_pull_metrics(writer, self.pull_manager)
+        _write_generation_metrics(writer, self.generation_metrics)
+        return writer.text()
+
+
+@st.cache_resource(show_spinner=False)
+def start_metrics_exporter(port: int = METRICS_PORT) -> Optional[MetricsExporter]:
+    """Start the process-wide /metrics endpoint once, if a port is configured"""
+    if not port:
+        return None
+    try:
+        return MetricsExporter(port)
+    except OSError as e:
+        st.error(f"Could not start metrics exporter on port {port}: {str(e)}")
+        return None
@@ -0,0 +1,225 @@
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+import streamlit as st
+
+from utils.api_handler import OllamaAPI
+
+
+# Hosts configured at startup: "label=http://host:11434,label2=http://host2:11434"
+FLEET_ENV_VAR = "OLLAMA_FLEET"
+
+# Per-request timeout (seconds) used when polling fleet hosts
+FLEET_HOST_TIMEOUT = 2.0
+
+# The page never waits longer than this for the whole fleet
+FLEET_POLL_DEADLINE = 1.0
+
+# Worker threads shared by all fleet polls
+FLEET_POLL_WORKERS = 32
+
+# Endpoints polled on every host, with the JSON field that is kept
+FLEET_ENDPOINTS = {
+    "version": ("/api/version", None),
+    "models": ("/api/tags", "models"),
+    "running": ("/api/ps", "models"),
+}
+
+
+@dataclass(frozen=True)
+class FleetHost:
+    """One Ollama server in the fleet"""
+    label: str
+    base_url: str
+
+
+@dataclass
+class HostSnapshot:
+    """Result of polling one host"""
+    host: FleetHost
+    version: Dict = field(default_factory=dict)
+    models: List[Dict] = field(default_factory=list)
+    running: List[Dict] = field(default_factory=list)
+    errors: Dict[str, str] = field(default_factory=dict)
+    latency: float = 0.0
+    stale: bool = False
+
+    @property
+    def online(self) -> bool:
+        """A host is online if at least one endpoint answered"""
+        return len(self.errors) < len(FLEET_ENDPOINTS)
+
+    @property
+    def vram_bytes(self) -> int:
+        return sum(model.get("size_vram", 0) for model in self.running)
+
+    @property
+    def disk_bytes(self) -> int:
+        return sum(model.get("size", 0) for model in self.models)
+
+
+def parse_hosts(text: str) -> List[FleetHost]:
+    """Parse "label=url" entries separated by commas or newlines.
+
+    Entries without a label use the URL as their label.
+    """
+    hosts = []
+    seen = set()
+    for entry in text.replace(",", "\n").splitlines():
+        entry = entry.strip()
+        if not entry:
+            continue
+        if "=" in entry:
+            label, base_url = (part.strip() for part in entry.split("=", 1))
+        else:
+            label, base_url = entry, entry
+        base_url = base_url.rstrip("/")
+        if base_url and base_url not in seen:
+            seen.add(base_url)
+            hosts.append(FleetHost(label or base_url, base_url))
+    return hosts
+
+
+def format_hosts(hosts: List[FleetHost]) -> str:
+    """Inverse of parse_hosts, one host per line"""
+    return "\n".join(f"{host.label}={host.base_url}" for host in hosts)
+
+
+class FleetRegistry:
+    """Process-wide list of Ollama hosts shared by all sessions"""
+
+    def __init__(self, hosts: Optional[List[FleetHost]] = None):
+        self._hosts: List[FleetHost] = list(hosts or [])
+        self._lock = threading.Lock()
+
+    def hosts(self) -> List[FleetHost]:
+        with self._lock:
+            return list(self._hosts)
+
+    def set_hosts(self, hosts: List[FleetHost]):
+        with self._lock:
+            self._hosts = list(hosts)
+
+
+@st.cache_resource(show_spinner=False)
+def get_fleet_registry() -> FleetRegistry:
+    """Get the fleet registry, seeded from the OLLAMA_FLEET environment variable"""
+    return FleetRegistry(parse_hosts(os.environ.get(FLEET_ENV_VAR, "")))
+
+
+class FleetPoller:
+    """Poll many hosts in parallel without letting slow hosts block the page.
+
+    Every (host, endpoint) fetch runs on a shared thread pool and its last
+    outcome is remembered. poll() waits at most `deadline` seconds, and only
+    for hosts that answered last time: a host that failed before is refreshed
+    in the background while its last error is shown, so a dead host never
+    adds its timeout to the render. A fetch still running from an earlier
+    poll is reused rather than duplicated.
+    """
+
+    def __init__(self, max_workers: int = FLEET_POLL_WORKERS):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="ollama-fleet")
+        self._in_flight: Dict[Tuple[str, str], Future] = {}
+        self._last: Dict[Tuple[str, str], Tuple[Any, Optional[str], float]] = {}
+        self._lock = threading.Lock()
+
+    def _submit(self, host: FleetHost, endpoint: str, result_field: Optional[str],
+                timeout: float) -> Future:
+        key = (host.base_url, endpoint)
+        with self._lock:
+            future = self._in_flight.get(key)
+            if future is None or future.done():
+                api = OllamaAPI(host.base_url)
+                future = self._executor.submit(self._fetch, api, endpoint, result_field, timeout)
+                future.add_done_callback(lambda done, key=key: self._remember(key, done))
+                self._in_flight[key] = future
+            return future
+
+    @staticmethod
+    def _fetch(api: OllamaAPI, endpoint: str, result_field: Optional[str], timeout: float):
+        start = time.perf_counter()
+        data = api.fetch_cached(endpoint, result_field, timeout=(timeout, timeout))
+        return data, time.perf_counter() - start
+
+    @staticmethod
+    def _outcome(future: Future) -> Tuple[Any, Optional[str], float]:
+        """(data, error, latency) of a finished fetch"""
+        error = future.exception()
+        if error is not None:
+            return None, str(error), 0.0
+        data, latency = future.result()
+        return data, None, latency
+
+    def _remember(self, key: Tuple[str, str], future: Future):
+        outcome = self._outcome(future)
+        with self._lock:
+            self._last[key] = outcome
+
+    def poll(self, hosts: List[FleetHost], timeout: float = FLEET_HOST_TIMEOUT,
+             deadline: float = FLEET_POLL_DEADLINE) -> List[HostSnapshot]:
+        """Fetch version, models and running models from every host concurrently"""
+        futures = {}
+        for host in hosts:
+            for name, (endpoint, result_field) in FLEET_ENDPOINTS.items():
+                futures[(host, name)] = self._submit(host, endpoint, result_field, timeout)
+
+        with self._lock:
+            last = dict(self._last)
+
+        # Only wait for fetches that are expected to succeed
+        blocking = []
+        for (host, name), future in futures.items():
+            previous = last.get((host.base_url, FLEET_ENDPOINTS[name][0]))
+            if previous is None or previous[1] is None:
+                blocking.append(future)
+        wait(blocking, timeout=deadline)
+
+        snapshots = []
+        for host in hosts:
+            snapshot = HostSnapshot(host)
+            for name, (endpoint, _) in FLEET_ENDPOINTS.items():
+                future = futures[(host, name)]
+                if future.done():
+                    data, error, latency = self._outcome(future)
+                elif (host.base_url, endpoint) in last:
+                    data, error, latency = last[(host.base_url, endpoint)]
+                    snapshot.stale = True
+                else:
+                    data, error, latency = None, "Timed out", 0.0
+
+                if error is not None:
+                    snapshot.errors[name] = error
+                    continue
+                setattr(snapshot, name, data)
+                snapshot.latency = max(snapshot.latency, latency)
+            snapshots.append(snapshot)
+        return snapshots
+
+
+@st.cache_resource(show_spinner=False)
+def get_fleet_poller() -> FleetPoller:
+    """Get the process-wide fleet poller"""
+    return FleetPoller()
+
+
+def aggregate_fleet(snapshots: List[HostSnapshot]) -> Dict:
+    """Summarize the fleet: host counts, model inventory and VRAM use"""
+    online = [snapshot for snapshot in snapshots if snapshot.online]
+    model_names = set()
+    for snapshot in online:
+        model_names.update(model.get("name", "") for model in snapshot.models)
+
+    return {
+        "hosts": len(snapshots),
+        "online": len(online),
+        "unique_models": len(model_names),
+        "installed_models": sum(len(snapshot.models) for snapshot in online),
+        "running_models": sum(len(snapshot.running) for snapshot in online),
+        "disk_bytes": sum(snapshot.disk_bytes for snapshot in online),
+        "vram_bytes": sum(snapshot.vram_bytes for snapshot in online),
+    }
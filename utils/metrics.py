@@ -0,0 +1,302 @@
+import math
+import os
+import threading
+import time
+from array import array
+from bisect import bisect_left
+from collections import deque
+from typing import Deque, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import streamlit as st
+
+
+# Upper bounds (seconds) of the latency buckets: 1 ms to 10 min, 25% apart.
+# Percentiles are reported as the upper bound of their bucket.
+LATENCY_BUCKET_GROWTH = 1.25
+LATENCY_BUCKETS = [0.001 * LATENCY_BUCKET_GROWTH ** i
+                   for i in range(math.ceil(math.log(600 / 0.001, LATENCY_BUCKET_GROWTH)) + 1)]
+
+# Request phases that are timed separately
+PHASES = ("connect", "ttfb", "total")
+
+# Histories are kept in fixed time slots covering the longest window
+SLOT_SECONDS = 15
+HISTORY_SECONDS = 3600
+
+# Sliding windows offered by the Server Health section
+WINDOWS = {"1m": 60, "15m": 15 * 60, "1h": 60 * 60}
+
+# Quick control endpoints whose latency reflects the API's health
+# (generation and pull latency mostly measures model work, not the API)
+HEALTH_ENDPOINTS = ("/api/version", "/api/tags", "/api/ps", "/api/show")
+
+# Total VRAM of the server, used to turn /api/ps size_vram into a percentage
+VRAM_CAPACITY_BYTES = int(float(os.environ.get("OLLAMA_VRAM_CAPACITY_GB", "0")) * 1024 ** 3)
+
+# Recent generations kept per model for rolling means and percentiles
+GENERATION_SAMPLE_WINDOW = 100
+
+# Per-generation values summarized per model
+GENERATION_FIELDS = ("ttft", "tokens_per_second", "prompt_tokens_per_second", "load_seconds", "total_seconds")
+
+
+class LatencyHistogram:
+    """Sliding-window latency histograms for one endpoint.
+
+    Each phase has a flat array of bucket counts per time slot; a slot is
+    zeroed when the ring wraps around to it, so memory is fixed regardless
+    of uptime or request rate. Cumulative counts since startup are kept
+    alongside for the Prometheus exporter.
+    """
+
+    def __init__(self, slot_seconds: int = SLOT_SECONDS, history_seconds: int = HISTORY_SECONDS):
+        self.slot_seconds = slot_seconds
+        self.num_slots = math.ceil(history_seconds / slot_seconds)
+        self.num_buckets = len(LATENCY_BUCKETS) + 1  # last bucket collects overflow
+
+        self._counts = {phase: array("I", [0]) * (self.num_slots * self.num_buckets) for phase in PHASES}
+        self._requests = array("I", [0]) * self.num_slots
+        self._errors = array("I", [0]) * self.num_slots
+        self._epochs = array("q", [-1]) * self.num_slots
+        self._lock = threading.Lock()
+
+        self._cumulative = {phase: array("Q", [0]) * self.num_buckets for phase in PHASES}
+        self._cumulative_sums = dict.fromkeys(PHASES, 0.0)
+        self.requests_total = 0
+        self.errors_total = 0
+
+    def _slot(self, now: float) -> int:
+        """Index of the slot for now, clearing it if it holds an old period"""
+        epoch = int(now // self.slot_seconds)
+        slot = epoch % self.num_slots
+        if self._epochs[slot] != epoch:
+            self._epochs[slot] = epoch
+            self._requests[slot] = 0
+            self._errors[slot] = 0
+            start = slot * self.num_buckets
+            for counts in self._counts.values():
+                counts[start:start + self.num_buckets] = array("I", [0]) * self.num_buckets
+        return slot
+
+    def record(self, connect: Optional[float], ttfb: Optional[float], total: float,
+               error: bool = False, now: Optional[float] = None):
+        """Record one request. connect is None when a pooled connection was reused."""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            slot = self._slot(now)
+            self._requests[slot] += 1
+            self.requests_total += 1
+            if error:
+                self._errors[slot] += 1
+                self.errors_total += 1
+            for phase, seconds in (("connect", connect), ("ttfb", ttfb), ("total", total)):
+                if seconds is not None:
+                    bucket = bisect_left(LATENCY_BUCKETS, seconds)
+                    self._counts[phase][slot * self.num_buckets + bucket] += 1
+                    self._cumulative[phase][bucket] += 1
+                    self._cumulative_sums[phase] += seconds
+
+    def cumulative(self) -> Tuple[int, int, Dict[str, Tuple[List[int], float]]]:
+        """Requests, errors and per-phase (bucket counts, sum of seconds) since startup"""
+        with self._lock:
+            phases = {phase: (list(self._cumulative[phase]), self._cumulative_sums[phase]) for phase in PHASES}
+            return self.requests_total, self.errors_total, phases
+
+    def window_counts(self, window: float, now: Optional[float] = None) -> Tuple[int, int, Dict[str, List[int]]]:
+        """Requests, errors and per-phase bucket counts over the last window seconds"""
+        now = time.monotonic() if now is None else now
+        oldest_epoch = int(now // self.slot_seconds) - math.ceil(window / self.slot_seconds) + 1
+        requests_total = 0
+        errors_total = 0
+        buckets = {phase: [0] * self.num_buckets for phase in PHASES}
+
+        with self._lock:
+            for slot in range(self.num_slots):
+                if self._epochs[slot] < oldest_epoch or not self._requests[slot]:
+                    continue
+                requests_total += self._requests[slot]
+                errors_total += self._errors[slot]
+                start = slot * self.num_buckets
+                for phase, counts in self._counts.items():
+                    buckets[phase] = [a + b for a, b in zip(buckets[phase], counts[start:start + self.num_buckets])]
+        return requests_total, errors_total, buckets
+
+
+def percentile(buckets: List[int], quantile: float) -> Optional[float]:
+    """Approximate a quantile (0..1) from bucket counts, or None without samples"""
+    samples = sum(buckets)
+    if not samples:
+        return None
+    rank = quantile * samples
+    cumulative = 0
+    for bucket, count in enumerate(buckets):
+        cumulative += count
+        if cumulative >= rank:
+            return LATENCY_BUCKETS[min(bucket, len(LATENCY_BUCKETS) - 1)]
+    return LATENCY_BUCKETS[-1]
+
+
+def summarize(counts: Iterable[Tuple[int, int, Dict[str, List[int]]]]) -> Dict:
+    """Merge window counts and compute error rate and p50/p95/p99 per phase"""
+    requests_total = 0
+    errors_total = 0
+    merged = {phase: [0] * (len(LATENCY_BUCKETS) + 1) for phase in PHASES}
+    for requests_count, errors_count, buckets in counts:
+        requests_total += requests_count
+        errors_total += errors_count
+        for phase in PHASES:
+            merged[phase] = [a + b for a, b in zip(merged[phase], buckets[phase])]
+
+    summary = {
+        "requests": requests_total,
+        "errors": errors_total,
+        "error_rate": errors_total / requests_total if requests_total else 0.0,
+    }
+    for phase in PHASES:
+        summary[phase] = {
+            "samples": sum(merged[phase]),
+            "p50": percentile(merged[phase], 0.50),
+            "p95": percentile(merged[phase], 0.95),
+            "p99": percentile(merged[phase], 0.99),
+        }
+    return summary
+
+
+class RequestMetrics:
+    """Latency histograms for every (server, endpoint) pair, shared by all sessions"""
+
+    def __init__(self):
+        self._histograms: Dict[Tuple[str, str], LatencyHistogram] = {}
+        self._lock = threading.Lock()
+
+    def _histogram(self, base_url: str, endpoint: str) -> LatencyHistogram:
+        key = (base_url, endpoint)
+        histogram = self._histograms.get(key)
+        if histogram is None:
+            with self._lock:
+                histogram = self._histograms.setdefault(key, LatencyHistogram())
+        return histogram
+
+    def record(self, base_url: str, endpoint: str, connect: Optional[float], ttfb: Optional[float],
+               total: float, error: bool = False):
+        self._histogram(base_url, endpoint).record(connect, ttfb, total, error)
+
+    def histograms(self) -> List[Tuple[str, str, LatencyHistogram]]:
+        """(base_url, endpoint, histogram) for every pair seen so far"""
+        with self._lock:
+            return [(base_url, endpoint, histogram) for (base_url, endpoint), histogram in self._histograms.items()]
+
+    def endpoints(self, base_url: str) -> List[str]:
+        with self._lock:
+            return sorted(endpoint for url, endpoint in self._histograms if url == base_url)
+
+    def summary(self, base_url: str, window: float, endpoints: Optional[Iterable[str]] = None) -> Dict:
+        """Combined summary over the given endpoints (default: all seen for the server)"""
+        endpoints = self.endpoints(base_url) if endpoints is None else endpoints
+        now = time.monotonic()
+        with self._lock:
+            histograms = [self._histograms[(base_url, endpoint)] for endpoint in endpoints
+                          if (base_url, endpoint) in self._histograms]
+        return summarize(histogram.window_counts(window, now) for histogram in histograms)
+
+
+@st.cache_resource(show_spinner=False)
+def get_request_metrics() -> RequestMetrics:
+    """Get the process-wide request metrics"""
+    return RequestMetrics()
+
+
+def generation_sample(stats, ttft: Optional[float] = None) -> Dict[str, Optional[float]]:
+    """Performance numbers of one generation from its FinalStats.
+
+    ttft is the time to first token measured by the client (streaming only);
+    the rest comes from the durations the server reports in nanoseconds.
+    """
+    prompt_seconds = stats.prompt_eval_duration / 1e9
+    return {
+        "ttft": ttft,
+        "tokens_per_second": stats.tokens_per_second or None,
+        "prompt_tokens_per_second": stats.prompt_eval_count / prompt_seconds if prompt_seconds > 0 else None,
+        "load_seconds": stats.load_duration / 1e9,
+        "total_seconds": stats.total_duration / 1e9,
+        "prompt_eval_count": stats.prompt_eval_count,
+        "eval_count": stats.eval_count,
+    }
+
+
+class GenerationMetrics:
+    """Per-model generation performance from the final chunk of /api/generate and /api/chat.
+
+    Keeps running totals since startup (for the exporter) and the last
+    GENERATION_SAMPLE_WINDOW samples per model for rolling statistics.
+    """
+
+    def __init__(self, window: int = GENERATION_SAMPLE_WINDOW):
+        self.window = window
+        self._totals: Dict[str, Dict[str, float]] = {}
+        self._samples: Dict[str, Deque[Dict[str, Optional[float]]]] = {}
+        self._last_used: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def record(self, model_name: str, stats, ttft: Optional[float] = None) -> Dict[str, Optional[float]]:
+        """Add one generation's FinalStats and return its performance sample"""
+        sample = generation_sample(stats, ttft)
+        with self._lock:
+            totals = self._totals.setdefault(model_name, {
+                "generations": 0,
+                "prompt_tokens": 0,
+                "prompt_seconds": 0.0,
+                "eval_tokens": 0,
+                "eval_seconds": 0.0,
+                "load_seconds": 0.0,
+                "total_seconds": 0.0,
+                "last_tokens_per_second": 0.0,
+            })
+            totals["generations"] += 1
+            totals["prompt_tokens"] += stats.prompt_eval_count
+            totals["prompt_seconds"] += stats.prompt_eval_duration / 1e9
+            totals["eval_tokens"] += stats.eval_count
+            totals["eval_seconds"] += stats.eval_duration / 1e9
+            totals["load_seconds"] += stats.load_duration / 1e9
+            totals["total_seconds"] += stats.total_duration / 1e9
+            if stats.tokens_per_second:
+                totals["last_tokens_per_second"] = stats.tokens_per_second
+
+            self._samples.setdefault(model_name, deque(maxlen=self.window)).append(sample)
+            self._last_used[model_name] = time.time()
+        return sample
+
+    def last_used(self) -> Dict[str, float]:
+        """When each model last finished a generation (Unix time)"""
+        with self._lock:
+            return dict(self._last_used)
+
+    def totals(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            return {model: dict(totals) for model, totals in self._totals.items()}
+
+    def summary(self) -> Dict[str, Dict]:
+        """Per model: generations since startup, and mean/p50/p95 of each field over the window"""
+        with self._lock:
+            samples = {model: list(recent) for model, recent in self._samples.items()}
+            generations = {model: totals["generations"] for model, totals in self._totals.items()}
+
+        summary = {}
+        for model, recent in samples.items():
+            model_summary = {"generations": generations.get(model, 0), "window": len(recent)}
+            for field in GENERATION_FIELDS:
+                values = np.array([sample[field] for sample in recent if sample[field] is not None], dtype=float)
+                if values.size:
+                    p50, p95 = np.percentile(values, [50, 95])
+                    model_summary[field] = {"mean": float(values.mean()), "p50": float(p50), "p95": float(p95)}
+                else:
+                    model_summary[field] = None
+            summary[model] = model_summary
+        return summary
+
+
+@st.cache_resource(show_spinner=False)
+def get_generation_metrics() -> GenerationMetrics:
+    """Get the process-wide generation metrics"""
+    return GenerationMetrics()
@@ -0,0 +1,176 @@
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Tuple
+
+import requests
+import streamlit as st
+
+from utils.api_handler import OllamaAPI
+from utils.catalog import ModelCatalog
+from utils.vram_history import VRAMHistory
+
+
+# Seconds between polls of /api/ps and /api/tags
+POLL_INTERVAL = float(os.environ.get("OLLAMA_POLL_INTERVAL", "5"))
+
+# Stop polling when no page has read a snapshot for this many seconds
+POLLER_IDLE_TIMEOUT = 60.0
+
+# Longest a page waits for a fresh snapshot (first poll, resume, refresh)
+SNAPSHOT_WAIT_TIMEOUT = 5.0
+
+
+# Every poller created in this process, for the metrics exporter
+_pollers: Dict[str, "ServerPoller"] = {}
+_pollers_lock = threading.Lock()
+
+
+@dataclass(frozen=True)
+class ServerSnapshot:
+    """Immutable view of one server's running and installed models.
+
+    version increases only when the content changes, so pages can compare
+    it with the version they last rendered instead of re-rendering on a timer.
+    models_version increases only when the installed models change, and
+    catalog indexes the installed models once per such change.
+    """
+    version: int = 0
+    models_version: int = 0
+    polled_at: float = 0.0
+    running_models: Tuple[Dict, ...] = ()
+    models: Tuple[Dict, ...] = ()
+    errors: Dict[str, str] = field(default_factory=dict)
+    catalog: ModelCatalog = field(default_factory=ModelCatalog)
+
+
+class ServerPoller:
+    """One daemon thread per server that polls /api/ps and /api/tags.
+
+    Every session viewing the server reads the same published snapshot, so
+    N open tabs cost one poll per interval instead of N full script reruns.
+    The thread sleeps while nobody is reading snapshots. Every successful
+    /api/ps poll is also added to the server's VRAM history.
+    """
+
+    def __init__(self, base_url: str, interval: float = POLL_INTERVAL):
+        self.api = OllamaAPI(base_url)
+        self.interval = interval
+        self.history = VRAMHistory()
+        self._snapshot = ServerSnapshot()
+        self._polls = 0
+        self._polling = False
+        self._forced = False
+        self._last_read = time.monotonic()
+        self._condition = threading.Condition()
+        self._wake = threading.Event()
+        self._thread = threading.Thread(target=self._loop, name=f"ollama-poller-{base_url}", daemon=True)
+        self._thread.start()
+
+    def latest(self) -> ServerSnapshot:
+        """Get the newest snapshot, waiting for a poll if there is no recent one"""
+        with self._condition:
+            was_idle = time.monotonic() - self._last_read > POLLER_IDLE_TIMEOUT
+            self._last_read = time.monotonic()
+            snapshot = self._snapshot
+            fresh = self._polls > 0 and time.time() - snapshot.polled_at < 2 * self.interval
+
+        if was_idle or not fresh:
+            return self.refresh(wait=SNAPSHOT_WAIT_TIMEOUT)
+        return snapshot
+
+    def peek(self) -> ServerSnapshot:
+        """Get the current snapshot without waiting, keeping the poller active"""
+        with self._condition:
+            was_idle = time.monotonic() - self._last_read > POLLER_IDLE_TIMEOUT
+            self._last_read = time.monotonic()
+            snapshot = self._snapshot
+        if was_idle:
+            self._wake.set()
+        return snapshot
+
+    def snapshot(self) -> ServerSnapshot:
+        """Get the current snapshot with no side effects: it neither wakes nor keeps the poller active"""
+        with self._condition:
+            return self._snapshot
+
+    def refresh(self, wait: float = 0.0) -> ServerSnapshot:
+        """Poll now instead of at the next interval, optionally waiting for the result.
+
+        This polls even while the poller is idle, but does not keep it
+        active, so background callers get fresh data without keeping the
+        thread polling once nobody is viewing the server.
+        """
+        with self._condition:
+            # A poll already running may have read data from before the caller's change
+            target = self._polls + (2 if self._polling else 1)
+            self._forced = True
+        self._wake.set()
+
+        with self._condition:
+            if wait:
+                self._condition.wait_for(lambda: self._polls >= target, timeout=wait)
+            return self._snapshot
+
+    def _loop(self):
+        while True:
+            with self._condition:
+                forced, self._forced = self._forced, False
+            active = time.monotonic() - self._last_read <= POLLER_IDLE_TIMEOUT
+            if active or forced:
+                self._poll_once()
+            # Nobody is watching: sleep until a page or refresh() asks for data
+            self._wake.wait(self.interval if active else None)
+            self._wake.clear()
+
+    def _poll_once(self):
+        with self._condition:
+            self._polling = True
+            previous = self._snapshot
+
+        running_models, models = previous.running_models, previous.models
+        errors = {}
+        try:
+            running_models = tuple(self.api.fetch_cached("/api/ps", "models"))
+        except requests.exceptions.RequestException as e:
+            errors["running_models"] = str(e)
+        try:
+            models = tuple(self.api.fetch_cached("/api/tags", "models"))
+        except requests.exceptions.RequestException as e:
+            errors["models"] = str(e)
+
+        changed = (
+            previous.version == 0
+            or running_models != previous.running_models
+            or models != previous.models
+            or errors != previous.errors
+        )
+        version = previous.version + 1 if changed else previous.version
+        models_changed = previous.version == 0 or models != previous.models
+        models_version = previous.models_version + 1 if models_changed else previous.models_version
+        catalog = ModelCatalog(models) if models_changed else previous.catalog
+        snapshot = ServerSnapshot(version, models_version, time.time(), running_models, models, errors, catalog)
+        if "running_models" not in errors:
+            self.history.record(snapshot.polled_at, running_models)
+
+        with self._condition:
+            self._snapshot = snapshot
+            self._polls += 1
+            self._polling = False
+            self._condition.notify_all()
+
+
+@st.cache_resource(show_spinner=False)
+def get_server_poller(base_url: str) -> ServerPoller:
+    """Get the process-wide poller for a server, shared by all sessions"""
+    poller = ServerPoller(base_url.rstrip("/"))
+    with _pollers_lock:
+        _pollers[poller.api.base_url] = poller
+    return poller
+
+
+def all_pollers() -> List[ServerPoller]:
+    """Pollers of every server the dashboard has shown so far"""
+    with _pollers_lock:
+        return list(_pollers.values())
@@ -0,0 +1,125 @@
+import cProfile
+import functools
+import os
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Deque, List, Optional
+
+import streamlit as st
+
+
+# Script runs kept per session for the debug panel
+PROFILE_HISTORY = 20
+
+# When set, every script run is also profiled with cProfile and dumped here
+PROFILE_DIR = os.environ.get("OLLAMA_PROFILE_DIR", "")
+
+
+@dataclass
+class Span:
+    """One timed section of a script run; start is relative to the run start"""
+    name: str
+    category: str
+    start: float
+    duration: float
+    depth: int
+
+
+@dataclass
+class RunProfile:
+    """Timed sections of one script run"""
+    started_at: float
+    page: str = ""
+    duration: float = 0.0
+    spans: List[Span] = field(default_factory=list)
+    profile_path: str = ""
+
+
+# Streamlit runs each session's script on its own thread
+_current = threading.local()
+
+
+def start_run():
+    """Begin profiling the current script run"""
+    _current.run = RunProfile(time.time())
+    _current.origin = time.perf_counter()
+    _current.depth = 0
+    _current.profiler = None
+    if PROFILE_DIR:
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+            _current.profiler = profiler
+        except ValueError:
+            # Another session's run is being profiled right now
+            pass
+
+
+def finish_run(page: str = ""):
+    """End the current script run and add it to the session's history"""
+    run: Optional[RunProfile] = getattr(_current, "run", None)
+    if run is None:
+        return
+    _current.run = None
+    run.page = page
+    run.duration = time.perf_counter() - _current.origin
+
+    profiler = _current.profiler
+    if profiler is not None:
+        profiler.disable()
+        os.makedirs(PROFILE_DIR, exist_ok=True)
+        stamp = time.strftime("%Y%m%d-%H%M%S", time.localtime(run.started_at))
+        slug = page.lower().replace(" ", "-") or "run"
+        run.profile_path = os.path.join(PROFILE_DIR, f"{stamp}-{int(run.started_at * 1000) % 1000:03d}-{slug}.prof")
+        profiler.dump_stats(run.profile_path)
+
+    get_run_history().append(run)
+
+
+def get_run_history() -> Deque[RunProfile]:
+    """Completed script runs of this session, oldest first"""
+    if "profile_runs" not in st.session_state:
+        st.session_state.profile_runs = deque(maxlen=PROFILE_HISTORY)
+    return st.session_state.profile_runs
+
+
+class timed:
+    """Record the wall time of a section in the current script run.
+
+    Outside a profiled run (fragment reruns, background threads) it does
+    nothing.
+    """
+
+    def __init__(self, name: str, category: str = "app"):
+        self.name = name
+        self.category = category
+        self.run = None
+
+    def __enter__(self):
+        self.run = getattr(_current, "run", None)
+        if self.run is not None:
+            self.depth = _current.depth
+            _current.depth += 1
+            self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        if self.run is not None:
+            end = time.perf_counter()
+            _current.depth = self.depth
+            self.run.spans.append(Span(self.name, self.category, self.start - _current.origin,
+                                       end - self.start, self.depth))
+        return False
+
+
+def profiled(category: str = "render"):
+    """Decorator form of timed(), named after the function"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with timed(func.__name__, category):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,204 @@
+import os
+import queue
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+import streamlit as st
+
+from utils.api_handler import OllamaAPI
+from utils.pull_progress import PullProgressTracker
+from utils.stream_decoder import iter_events, PullProgress, StreamError
+
+
+# Number of pulls that may download at the same time (the rest wait queued)
+MAX_CONCURRENT_PULLS = int(os.environ.get("OLLAMA_MAX_CONCURRENT_PULLS", "3"))
+
+# Progress events kept per job for consumers of the queue
+PROGRESS_QUEUE_SIZE = 500
+
+# Job states
+QUEUED = "queued"
+RUNNING = "running"
+COMPLETED = "completed"
+FAILED = "failed"
+CANCELLED = "cancelled"
+ACTIVE_STATES = (QUEUED, RUNNING)
+
+
+@dataclass
+class PullJob:
+    """A model pull running independently of any browser session"""
+    job_id: str
+    base_url: str
+    model_name: str
+    status: str = QUEUED
+    message: str = "Waiting for a free download slot"
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    tracker: PullProgressTracker = field(default_factory=PullProgressTracker, repr=False)
+    progress: "queue.Queue[PullProgress]" = field(
+        default_factory=lambda: queue.Queue(maxsize=PROGRESS_QUEUE_SIZE), repr=False
+    )
+    cancel_requested: threading.Event = field(default_factory=threading.Event, repr=False)
+
+    @property
+    def is_active(self) -> bool:
+        return self.status in ACTIVE_STATES
+
+    @property
+    def completed(self) -> int:
+        """Bytes on disk across all layers seen so far"""
+        return self.tracker.completed_bytes
+
+    @property
+    def total(self) -> int:
+        """Size of all layers seen so far"""
+        return self.tracker.total_bytes
+
+    @property
+    def fraction(self) -> float:
+        """Completion across all layers seen so far (0..1)"""
+        if self.status == COMPLETED:
+            return 1.0
+        return self.tracker.fraction
+
+    @property
+    def elapsed(self) -> float:
+        """Seconds since the download started (or 0 while queued)"""
+        if self.started_at is None:
+            return 0.0
+        return (self.finished_at or time.time()) - self.started_at
+
+    def publish(self, event: PullProgress):
+        """Put an event on the progress queue, dropping the oldest if it is full"""
+        while True:
+            try:
+                self.progress.put_nowait(event)
+                return
+            except queue.Full:
+                try:
+                    self.progress.get_nowait()
+                except queue.Empty:
+                    pass
+
+
+class PullManager:
+    """Process-wide pull job manager backed by a bounded thread pool.
+
+    Jobs keep running when the page that started them reruns or is closed,
+    so any session can watch the progress of every pull.
+    """
+
+    def __init__(self, max_workers: int = MAX_CONCURRENT_PULLS):
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="ollama-pull")
+        self._jobs: Dict[str, PullJob] = {}
+        self._lock = threading.Lock()
+
+        # Totals since startup (kept when finished jobs are cleared)
+        self.bytes_transferred = 0
+        self.finished = dict.fromkeys((COMPLETED, FAILED, CANCELLED), 0)
+
+    def submit(self, base_url: str, model_name: str) -> PullJob:
+        """Queue a pull, reusing an active job for the same model and server"""
+        with self._lock:
+            for job in self._jobs.values():
+                if job.is_active and job.base_url == base_url and job.model_name == model_name:
+                    return job
+
+            job = PullJob(job_id=uuid.uuid4().hex[:8], base_url=base_url, model_name=model_name)
+            self._jobs[job.job_id] = job
+
+        self._executor.submit(self._run, job)
+        return job
+
+    def cancel(self, job_id: str) -> bool:
+        """Ask a queued or running job to stop"""
+        job = self._jobs.get(job_id)
+        if job is None or not job.is_active:
+            return False
+        job.cancel_requested.set()
+        return True
+
+    def jobs(self) -> List[PullJob]:
+        """All known jobs, newest first"""
+        with self._lock:
+            return sorted(self._jobs.values(), key=lambda job: job.created_at, reverse=True)
+
+    def active_count(self) -> int:
+        with self._lock:
+            return sum(1 for job in self._jobs.values() if job.is_active)
+
+    def clear_finished(self):
+        """Forget completed, failed and cancelled jobs"""
+        with self._lock:
+            self._jobs = {job_id: job for job_id, job in self._jobs.items() if job.is_active}
+
+    def _run(self, job: PullJob):
+        """Worker: stream /api/pull and record progress on the job"""
+        if job.cancel_requested.is_set():
+            self._finish(job, CANCELLED, "Cancelled before starting")
+            return
+
+        job.status = RUNNING
+        job.started_at = time.time()
+        job.message = "Starting download"
+
+        api = OllamaAPI(job.base_url)
+        last_status = ""
+        try:
+            response = api.pull_model(job.model_name, stream=True, report_errors=False)
+            if isinstance(response, dict):
+                self._finish(job, FAILED, response.get("error", "Unknown error"))
+                return
+
+            for event in iter_events(response):
+                if job.cancel_requested.is_set():
+                    response.close()
+                    self._finish(job, CANCELLED, "Cancelled")
+                    return
+
+                if isinstance(event, StreamError):
+                    self._finish(job, FAILED, event.message)
+                    return
+                if not isinstance(event, PullProgress):
+                    continue
+
+                last_status = event.status
+                job.message = event.status
+                transferred = job.tracker.transferred
+                job.tracker.update(event)
+                with self._lock:
+                    self.bytes_transferred += job.tracker.transferred - transferred
+                job.publish(event)
+
+            if last_status == "success":
+                # Before the job reports completion, so pages that react to it list the new model
+                api.invalidate_model_cache(job.model_name)
+                average_mb = job.tracker.average_speed / (1024 * 1024)
+                self._finish(job, COMPLETED, f"Pulled successfully (average {average_mb:.2f} MB/s)")
+            else:
+                self._finish(job, FAILED, f"Stream ended unexpectedly (last status: {last_status or 'none'})")
+        except Exception as e:
+            self._finish(job, FAILED, str(e))
+        finally:
+            # The model list changed (or may have partially changed)
+            api.invalidate_model_cache(job.model_name)
+
+    def _finish(self, job: PullJob, status: str, message: str):
+        job.status = status
+        job.message = message
+        job.finished_at = time.time()
+        with self._lock:
+            self.finished[status] += 1
+
+
+@st.cache_resource(show_spinner=False)
+def get_pull_manager() -> PullManager:
+    """Get the process-wide pull manager shared by all sessions"""
+    return PullManager()
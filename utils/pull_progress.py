@@ -0,0 +1,157 @@
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from utils.stream_decoder import PullProgress
+
+
+# Weight of the newest throughput sample in the moving average
+EWMA_ALPHA = 0.3
+
+# Minimum seconds between throughput samples (shorter gaps are accumulated)
+MIN_SAMPLE_INTERVAL = 0.5
+
+
+@dataclass(slots=True)
+class LayerProgress:
+    """Download state of one blob (digest) of a model"""
+    digest: str
+    total: int = 0
+    completed: int = 0
+    resumed_from: int = 0
+
+    @property
+    def fraction(self) -> float:
+        if self.total <= 0:
+            return 0.0
+        return min(self.completed / self.total, 1.0)
+
+    @property
+    def done(self) -> bool:
+        return self.total > 0 and self.completed >= self.total
+
+
+class PullProgressTracker:
+    """Aggregate /api/pull progress across all layers of a model.
+
+    Ollama reports completed/total for one digest at a time, so a progress
+    bar fed directly from the stream jumps back to zero on every layer. This
+    keeps per-digest state and derives totals, an EWMA-smoothed throughput
+    and an ETA from it.
+
+    Bytes that were already on disk when a digest is first seen (Ollama
+    resuming a partial blob) and progress that moves backwards after a
+    reconnect are not counted as transferred, so the speed stays honest
+    when one tracker is fed by several streams for the same model.
+    """
+
+    def __init__(self, alpha: float = EWMA_ALPHA, min_sample_interval: float = MIN_SAMPLE_INTERVAL):
+        self.alpha = alpha
+        self.min_sample_interval = min_sample_interval
+
+        self.layers: Dict[str, LayerProgress] = {}
+        self.status = ""
+        self.transferred = 0
+        self.speed = 0.0
+
+        self._first_transfer_at: Optional[float] = None
+        self._last_transfer_at: Optional[float] = None
+        self._sample_started_at: Optional[float] = None
+        self._sample_bytes = 0
+
+    def update(self, event: PullProgress, now: Optional[float] = None):
+        """Record one progress event"""
+        now = time.monotonic() if now is None else now
+        self.status = event.status
+
+        if not event.digest or not event.total:
+            return
+
+        layer = self.layers.get(event.digest)
+        if layer is None:
+            # Bytes already present on disk are a resume, not new traffic
+            layer = LayerProgress(event.digest, event.total, event.completed, event.completed)
+            self.layers[event.digest] = layer
+            return
+
+        layer.total = event.total
+        delta = event.completed - layer.completed
+        layer.completed = event.completed
+
+        # Progress going backwards means the blob restarted after a reconnect
+        if delta > 0:
+            self._record_transfer(delta, now)
+
+    def _record_transfer(self, size: int, now: float):
+        self.transferred += size
+        if self._first_transfer_at is None:
+            self._first_transfer_at = now
+        self._last_transfer_at = now
+
+        if self._sample_started_at is None:
+            self._sample_started_at = now
+            self._sample_bytes = size
+            return
+
+        self._sample_bytes += size
+        elapsed = now - self._sample_started_at
+        if elapsed >= self.min_sample_interval:
+            sample_speed = self._sample_bytes / elapsed
+            if self.speed <= 0:
+                self.speed = sample_speed
+            else:
+                self.speed = self.alpha * sample_speed + (1 - self.alpha) * self.speed
+            self._sample_started_at = now
+            self._sample_bytes = 0
+
+    def _layers(self) -> List[LayerProgress]:
+        """Copy of the layer list (the pull thread may add layers while we read)"""
+        return list(self.layers.values())
+
+    @property
+    def total_bytes(self) -> int:
+        """Size of all layers announced so far"""
+        return sum(layer.total for layer in self._layers())
+
+    @property
+    def completed_bytes(self) -> int:
+        """Bytes on disk across all layers announced so far"""
+        return sum(layer.completed for layer in self._layers())
+
+    @property
+    def fraction(self) -> float:
+        total = self.total_bytes
+        if total <= 0:
+            return 0.0
+        return min(self.completed_bytes / total, 1.0)
+
+    @property
+    def eta(self) -> Optional[float]:
+        """Seconds until the announced layers are complete, if the speed is known"""
+        if self.speed <= 0:
+            return None
+        return max(self.total_bytes - self.completed_bytes, 0) / self.speed
+
+    @property
+    def average_speed(self) -> float:
+        """Bytes per second over the whole transfer"""
+        if self._first_transfer_at is None or self._last_transfer_at == self._first_transfer_at:
+            return 0.0
+        return self.transferred / (self._last_transfer_at - self._first_transfer_at)
+
+    @property
+    def layers_done(self) -> int:
+        return sum(1 for layer in self._layers() if layer.done)
+
+    def layer_summary(self) -> List[Dict]:
+        """Per-layer completion, in the order the layers were announced"""
+        return [
+            {
+                "digest": layer.digest,
+                "total": layer.total,
+                "completed": layer.completed,
+                "resumed_from": layer.resumed_from,
+                "fraction": layer.fraction,
+            }
+            for layer in self._layers()
+        ]
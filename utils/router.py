@@ -0,0 +1,262 @@
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Union
+
+import requests
+import streamlit as st
+
+from utils.api_handler import OllamaAPI, _normalize_model_name
+from utils.fleet import FleetHost, get_fleet_poller, get_fleet_registry
+
+
+# Weight of the newest time-to-first-token sample in the moving average
+TTFT_EWMA_ALPHA = 0.3
+
+# TTFT (seconds) assumed for a backend that has not served a request yet
+DEFAULT_TTFT = 1.0
+
+# Extra seconds charged to a backend that would have to load the model first
+COLD_LOAD_PENALTY = 10.0
+
+# Seconds a backend that refused a connection is tried last
+FAILURE_COOLDOWN = 30.0
+
+# Longest the router waits for /api/ps and /api/tags before picking a backend
+ROUTER_PROBE_DEADLINE = 0.5
+
+
+@dataclass
+class BackendStats:
+    """Client-side load signals for one backend"""
+    base_url: str
+    in_flight: int = 0
+    ttft: Optional[float] = None
+    requests: int = 0
+    failures: int = 0
+    last_failure_at: Optional[float] = None
+
+    @property
+    def cooling_down(self) -> bool:
+        return self.last_failure_at is not None and time.monotonic() - self.last_failure_at < FAILURE_COOLDOWN
+
+
+class RouterState:
+    """Process-wide in-flight counts and TTFT averages, shared by all sessions"""
+
+    def __init__(self, alpha: float = TTFT_EWMA_ALPHA):
+        self.alpha = alpha
+        self._stats: Dict[str, BackendStats] = {}
+        self._lock = threading.Lock()
+
+    def _get(self, base_url: str) -> BackendStats:
+        stats = self._stats.get(base_url)
+        if stats is None:
+            stats = self._stats[base_url] = BackendStats(base_url)
+        return stats
+
+    def get(self, base_url: str) -> BackendStats:
+        """Copy of the current stats for a backend"""
+        with self._lock:
+            stats = self._get(base_url)
+            return BackendStats(**vars(stats))
+
+    def all(self) -> List[BackendStats]:
+        with self._lock:
+            return [BackendStats(**vars(stats)) for stats in self._stats.values()]
+
+    def acquire(self, base_url: str):
+        """A request to base_url started"""
+        with self._lock:
+            stats = self._get(base_url)
+            stats.in_flight += 1
+            stats.requests += 1
+
+    def release(self, base_url: str):
+        """A request to base_url finished"""
+        with self._lock:
+            stats = self._get(base_url)
+            stats.in_flight = max(stats.in_flight - 1, 0)
+
+    def record_ttft(self, base_url: str, seconds: float):
+        with self._lock:
+            stats = self._get(base_url)
+            if stats.ttft is None:
+                stats.ttft = seconds
+            else:
+                stats.ttft = self.alpha * seconds + (1 - self.alpha) * stats.ttft
+            stats.last_failure_at = None
+
+    def record_failure(self, base_url: str):
+        with self._lock:
+            stats = self._get(base_url)
+            stats.failures += 1
+            stats.last_failure_at = time.monotonic()
+
+
+@st.cache_resource(show_spinner=False)
+def get_router_state() -> RouterState:
+    """Get the process-wide router state"""
+    return RouterState()
+
+
+@dataclass
+class RouteCandidate:
+    """A backend able to serve a model, with the signals it was ranked by"""
+    host: FleetHost
+    resident: bool
+    in_flight: int
+    ttft: Optional[float]
+    cooling_down: bool
+    score: float
+
+
+class _TrackedStream:
+    """Streaming response that reports its first chunk and its end to the router"""
+
+    def __init__(self, response: requests.Response, state: RouterState, base_url: str, started: float):
+        self._response = response
+        self._state = state
+        self._base_url = base_url
+        self._started = started
+        self._first_chunk_seen = False
+        self._released = False
+
+    def __getattr__(self, name):
+        return getattr(self._response, name)
+
+    def iter_content(self, chunk_size: int = 1, decode_unicode: bool = False):
+        try:
+            for chunk in self._response.iter_content(chunk_size=chunk_size, decode_unicode=decode_unicode):
+                if not self._first_chunk_seen and chunk:
+                    self._first_chunk_seen = True
+                    self._state.record_ttft(self._base_url, time.perf_counter() - self._started)
+                yield chunk
+        finally:
+            self.close()
+
+    def close(self):
+        if not self._released:
+            self._released = True
+            self._state.release(self._base_url)
+        self._response.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __del__(self):
+        if not self._released:
+            self._released = True
+            self._state.release(self._base_url)
+
+
+def router_hosts(primary_url: str) -> List[FleetHost]:
+    """Backends to route across: the sidebar server followed by the fleet hosts"""
+    hosts = [FleetHost("primary", primary_url.rstrip("/"))]
+    for host in get_fleet_registry().hosts():
+        if host.base_url != hosts[0].base_url:
+            hosts.append(host)
+    return hosts
+
+
+class ModelRouter:
+    """Spread generate/chat requests for a model over several Ollama servers.
+
+    Backends are ranked by expected time to first token: the recent TTFT
+    average scaled by the requests already in flight from this dashboard,
+    plus a penalty when the model is not resident in VRAM per /api/ps.
+    Servers that do not have the model installed are skipped. If a server
+    cannot be reached the next one is tried, and the failed one is ranked
+    last for a while.
+
+    Mirrors the generate_response/chat_with_model signatures of OllamaAPI,
+    so it can be used in its place.
+    """
+
+    def __init__(self, hosts: List[FleetHost]):
+        self.hosts = hosts
+        self.state = get_router_state()
+        self.last_route: Optional[RouteCandidate] = None
+
+    def rank(self, model_name: str) -> List[RouteCandidate]:
+        """Backends that can serve model_name, best first"""
+        target = _normalize_model_name(model_name)
+        snapshots = get_fleet_poller().poll(self.hosts, deadline=ROUTER_PROBE_DEADLINE)
+
+        candidates = []
+        for order, snapshot in enumerate(snapshots):
+            # Unknown inventory (host not answering) keeps the host as a last resort
+            if "models" not in snapshot.errors:
+                installed = {_normalize_model_name(model.get("name", "")) for model in snapshot.models}
+                if target not in installed:
+                    continue
+            resident = any(
+                _normalize_model_name(model.get("name", "")) == target for model in snapshot.running
+            )
+
+            stats = self.state.get(snapshot.host.base_url)
+            score = (stats.ttft or DEFAULT_TTFT) * (1 + stats.in_flight)
+            if not resident:
+                score += COLD_LOAD_PENALTY
+            candidates.append((
+                stats.cooling_down or not snapshot.online,
+                score,
+                order,
+                RouteCandidate(snapshot.host, resident, stats.in_flight, stats.ttft, stats.cooling_down, score),
+            ))
+
+        candidates.sort(key=lambda item: item[:3])
+        return [item[3] for item in candidates]
+
+    def _dispatch(self, method: str, model_name: str, *args, stream: bool = False,
+                  **kwargs) -> Union[Dict, requests.Response]:
+        candidates = self.rank(model_name)
+        if not candidates:
+            error = f"No backend has model {model_name} installed"
+            st.error(error)
+            return {"error": error}
+
+        failures = []
+        for candidate in candidates:
+            base_url = candidate.host.base_url
+            api = OllamaAPI(base_url)
+            self.state.acquire(base_url)
+            started = time.perf_counter()
+            try:
+                result = getattr(api, method)(model_name, *args, stream=stream,
+                                              raise_connection_errors=True, **kwargs)
+            except requests.exceptions.ConnectionError as e:
+                self.state.release(base_url)
+                self.state.record_failure(base_url)
+                failures.append(f"{candidate.host.label}: {e}")
+                continue
+            except Exception:
+                self.state.release(base_url)
+                raise
+
+            self.last_route = candidate
+            if stream and not isinstance(result, dict):
+                return _TrackedStream(result, self.state, base_url, started)
+
+            self.state.release(base_url)
+            if "error" not in result:
+                # Server-side time to first token (nanoseconds)
+                ttft = result.get("load_duration", 0) + result.get("prompt_eval_duration", 0)
+                if ttft:
+                    self.state.record_ttft(base_url, ttft / 1e9)
+            return result
+
+        error = "No backend reachable: " + "; ".join(failures)
+        st.error(error)
+        return {"error": error}
+
+    def generate_response(self, model_name: str, prompt: str, **kwargs) -> Union[Dict, requests.Response]:
+        """Route OllamaAPI.generate_response to the best backend"""
+        return self._dispatch("generate_response", model_name, prompt, **kwargs)
+
+    def chat_with_model(self, model_name: str, messages: List[Dict], **kwargs) -> Union[Dict, requests.Response]:
+        """Route OllamaAPI.chat_with_model to the best backend"""
+        return self._dispatch("chat_with_model", model_name, messages, **kwargs)
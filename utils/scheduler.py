@@ -0,0 +1,218 @@
+import os
+import threading
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+import streamlit as st
+from dateutil import parser
+
+from utils.bulk import BulkResult, run_bulk, LOAD, UNLOAD
+from utils.metrics import VRAM_CAPACITY_BYTES, get_generation_metrics
+from utils.poller import ServerPoller, ServerSnapshot, get_server_poller, SNAPSHOT_WAIT_TIMEOUT
+
+
+# VRAM a model needs that has not been seen loaded yet, relative to its size
+# on disk (the weights plus KV cache and compute buffers)
+VRAM_OVERHEAD_FACTOR = float(os.environ.get("OLLAMA_VRAM_OVERHEAD", "1.2"))
+
+# Eviction policies
+LRU = "lru"
+PRIORITY = "priority"
+POLICIES = (LRU, PRIORITY)
+
+_GB = 1024 ** 3
+
+
+def parse_expires_at(expires_at: str) -> float:
+    try:
+        return parser.parse(expires_at).timestamp()
+    except (ValueError, OverflowError, TypeError):
+        return float("inf")
+
+
+@dataclass
+class ResidentModel:
+    """A model in VRAM as seen by the scheduler"""
+    name: str
+    size_vram: int
+    last_used: float
+    expires_at: float
+    priority: int
+
+
+@dataclass
+class PreloadPlan:
+    """What making a set of models resident would take.
+
+    Sizes are bytes of VRAM; required holds the estimate for each model
+    that still has to be loaded and evict the resident models to unload
+    first, in eviction order. A plan that does not fit is never applied.
+    """
+    models: List[str]
+    policy: str
+    budget: int
+    used: int = 0
+    resident: List[str] = field(default_factory=list)
+    required: Dict[str, int] = field(default_factory=dict)
+    evict: List[ResidentModel] = field(default_factory=list)
+    fits: bool = False
+    reason: str = ""
+
+    @property
+    def to_load(self) -> List[str]:
+        return list(self.required)
+
+    @property
+    def needed(self) -> int:
+        return sum(self.required.values())
+
+    @property
+    def freed(self) -> int:
+        return sum(model.size_vram for model in self.evict)
+
+    @property
+    def projected(self) -> int:
+        """VRAM in use once the plan is applied"""
+        return self.used - self.freed + self.needed
+
+
+class VRAMScheduler:
+    """Loads models into one server's VRAM without exceeding a budget.
+
+    Residency comes from the shared poller's /api/ps snapshot. When the
+    requested models do not fit next to what is loaded, resident models are
+    unloaded first: least recently used first (LRU), or lowest priority
+    first and never one ranked above the request (PRIORITY). Models that
+    cannot fit even after every allowed eviction are rejected up front
+    instead of pushing each other onto the CPU.
+
+    VRAM needed by a model is the largest size /api/ps reported for it in
+    the poller's VRAM history, or its size on disk times
+    VRAM_OVERHEAD_FACTOR when it has not been loaded yet.
+    """
+
+    def __init__(self, poller: ServerPoller, budget: int = VRAM_CAPACITY_BYTES):
+        self.poller = poller
+        self.budget = budget
+        self._priorities: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def priority(self, name: str) -> int:
+        return self._priorities.get(name, 0)
+
+    def set_priorities(self, priorities: Dict[str, int]):
+        """Replace the model priorities (higher stays resident longer; unlisted models are 0)"""
+        self._priorities = {name: priority for name, priority in priorities.items() if priority}
+
+    def estimate(self, name: str, snapshot: ServerSnapshot) -> Optional[int]:
+        """VRAM a model needs once loaded (None for models not installed)"""
+        seen = self.poller.history.resident_size(name)
+        if seen:
+            return seen
+        record = snapshot.catalog.get(name)
+        if record is None:
+            return None
+        return int(record.size * VRAM_OVERHEAD_FACTOR)
+
+    def resident_models(self, snapshot: ServerSnapshot) -> List[ResidentModel]:
+        """Loaded models, with the usage the eviction policies rank them by"""
+        last_used = get_generation_metrics().last_used()
+        return [
+            ResidentModel(
+                name=model.get("name", ""),
+                size_vram=model.get("size_vram", 0) or 0,
+                last_used=last_used.get(model.get("name", ""), 0.0),
+                expires_at=parse_expires_at(model.get("expires_at", "")),
+                priority=self.priority(model.get("name", "")),
+            )
+            for model in snapshot.running_models
+        ]
+
+    def plan(self, models: List[str], policy: str = LRU,
+             snapshot: Optional[ServerSnapshot] = None) -> PreloadPlan:
+        """Work out the evictions needed to make models resident, without changing anything"""
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown eviction policy: {policy}")
+        snapshot = snapshot or self.poller.latest()
+        models = list(dict.fromkeys(models))
+        plan = PreloadPlan(models=models, policy=policy, budget=self.budget)
+
+        if self.budget <= 0:
+            plan.reason = "No VRAM budget configured (set OLLAMA_VRAM_CAPACITY_GB or enter one)"
+            return plan
+        if "running_models" in snapshot.errors:
+            plan.reason = f"Residency unknown: {snapshot.errors['running_models']}"
+            return plan
+
+        resident = self.resident_models(snapshot)
+        resident_names = {model.name for model in resident}
+        plan.used = sum(model.size_vram for model in resident)
+        plan.resident = [name for name in models if name in resident_names]
+        for name in models:
+            if name in resident_names:
+                continue
+            estimate = self.estimate(name, snapshot)
+            if estimate is None:
+                plan.reason = f"{name} is not installed"
+                return plan
+            plan.required[name] = estimate
+
+        free = self.budget - plan.used
+        if plan.needed <= free:
+            plan.fits = True
+            return plan
+
+        # Never evict what was asked for; usage breaks ties within a priority
+        candidates = [model for model in resident if model.name not in models]
+        if policy == PRIORITY:
+            ceiling = max(self.priority(name) for name in models)
+            candidates = [model for model in candidates if model.priority <= ceiling]
+            candidates.sort(key=lambda model: (model.priority, model.last_used, model.expires_at))
+        else:
+            # Models never used from the dashboard go first, soonest to expire first
+            candidates.sort(key=lambda model: (model.last_used, model.expires_at))
+
+        for model in candidates:
+            if plan.needed <= free:
+                break
+            plan.evict.append(model)
+            free += model.size_vram
+
+        if plan.needed <= free:
+            plan.fits = True
+        else:
+            requested = plan.needed + sum(model.size_vram for model in resident if model.name in models)
+            pinned = self.budget - free - requested + plan.needed
+            plan.reason = (
+                f"The requested models need {requested / _GB:.1f} GB and models that may not be "
+                f"evicted hold {pinned / _GB:.1f} GB, over the {self.budget / _GB:.1f} GB budget"
+            )
+        return plan
+
+    def ensure_resident(self, models: List[str], keep_alive: str = "5m",
+                        policy: str = LRU) -> Tuple[PreloadPlan, List[BulkResult]]:
+        """Plan against a fresh /api/ps poll, then evict and load if the plan fits.
+
+        Loads are skipped when an eviction fails, so a failed unload never
+        leads to an over-budget load. One request per server runs at a time.
+        """
+        with self._lock:
+            plan = self.plan(models, policy, snapshot=self.poller.refresh(wait=SNAPSHOT_WAIT_TIMEOUT))
+            if not plan.fits:
+                return plan, []
+
+            api = self.poller.api
+            results = run_bulk(api, UNLOAD, [model.name for model in plan.evict])
+            if all(result.ok for result in results):
+                # Ollama loads one model at a time anyway
+                results += run_bulk(api, LOAD, plan.to_load, keep_alive=keep_alive, max_workers=1)
+            else:
+                results += [BulkResult(name, False, "Skipped: an eviction failed", 0.0) for name in plan.to_load]
+            self.poller.refresh(wait=SNAPSHOT_WAIT_TIMEOUT)
+            return plan, results
+
+
+@st.cache_resource(show_spinner=False)
+def get_vram_scheduler(base_url: str) -> VRAMScheduler:
+    """Get the process-wide VRAM scheduler for a server, shared by all sessions"""
+    return VRAMScheduler(get_server_poller(base_url))
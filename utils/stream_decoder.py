@@ -0,0 +1,190 @@
+import json
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, Union
+
+import requests
+
+# Use orjson when it is installed: it parses straight from a memoryview, so
+# lines never have to be copied out of the receive buffer.
+try:
+    import orjson
+
+    def _loads(view: memoryview) -> Any:
+        return orjson.loads(view)
+
+    FAST_JSON = True
+except ImportError:
+    def _loads(view: memoryview) -> Any:
+        return json.loads(bytes(view))
+
+    FAST_JSON = False
+
+
+# Bytes read from the socket per iteration
+STREAM_CHUNK_SIZE = 64 * 1024
+
+
+@dataclass(slots=True)
+class PullProgress:
+    """Status update from /api/pull"""
+    status: str
+    digest: str = ""
+    total: int = 0
+    completed: int = 0
+
+
+@dataclass(slots=True)
+class TokenChunk:
+    """Generated text from /api/generate ("response") or /api/chat ("message")"""
+    text: str
+
+
+@dataclass(slots=True)
+class FinalStats:
+    """Final chunk of /api/generate or /api/chat (done=true) with timing stats"""
+    model: str = ""
+    done_reason: str = ""
+    total_duration: int = 0
+    load_duration: int = 0
+    prompt_eval_count: int = 0
+    prompt_eval_duration: int = 0
+    eval_count: int = 0
+    eval_duration: int = 0
+    context: Optional[List[int]] = None
+    raw: Dict[str, Any] = field(default_factory=dict, repr=False)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "FinalStats":
+        """Build stats from a done=true response object"""
+        return cls(
+            model=data.get("model", ""),
+            done_reason=data.get("done_reason", ""),
+            total_duration=data.get("total_duration", 0) or 0,
+            load_duration=data.get("load_duration", 0) or 0,
+            prompt_eval_count=data.get("prompt_eval_count", 0) or 0,
+            prompt_eval_duration=data.get("prompt_eval_duration", 0) or 0,
+            eval_count=data.get("eval_count", 0) or 0,
+            eval_duration=data.get("eval_duration", 0) or 0,
+            context=data.get("context"),
+            raw=data,
+        )
+
+    @property
+    def tokens_per_second(self) -> float:
+        """Generation speed reported by the server"""
+        if self.eval_duration <= 0:
+            return 0.0
+        return self.eval_count / (self.eval_duration / 1e9)
+
+
+@dataclass(slots=True)
+class StreamError:
+    """Error object sent by the server, or a line that could not be decoded"""
+    message: str
+
+
+StreamEvent = Union[PullProgress, TokenChunk, FinalStats, StreamError]
+
+
+def decode_object(data: Any) -> List[StreamEvent]:
+    """Convert one decoded NDJSON object into typed events"""
+    if not isinstance(data, dict):
+        return [StreamError(f"Unexpected stream item: {data!r}")]
+
+    if "error" in data:
+        return [StreamError(str(data["error"]))]
+
+    events: List[StreamEvent] = []
+
+    # Generated text: /api/generate uses "response", /api/chat uses "message"
+    if "response" in data:
+        text = data["response"]
+    elif "message" in data:
+        text = (data["message"] or {}).get("content", "")
+    else:
+        text = None
+
+    if text:
+        events.append(TokenChunk(text))
+
+    if data.get("done"):
+        events.append(FinalStats.from_dict(data))
+    elif text is None and "status" in data:
+        events.append(PullProgress(
+            status=data["status"],
+            digest=data.get("digest", ""),
+            total=data.get("total", 0) or 0,
+            completed=data.get("completed", 0) or 0,
+        ))
+
+    return events
+
+
+class NDJSONDecoder:
+    """Incremental newline-delimited JSON decoder.
+
+    Feed it raw socket chunks of any size; complete lines are parsed in
+    place and a trailing partial line is kept until the next chunk.
+    """
+
+    def __init__(self):
+        self._pending = bytearray()
+
+    def feed(self, data: bytes) -> List[StreamEvent]:
+        """Decode all complete lines in data (plus any pending partial line)"""
+        if self._pending:
+            self._pending += data
+            # Most small reads end mid-line: nothing to decode yet
+            if b"\n" not in data:
+                return []
+            data = self._pending
+
+        events: List[StreamEvent] = []
+        find = data.find
+        start = 0
+
+        with memoryview(data) as view:
+            while True:
+                end = find(b"\n", start)
+                if end < 0:
+                    break
+                if end > start:
+                    events.extend(self._decode_line(view[start:end]))
+                start = end + 1
+            remainder = bytearray(view[start:])
+
+        self._pending = remainder
+        return events
+
+    def close(self) -> List[StreamEvent]:
+        """Decode whatever is left once the stream has ended"""
+        if not self._pending.strip():
+            self._pending = bytearray()
+            return []
+        data = bytes(self._pending)
+        self._pending = bytearray()
+        with memoryview(data) as view:
+            return self._decode_line(view)
+
+    @staticmethod
+    def _decode_line(line: memoryview) -> List[StreamEvent]:
+        try:
+            return decode_object(_loads(line))
+        except ValueError:
+            # Blank lines are harmless, anything else is reported
+            if not bytes(line).strip():
+                return []
+            preview = bytes(line[:80]).decode("utf-8", errors="replace")
+            return [StreamError(f"Invalid JSON in stream: {preview}")]
+
+
+def iter_events(response: requests.Response, chunk_size: int = STREAM_CHUNK_SIZE) -> Iterator[StreamEvent]:
+    """Yield typed events from a streaming requests.Response"""
+    decoder = NDJSONDecoder()
+    try:
+        for chunk in response.iter_content(chunk_size=chunk_size):
+            if chunk:
+                yield from decoder.feed(chunk)
+        yield from decoder.close()
+    finally:
+        response.close()
@@ -1,5 +1,7 @@
 import streamlit as st
+from utils.profiling import profiled
 
+@profiled("styling")
 def apply_custom_styling():
     """Apply custom Apple-inspired dark mode styling"""
     
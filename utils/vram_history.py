@@ -0,0 +1,130 @@
+import threading
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+# Samples kept per model (at the default 5 second poll interval: one hour)
+VRAM_HISTORY_SAMPLES = 720
+
+# One row per poll: when, total size, size in VRAM, loaded or not
+SAMPLE_DTYPE = np.dtype([
+    ("time", "f8"),
+    ("size", "i8"),
+    ("size_vram", "i8"),
+    ("resident", "?"),
+])
+
+
+class RingBuffer:
+    """Fixed-capacity ring of rows in a NumPy structured array"""
+
+    def __init__(self, capacity: int, dtype: np.dtype = SAMPLE_DTYPE):
+        self._data = np.zeros(capacity, dtype=dtype)
+        self._next = 0
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def append(self, row: Tuple):
+        self._data[self._next] = row
+        self._next = (self._next + 1) % len(self._data)
+        self._count = min(self._count + 1, len(self._data))
+
+    def values(self) -> np.ndarray:
+        """Copy of the rows, oldest first"""
+        if self._count < len(self._data):
+            return self._data[:self._count].copy()
+        return np.concatenate((self._data[self._next:], self._data[:self._next]))
+
+
+class VRAMHistory:
+    """Per-model VRAM time series for one server, fed by the server poller.
+
+    Every model seen in /api/ps gets a ring buffer that receives a row at
+    every poll, resident or not, so memory is fixed per model regardless of
+    uptime. A model's buffer is dropped once it has been unloaded for a
+    whole buffer's worth of polls.
+    """
+
+    def __init__(self, capacity: int = VRAM_HISTORY_SAMPLES):
+        self.capacity = capacity
+        self._series: Dict[str, RingBuffer] = {}
+        self._idle_samples: Dict[str, int] = {}
+        self._last_time = None
+        self._lock = threading.Lock()
+
+    def record(self, timestamp: float, running_models: List[Dict]):
+        """Add one poll of /api/ps"""
+        present = {model.get("name", "Unknown"): model for model in running_models}
+        with self._lock:
+            for name in present.keys() | self._series.keys():
+                series = self._series.get(name)
+                if series is None:
+                    series = self._series[name] = RingBuffer(self.capacity)
+                    if self._last_time is not None:
+                        # Not loaded at the previous poll, so this shows up as a load event
+                        series.append((self._last_time, 0, 0, False))
+
+                model = present.get(name)
+                if model is None:
+                    series.append((timestamp, 0, 0, False))
+                    self._idle_samples[name] = self._idle_samples.get(name, 0) + 1
+                    if self._idle_samples[name] >= self.capacity:
+                        del self._series[name]
+                        del self._idle_samples[name]
+                else:
+                    series.append((timestamp, model.get("size", 0), model.get("size_vram", 0), True))
+                    self._idle_samples[name] = 0
+            self._last_time = timestamp
+
+    def resident_size(self, name: str) -> Optional[int]:
+        """Largest total size /api/ps reported for a model while it was loaded (None if never seen)"""
+        with self._lock:
+            series = self._series.get(name)
+            samples = series.values() if series is not None else None
+        if samples is None or not samples["resident"].any():
+            return None
+        return int(samples["size"][samples["resident"]].max())
+
+    def frame(self) -> pd.DataFrame:
+        """All samples as a long DataFrame: time, model, size, size_vram, resident"""
+        with self._lock:
+            series = {name: buffer.values() for name, buffer in self._series.items()}
+
+        frames = []
+        for name, rows in series.items():
+            frame = pd.DataFrame(rows)
+            frame.insert(1, "model", name)
+            frames.append(frame)
+        if not frames:
+            return pd.DataFrame(columns=["time", "model", "size", "size_vram", "resident"])
+
+        frame = pd.concat(frames, ignore_index=True)
+        frame["time"] = pd.to_datetime(frame["time"], unit="s", utc=True)
+        return frame.sort_values(["time", "model"], ignore_index=True)
+
+    def events(self) -> pd.DataFrame:
+        """Load and unload events derived from residency changes between polls"""
+        with self._lock:
+            series = {name: buffer.values() for name, buffer in self._series.items()}
+
+        rows = []
+        for name, samples in series.items():
+            resident = samples["resident"]
+            changes = np.flatnonzero(resident[1:] != resident[:-1]) + 1
+            for index in changes:
+                rows.append({
+                    "time": samples["time"][index],
+                    "model": name,
+                    "event": "Load" if resident[index] else "Unload",
+                    "size_vram": int(samples["size_vram"][index] or samples["size_vram"][index - 1]),
+                })
+        if not rows:
+            return pd.DataFrame(columns=["time", "model", "event", "size_vram"])
+
+        events = pd.DataFrame(rows)
+        events["time"] = pd.to_datetime(events["time"], unit="s", utc=True)
+        return events.sort_values("time", ignore_index=True)
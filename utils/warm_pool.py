@@ -0,0 +1,360 @@
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from typing import Deque, Dict, List, Optional, Set, Tuple
+
+import streamlit as st
+
+from utils.poller import ServerPoller, ServerSnapshot, get_server_poller, SNAPSHOT_WAIT_TIMEOUT
+from utils.scheduler import VRAMScheduler, get_vram_scheduler, LRU, parse_expires_at
+
+
+# Seconds between warm-pool passes over a server
+WARM_POOL_INTERVAL = float(os.environ.get("OLLAMA_WARM_POOL_INTERVAL", "30"))
+
+# Keep-alive given to models the warm pool loads or re-arms
+WARM_POOL_KEEP_ALIVE = os.environ.get("OLLAMA_WARM_POOL_KEEP_ALIVE", "30m")
+
+# Re-arm a warm model once less than this much of its keep-alive is left
+# (at least two passes, so a slow pass cannot let it expire)
+REARM_BEFORE_SECONDS = max(120.0, 2 * WARM_POOL_INTERVAL)
+
+# A generation that spent longer than this loading found its model cold
+COLD_LOAD_SECONDS = 1.0
+
+# Days of usage kept per model and hour of the day
+USAGE_HISTORY_DAYS = 14
+
+# A model is predicted for an hour of the day when it was used in that hour
+# on at least this share of the days observed, after PRELOAD_MIN_DAYS days
+PRELOAD_MIN_SHARE = 0.5
+PRELOAD_MIN_DAYS = 3
+
+# Minutes before a predicted hour at which its models are preloaded
+PRELOAD_LEAD_MINUTES = 10
+
+# When set, usage history and pinned models are saved here and survive restarts
+USAGE_HISTORY_FILE = os.environ.get("OLLAMA_USAGE_HISTORY_FILE", "")
+
+# Warm-pool actions kept for the page
+ACTION_HISTORY = 50
+
+# Actions
+REARM = "re-arm"
+PRELOAD = "preload"
+SAVE = "save"
+
+# One file holds the usage of every server
+_history_file_lock = threading.Lock()
+
+
+class UsageHistory:
+    """Days on which each model was used, per local hour of the day.
+
+    Only the last USAGE_HISTORY_DAYS days are kept, so a model's share of
+    an hour is the fraction of recent days it was used in that hour.
+    """
+
+    def __init__(self):
+        self._days: Dict[str, Dict[int, Set[str]]] = {}
+        self._first_day: Optional[date] = None
+        self._lock = threading.Lock()
+
+    def record(self, model_name: str, when: float):
+        moment = datetime.fromtimestamp(when)
+        with self._lock:
+            hours = self._days.setdefault(model_name, {})
+            hours.setdefault(moment.hour, set()).add(moment.date().isoformat())
+            if self._first_day is None or moment.date() < self._first_day:
+                self._first_day = moment.date()
+            self._prune(moment.date())
+
+    def _prune(self, today: date):
+        oldest = (today - timedelta(days=USAGE_HISTORY_DAYS - 1)).isoformat()
+        for model_name in list(self._days):
+            hours = self._days[model_name]
+            for hour in list(hours):
+                hours[hour] = {day for day in hours[hour] if day >= oldest}
+                if not hours[hour]:
+                    del hours[hour]
+            if not hours:
+                del self._days[model_name]
+
+    def observed_days(self, today: date) -> int:
+        """Days of history the shares are based on"""
+        with self._lock:
+            if self._first_day is None:
+                return 0
+            return min(USAGE_HISTORY_DAYS, (today - self._first_day).days + 1)
+
+    def shares(self, today: date) -> Dict[str, Dict[int, float]]:
+        """Per model and hour of the day: share of the observed days the model was used then"""
+        observed = self.observed_days(today)
+        if not observed:
+            return {}
+        with self._lock:
+            return {
+                model_name: {hour: len(days) / observed for hour, days in hours.items()}
+                for model_name, hours in self._days.items()
+            }
+
+    def predicted(self, when: float) -> List[str]:
+        """Models usually used in the hour of the day containing when"""
+        moment = datetime.fromtimestamp(when)
+        if self.observed_days(moment.date()) < PRELOAD_MIN_DAYS:
+            return []
+        return sorted(
+            model_name for model_name, hours in self.shares(moment.date()).items()
+            if hours.get(moment.hour, 0.0) >= PRELOAD_MIN_SHARE
+        )
+
+    def to_dict(self) -> Dict:
+        with self._lock:
+            return {
+                "first_day": self._first_day.isoformat() if self._first_day else None,
+                "models": {
+                    model_name: {str(hour): sorted(days) for hour, days in hours.items()}
+                    for model_name, hours in self._days.items()
+                },
+            }
+
+    def load_dict(self, data: Dict):
+        with self._lock:
+            first_day = data.get("first_day")
+            self._first_day = date.fromisoformat(first_day) if first_day else None
+            self._days = {
+                model_name: {int(hour): set(days) for hour, days in hours.items()}
+                for model_name, hours in data.get("models", {}).items()
+            }
+            self._prune(date.today())
+
+
+@dataclass
+class WarmPoolAction:
+    """One re-arm or preload done by the warm pool"""
+    at: float
+    model: str
+    action: str
+    reason: str
+    ok: bool
+    message: str
+
+
+class WarmPool:
+    """Keeps one server's pinned and predicted models in VRAM.
+
+    A daemon thread wakes every WARM_POOL_INTERVAL seconds. Warm models are
+    the pinned ones plus those usage history predicts for the current hour
+    or the hour starting within PRELOAD_LEAD_MINUTES. Each warm model that
+    is not loaded is preloaded, and each whose /api/ps expires_at is less
+    than REARM_BEFORE_SECONDS away is re-armed with WARM_POOL_KEEP_ALIVE.
+    When a VRAM budget is configured, preloads go through the VRAM
+    scheduler and are skipped if they would evict another warm model.
+
+    Generations from the dashboard are recorded with record_request(),
+    which feeds the usage history and the hit rate: the share of requests
+    that found their model already loaded.
+
+    With USAGE_HISTORY_FILE set, the usage history, pinned models and the
+    predictive setting are saved after each pass and restored when the
+    pool is created (on the first page view of the server after a restart).
+    """
+
+    def __init__(self, poller: ServerPoller, scheduler: VRAMScheduler, interval: float = WARM_POOL_INTERVAL):
+        self.poller = poller
+        self.scheduler = scheduler
+        self.interval = interval
+        self.usage = UsageHistory()
+        self.pinned: Set[str] = set()
+        self.predictive = True
+        self.requests: Dict[str, List[int]] = {}
+        self.actions: Deque[WarmPoolAction] = deque(maxlen=ACTION_HISTORY)
+        self._state_dirty = False
+        self._save_error = ""
+        self._lock = threading.Lock()
+        self._run_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._load_state()
+        self._thread = threading.Thread(target=self._loop, name=f"ollama-warm-pool-{poller.api.base_url}", daemon=True)
+        self._thread.start()
+
+    def set_pinned(self, model_names: List[str]):
+        """Replace the pinned models, keeping newly pinned ones warm right away"""
+        pinned = set(model_names)
+        added = pinned - self.pinned
+        with self._lock:
+            self.pinned = pinned
+            self._state_dirty = True
+        if added:
+            self._wake.set()
+
+    def set_predictive(self, predictive: bool):
+        with self._lock:
+            self.predictive = predictive
+            self._state_dirty = True
+
+    def record_request(self, model_name: str, load_seconds: float, when: Optional[float] = None):
+        """Count one generation; it was a hit if the model did not have to be loaded"""
+        hit = load_seconds < COLD_LOAD_SECONDS
+        with self._lock:
+            counts = self.requests.setdefault(model_name, [0, 0])
+            counts[0] += 1
+            counts[1] += int(hit)
+            self._state_dirty = True
+        self.usage.record(model_name, when or time.time())
+
+    def hit_rate(self) -> Optional[float]:
+        with self._lock:
+            requests = sum(counts[0] for counts in self.requests.values())
+            hits = sum(counts[1] for counts in self.requests.values())
+        return hits / requests if requests else None
+
+    def request_counts(self) -> Dict[str, Tuple[int, int]]:
+        """Per model: requests and hits since startup"""
+        with self._lock:
+            return {model_name: (counts[0], counts[1]) for model_name, counts in self.requests.items()}
+
+    def warm_models(self, now: Optional[float] = None) -> Dict[str, str]:
+        """Models to keep loaded right now, with why"""
+        now = now or time.time()
+        warm = {}
+        if self.predictive:
+            for model_name in self.usage.predicted(now + PRELOAD_LEAD_MINUTES * 60):
+                warm[model_name] = "predicted"
+            for model_name in self.usage.predicted(now):
+                warm[model_name] = "predicted"
+        for model_name in self.pinned:
+            warm[model_name] = "pinned"
+        return warm
+
+    def run_once(self, now: Optional[float] = None):
+        """Re-arm and preload the warm models once"""
+        with self._run_lock:
+            self._run_once(now)
+
+    def _run_once(self, now: Optional[float]):
+        warm = self.warm_models(now)
+        if not warm:
+            return
+        snapshot = self.poller.refresh(wait=SNAPSHOT_WAIT_TIMEOUT)
+        if "running_models" in snapshot.errors:
+            return
+
+        now = now or time.time()
+        resident = {
+            model.get("name", ""): parse_expires_at(model.get("expires_at", ""))
+            for model in snapshot.running_models
+        }
+        for model_name, reason in sorted(warm.items()):
+            if model_name not in snapshot.catalog:
+                continue
+            if model_name not in resident:
+                self._preload(model_name, reason, warm, snapshot)
+            elif resident[model_name] - now < REARM_BEFORE_SECONDS:
+                self._rearm(model_name, reason)
+
+    def _rearm(self, model_name: str, reason: str):
+        result = self.poller.api.load_model_into_vram(model_name, keep_alive=WARM_POOL_KEEP_ALIVE,
+                                                      report_errors=False)
+        ok = "error" not in result
+        self._log(model_name, REARM, reason, ok, f"keep-alive {WARM_POOL_KEEP_ALIVE}" if ok else str(result["error"]))
+
+    def _preload(self, model_name: str, reason: str, warm: Dict[str, str], snapshot: ServerSnapshot):
+        if self.scheduler.budget <= 0:
+            result = self.poller.api.load_model_into_vram(model_name, keep_alive=WARM_POOL_KEEP_ALIVE,
+                                                          report_errors=False)
+            ok = "error" not in result
+            self._log(model_name, PRELOAD, reason, ok, "Loaded" if ok else str(result["error"]))
+            return
+
+        plan = self.scheduler.plan([model_name], LRU, snapshot=snapshot)
+        evicts_warm = [model.name for model in plan.evict if model.name in warm]
+        if not plan.fits or evicts_warm:
+            why = plan.reason or f"would evict {', '.join(evicts_warm)}"
+            self._log(model_name, PRELOAD, reason, False, f"Skipped: {why}")
+            return
+        plan, results = self.scheduler.ensure_resident([model_name], WARM_POOL_KEEP_ALIVE, LRU)
+        failed = [result for result in results if not result.ok]
+        if not plan.fits:
+            self._log(model_name, PRELOAD, reason, False, f"Skipped: {plan.reason}")
+        elif failed:
+            self._log(model_name, PRELOAD, reason, False, f"{failed[0].model}: {failed[0].message}")
+        else:
+            evicted = f" after evicting {', '.join(model.name for model in plan.evict)}" if plan.evict else ""
+            self._log(model_name, PRELOAD, reason, True, f"Loaded{evicted}")
+
+    def _log(self, model_name: str, action: str, reason: str, ok: bool, message: str):
+        self.actions.append(WarmPoolAction(time.time(), model_name, action, reason, ok, message))
+
+    def _loop(self):
+        while True:
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            try:
+                self.run_once()
+            except Exception as e:
+                self._log("", "error", "", False, str(e))
+            try:
+                self._save_state()
+                self._save_error = ""
+            except (OSError, TypeError, ValueError) as e:
+                with self._lock:
+                    # Try again after the next pass
+                    self._state_dirty = True
+                error = getattr(e, "strerror", None) or str(e)
+                if error != self._save_error:
+                    # Logged once per kind of failure rather than every pass
+                    self._save_error = error
+                    self._log("", SAVE, "", False, f"Could not save {USAGE_HISTORY_FILE}: {e}")
+
+    def _load_state(self):
+        if not USAGE_HISTORY_FILE or not os.path.exists(USAGE_HISTORY_FILE):
+            return
+        with _history_file_lock:
+            try:
+                with open(USAGE_HISTORY_FILE, encoding="utf-8") as history_file:
+                    data = json.load(history_file).get(self.poller.api.base_url)
+            except (OSError, ValueError, AttributeError):
+                return
+        if not data:
+            return
+        self.usage.load_dict(data.get("usage", {}))
+        self.pinned = set(data.get("pinned", []))
+        self.predictive = data.get("predictive", True)
+
+    def _save_state(self):
+        with self._lock:
+            if not USAGE_HISTORY_FILE or not self._state_dirty:
+                return
+            self._state_dirty = False
+            state = {"usage": self.usage.to_dict(), "pinned": sorted(self.pinned), "predictive": self.predictive}
+
+        with _history_file_lock:
+            try:
+                with open(USAGE_HISTORY_FILE, encoding="utf-8") as history_file:
+                    data = json.load(history_file)
+            except (OSError, ValueError):
+                data = {}
+            data[self.poller.api.base_url] = state
+
+            # Write a temporary file and swap it in, so a crash never leaves a half-written file
+            directory = os.path.dirname(os.path.abspath(USAGE_HISTORY_FILE))
+            handle, temp_path = tempfile.mkstemp(prefix=".usage-history-", suffix=".json", dir=directory)
+            try:
+                with os.fdopen(handle, "w", encoding="utf-8") as history_file:
+                    json.dump(data, history_file)
+                os.replace(temp_path, USAGE_HISTORY_FILE)
+            except BaseException:
+                os.unlink(temp_path)
+                raise
+
+
+@st.cache_resource(show_spinner=False)
+def get_warm_pool(base_url: str) -> WarmPool:
+    """Get the process-wide warm pool for a server, shared by all sessions"""
+    return WarmPool(get_server_poller(base_url), get_vram_scheduler(base_url))